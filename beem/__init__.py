@@ -1,5 +1,6 @@
 """ beem."""
-from .steem import Steem
+import sys
+import importlib
 from .version import version as __version__
 __all__ = [
     "steem",
@@ -25,3 +26,18 @@ __all__ = [
     "imageuploader",
     "snapshot"
 ]
+
+if sys.version_info < (3, 7):
+    # module level __getattr__ is not supported
+    from .steem import Steem
+else:
+    def __getattr__(name):
+        """ Imports Steem and the submodules on first access, so that
+            ``import beem`` does not import the rpc, wallet and storage modules
+        """
+        if name == "Steem":
+            from .steem import Steem
+            return Steem
+        elif name in __all__:
+            return importlib.import_module("." + name, __name__)
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
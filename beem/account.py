@@ -6,10 +6,14 @@ from __future__ import unicode_literals
 from builtins import bytes, int, str
 import pytz
 import json
+import sys
 from datetime import datetime, timedelta, date, time
 import math
 import random
 import logging
+from bisect import bisect_left
+from collections import deque
+from threading import Lock
 from prettytable import PrettyTable
 from beem.instance import shared_steem_instance
 from .exceptions import AccountDoesNotExistsException, OfflineHasNoRPCException
@@ -23,9 +27,121 @@ from beem.rc import RC
 from beemgraphenebase.account import PrivateKey, PublicKey, PasswordKey
 from beemgraphenebase.py23 import bytes_types, integer_types, string_types, text_type
 from beem.constants import STEEM_VOTE_REGENERATION_SECONDS, STEEM_1_PERCENT, STEEM_100_PERCENT, STEEM_VOTING_MANA_REGENERATION_SECONDS
+import beem as stm
+FUTURES_MODULE = None
+if not FUTURES_MODULE:
+    try:
+        from concurrent.futures import ThreadPoolExecutor
+        FUTURES_MODULE = "futures"
+    except ImportError:
+        FUTURES_MODULE = None
+if sys.version_info < (3, 0):
+    from Queue import Queue
+else:
+    from queue import Queue
 log = logging.getLogger(__name__)
 
 
+def _get_history_op(event):
+    """ Returns the operation type and the operation of an account history item"""
+    if isinstance(event['op'], list):
+        op_type, op = event['op']
+    else:
+        op_type = event['op']['type']
+        if len(op_type) > 10 and op_type[len(op_type) - 10:] == "_operation":
+            op_type = op_type[:-10]
+        op = event['op']['value']
+    return op_type, op
+
+
+def _construct_history_op(account_name, item_index, op_type, op, event):
+    """ Returns the account history item as dict, including the ``_id`` hash"""
+    block_props = remove_from_dict(event, keys=['op'], keep_keys=False)
+    # index can change during reindexing in
+    # future hard-forks. Thus we cannot take it for granted.
+    immutable = op.copy()
+    immutable.update(block_props)
+    immutable.update({
+        'account': account_name,
+        'type': op_type,
+    })
+    _id = Blockchain.hash_op(immutable)
+    immutable.update({
+        '_id': _id,
+        'index': item_index,
+    })
+    return immutable
+
+
+class AccountOpIndex(object):
+    """ Sparse mapping from the operation index of an account history to
+        block number and timestamp of the operation. It is filled with
+        every account history call and used by
+        :func:`Account.estimate_virtual_op_num` to narrow down the search range.
+    """
+    def __init__(self):
+        self.op_indices = []
+        self.block_nums = []
+        self.timestamps = []
+        self.lock = Lock()
+
+    def __len__(self):
+        return len(self.op_indices)
+
+    def add(self, op_index, block_num, timestamp):
+        """ Adds an operation, known operations are skipped"""
+        with self.lock:
+            i = bisect_left(self.op_indices, op_index)
+            if i < len(self.op_indices) and self.op_indices[i] == op_index:
+                return
+            self.op_indices.insert(i, op_index)
+            self.block_nums.insert(i, block_num)
+            self.timestamps.insert(i, timestamp)
+
+    def get(self, op_index):
+        """ Returns block number and timestamp of an operation or None"""
+        with self.lock:
+            i = bisect_left(self.op_indices, op_index)
+            if i < len(self.op_indices) and self.op_indices[i] == op_index:
+                return self.block_nums[i], self.timestamps[i]
+        return None
+
+    def get_bounds(self, block_num):
+        """ Returns the nearest known operations before and at or after
+            block_num as ``(op_index, block_num)`` tuples (or None)
+        """
+        with self.lock:
+            # the block numbers grow with the operation index
+            i = bisect_left(self.block_nums, block_num)
+            lower = None
+            upper = None
+            if i > 0:
+                lower = (self.op_indices[i - 1], self.block_nums[i - 1])
+            if i < len(self.block_nums):
+                upper = (self.op_indices[i], self.block_nums[i])
+        return lower, upper
+
+
+_op_indices = {}
+_op_indices_lock = Lock()
+
+
+def get_account_op_index(account_name, chain_id):
+    """ Returns the :class:`AccountOpIndex` of an account"""
+    with _op_indices_lock:
+        op_index = _op_indices.get((chain_id, account_name))
+        if op_index is None:
+            op_index = AccountOpIndex()
+            _op_indices[(chain_id, account_name)] = op_index
+        return op_index
+
+
+def clear_account_op_indices():
+    """ Removes all cached :class:`AccountOpIndex` objects"""
+    with _op_indices_lock:
+        _op_indices.clear()
+
+
 class Account(BlockchainObject):
     """ This class allows to easily access Account data
 
@@ -1569,6 +1685,14 @@ class Account(BlockchainObject):
         if account is None:
             account = self
         account = Account(account, steem_instance=self.steem)
+        chain_id = self.steem.chain_params["chain_id"]
+        storage = self.steem.account_history_storage
+        if storage is not None and start >= 0:
+            first = max(0, start - limit)
+            ret = storage.get_ops(account["name"], first, start, chain_id=chain_id)
+            if len(ret) == start - first + 1:
+                self._add_to_op_index(account["name"], chain_id, ret)
+                return ret
         if not self.steem.is_connected():
             raise OfflineHasNoRPCException("No RPC available in offline mode!")
         self.steem.rpc.set_next_node_on_empty_reply(False)
@@ -1581,8 +1705,51 @@ class Account(BlockchainObject):
             ret = self.steem.rpc.get_account_history(account["name"], start, limit, api="database")
             if len(ret) == 0 and limit == 0:
                 ret = self.steem.rpc.get_account_history(account["name"], start, limit + 1, api="database")
+        if storage is not None and ret:
+            self._store_account_history(storage, account["name"], ret)
+        self._add_to_op_index(account["name"], chain_id, ret)
         return ret
 
+    def _add_to_op_index(self, account_name, chain_id, history):
+        """ Adds the first and the last operation of an account history
+            result to the :class:`AccountOpIndex` of the account
+        """
+        if not history:
+            return
+        op_index = get_account_op_index(account_name, chain_id)
+        for item_index, event in (history[0], history[-1]):
+            op_index.add(item_index, event["block"], event["timestamp"])
+
+    def _get_op_block(self, index):
+        """ Returns block number and timestamp of the operation with the
+            given index, the :class:`AccountOpIndex` is used when possible
+        """
+        op_index = get_account_op_index(self["name"], self.steem.chain_params["chain_id"])
+        if index >= 0:
+            ret = op_index.get(index)
+            if ret is not None:
+                return ret
+        history = self._get_account_history(start=index, limit=0)
+        for item_index, event in history:
+            if item_index == index:
+                return event["block"], event["timestamp"]
+        return history[-1][1]["block"], history[-1][1]["timestamp"]
+
+    def _store_account_history(self, storage, account_name, history):
+        """ Stores the irreversible operations of a get_account_history
+            result in the account history storage
+        """
+        props = self.steem.get_dynamic_global_properties()
+        if props is None or "last_irreversible_block_num" not in props:
+            return
+        ops = []
+        for item_index, event in history:
+            op_type, op = _get_history_op(event)
+            op_id = _construct_history_op(account_name, item_index, op_type, op, event)["_id"]
+            ops.append((item_index, op_id, event))
+        storage.store_ops(account_name, ops, chain_id=self.steem.chain_params["chain_id"],
+                          last_irreversible_block_num=int(props["last_irreversible_block_num"]))
+
     def estimate_virtual_op_num(self, blocktime, stop_diff=0, max_count=100):
         """ Returns an estimation of an virtual operation index for a given time or blockindex
 
@@ -1626,8 +1793,7 @@ class Account(BlockchainObject):
 
         """
         def get_blocknum(index):
-            op = self._get_account_history(start=(index))
-            return op[0][1]['block']
+            return self._get_op_block(index)[0]
 
         max_index = self.virtual_op_count()
         if max_index < stop_diff:
@@ -1648,7 +1814,7 @@ class Account(BlockchainObject):
             return 0
 
         # get the block number from the account's latest operation
-        latest_blocknum = get_blocknum(-1)
+        latest_blocknum = get_blocknum(max_index)
 
         # requested blocknum/timestamp is after the latest account operation
         if target_blocknum >= latest_blocknum:
@@ -1667,12 +1833,32 @@ class Account(BlockchainObject):
         last_op_num = None
         cnt = 0
 
+        # narrow the search range with already known operations
+        bounds = list(get_account_op_index(self["name"], self.steem.chain_params["chain_id"]).get_bounds(target_blocknum))
+        if self.steem.account_history_storage is not None:
+            bounds += self.steem.account_history_storage.get_op_bounds(
+                self["name"], target_blocknum, chain_id=self.steem.chain_params["chain_id"])
+        for bound in bounds:
+            if bound is None or bound[0] > max_index:
+                continue
+            if bound[1] < target_blocknum and bound[0] > op_lower:
+                op_lower, block_lower = bound
+            elif bound[1] >= target_blocknum and bound[0] < op_upper:
+                op_upper, block_upper = bound
+
         while True:
             # check if the maximum number of iterations was reached
             if max_count != -1 and cnt >= max_count:
                 # did not converge, return the current state
                 return op_num
 
+            # the remaining range fits into a single call
+            if stop_diff < op_upper - op_lower <= 1000:
+                for item_index, event in self._get_account_history(start=op_upper, limit=op_upper - op_lower - 1):
+                    if event["block"] >= target_blocknum:
+                        return item_index
+                return op_upper
+
             # linear approximation between the known upper and
             # lower bounds for the first iteration
             if cnt < 1:
@@ -1808,43 +1994,80 @@ class Account(BlockchainObject):
             elif stop is not None and not use_block_num and order == -1 and item_index < stop:
                 return
 
-            if isinstance(event['op'], list):
-                op_type, op = event['op']
-            else:
-                op_type = event['op']['type']
-                if len(op_type) > 10 and op_type[len(op_type) - 10:] == "_operation":
-                    op_type = op_type[:-10]
-                op = event['op']['value']
-            block_props = remove_from_dict(event, keys=['op'], keep_keys=False)
-
-            def construct_op(account_name):
-                # verbatim output from steemd
-                if raw_output:
-                    return item
-
-                # index can change during reindexing in
-                # future hard-forks. Thus we cannot take it for granted.
-                immutable = op.copy()
-                immutable.update(block_props)
-                immutable.update({
-                    'account': account_name,
-                    'type': op_type,
-                })
-                _id = Blockchain.hash_op(immutable)
-                immutable.update({
-                    '_id': _id,
-                    'index': item_index,
-                })
-                return immutable
+            op_type, op = _get_history_op(event)
 
             if exclude_ops and op_type in exclude_ops:
                 continue
             if not only_ops or op_type in only_ops:
-                yield construct_op(self["name"])
+                if raw_output:
+                    # verbatim output from steemd
+                    yield item
+                else:
+                    yield _construct_history_op(self["name"], item_index, op_type, op, event)
+
+    def _history_pages(self, first, limit, max_index, stop=None, use_block_num=True):
+        """ Yields the ``(index, limit)`` pairs of the get_account_history
+            calls, which are needed by :func:`history`
+        """
+        last_round = False
+        while True:
+            yield first, limit
+            if first < max_index and first + limit >= max_index and not last_round:
+                limit = max_index - first - 1
+                first = max_index
+                last_round = True
+            else:
+                first += (limit + 1)
+                if stop is not None and not use_block_num and isinstance(stop, int) and first >= stop + limit:
+                    break
+                elif first > max_index or last_round:
+                    break
+
+    def _get_account_history_from_queue(self, index, limit, steem_queue, only_ops=[], exclude_ops=[], raw_output=False):
+        """ Fetches a history page with the next idle steem instance from steem_queue"""
+        steem_instance = steem_queue.get()
+        try:
+            account = Account(self, steem_instance=steem_instance)
+            return list(account.get_account_history(index, limit, order=1, only_ops=only_ops,
+                                                    exclude_ops=exclude_ops, raw_output=raw_output))
+        finally:
+            steem_queue.put(steem_instance)
+
+    def _history_prefetch(self, pool, steem_queue, pages, window_size, only_ops=[], exclude_ops=[], raw_output=False):
+        """ Yields the history pages in order, while keeping up to
+            window_size pages submitted to the thread pool.
+
+            The window is refilled every time the oldest page was yielded.
+            A failed page is requested once more outside of the thread pool.
+        """
+        window = deque()
+        pages = iter(pages)
+        try:
+            while True:
+                for index, limit in pages:
+                    window.append((index, limit, pool.submit(
+                        self._get_account_history_from_queue, index, limit, steem_queue,
+                        only_ops=only_ops, exclude_ops=exclude_ops, raw_output=raw_output)))
+                    if len(window) >= window_size:
+                        break
+                if len(window) == 0:
+                    return
+                index, limit, future = window.popleft()
+                try:
+                    page = future.result()
+                except Exception as e:
+                    log.error(str(e))
+                    page = self._get_account_history_from_queue(index, limit, steem_queue, only_ops=only_ops,
+                                                                exclude_ops=exclude_ops, raw_output=raw_output)
+                yield page
+        finally:
+            for index, limit, future in window:
+                future.cancel()
 
     def history(
         self, start=None, stop=None, use_block_num=True,
-        only_ops=[], exclude_ops=[], batch_size=1000, raw_output=False
+        only_ops=[], exclude_ops=[], batch_size=1000, raw_output=False,
+        threading=False, thread_num=8
     ):
         """ Returns a generator for individual account transactions. The
             earlist operation will be first. This call can be used in a
@@ -1863,6 +2086,11 @@ class Account(BlockchainObject):
             :param int batch_size: internal api call batch size (*optional*)
             :param bool raw_output: if False, the output is a dict, which
                 includes all values. Otherwise, the output is list.
+            :param bool threading: Enables threading. The history pages are
+                fetched concurrently and yielded in order.
+            :param int thread_num: Defines the number of threads, when
+                `threading` is set. Up to ``2 * thread_num`` pages are
+                requested at the same time.
 
             .. note::
                 only_ops and exclude_ops takes an array of strings:
@@ -1931,23 +2159,19 @@ class Account(BlockchainObject):
             op_est = self.estimate_virtual_op_num(start, stop_diff=1)
             est_diff = 0
             if isinstance(start, (datetime, date, time)):
-                for h in self.get_account_history(op_est, 0):
-                    block_date = formatTimeString(h["timestamp"])
+                block_date = formatTimeString(self._get_op_block(op_est)[1])
                 while(op_est > est_diff + batch_size and block_date > start):
                     est_diff += batch_size
                     if op_est - est_diff < 0:
                         est_diff = op_est
-                    for h in self.get_account_history(op_est - est_diff, 0):
-                        block_date = formatTimeString(h["timestamp"])
+                    block_date = formatTimeString(self._get_op_block(op_est - est_diff)[1])
             elif not isinstance(start, (datetime, date, time)):
-                for h in self.get_account_history(op_est, 0):
-                    block_num = h["block"]
+                block_num = self._get_op_block(op_est)[0]
                 while(op_est > est_diff + batch_size and block_num > start):
                     est_diff += batch_size
                     if op_est - est_diff < 0:
                         est_diff = op_est
-                    for h in self.get_account_history(op_est - est_diff, 0):
-                        block_num = h["block"]
+                    block_num = self._get_op_block(op_est - est_diff)[0]
             start_index = op_est - est_diff
         else:
             start_index = 0
@@ -1956,12 +2180,45 @@ class Account(BlockchainObject):
         if first > max_index:
             _limit = max_index - start_index + 1
             first = start_index + _limit
-        last_round = False
         if _limit < 0:
             return
-        while True:
-            # RPC call
-            for item in self.get_account_history(first, _limit, start=None, stop=None, order=1, raw_output=raw_output):
+        pages = self._history_pages(first, _limit, max_index, stop=stop, use_block_num=use_block_num)
+        if stop is None:
+            # filter the operations already while the pages are fetched
+            page_only_ops, page_exclude_ops = only_ops, exclude_ops
+        else:
+            # all operations are needed for finding stop
+            page_only_ops, page_exclude_ops = [], []
+        if threading and FUTURES_MODULE is not None:
+            pool = ThreadPoolExecutor(max_workers=thread_num)
+            steem_queue = Queue()
+            steem_queue.put(self.steem)
+            nodelist = self.steem.rpc.nodes.export_working_nodes()
+            for i in range(thread_num - 1):
+                steem_queue.put(stm.Steem(node=nodelist,
+                                          num_retries=self.steem.rpc.num_retries,
+                                          num_retries_call=self.steem.rpc.num_retries_call,
+                                          timeout=self.steem.rpc.timeout,
+                                          account_history_storage=self.steem.account_history_storage))
+            history_pages = self._history_prefetch(pool, steem_queue, pages, 2 * thread_num, only_ops=page_only_ops,
+                                                   exclude_ops=page_exclude_ops, raw_output=raw_output)
+        else:
+            pool = None
+            history_pages = (self.get_account_history(index, limit, order=1, only_ops=page_only_ops,
+                                                      exclude_ops=page_exclude_ops, raw_output=raw_output)
+                             for index, limit in pages)
+        try:
+            for item in self._history_items(history_pages, start, stop, use_block_num, only_ops, exclude_ops, raw_output):
+                yield item
+        finally:
+            if pool is not None:
+                history_pages.close()
+                pool.shutdown(wait=False)
+
+    def _history_items(self, history_pages, start, stop, use_block_num, only_ops, exclude_ops, raw_output):
+        """ Applies start, stop, only_ops and exclude_ops to the items of the history pages"""
+        for page in history_pages:
+            for item in page:
                 if raw_output:
                     item_index, event = item
                     op_type, op = event['op']
@@ -1983,7 +2240,6 @@ class Account(BlockchainObject):
                 if stop is not None and isinstance(stop, (datetime, date, time)):
                     timediff = stop - formatTimeString(timestamp)
                     if timediff.total_seconds() < 0:
-                        first = max_index + _limit
                         return
                 elif stop is not None and use_block_num and block_num > stop:
                     return
@@ -1993,16 +2249,6 @@ class Account(BlockchainObject):
                     continue
                 if not only_ops or op_type in only_ops:
                     yield item
-            if first < max_index and first + _limit >= max_index and not last_round:
-                _limit = max_index - first - 1
-                first = max_index
-                last_round = True
-            else:
-                first += (_limit + 1)
-                if stop is not None and not use_block_num and isinstance(stop, int) and first >= stop + _limit:
-                    break
-                elif first > max_index or last_round:
-                    break
 
     def history_reverse(
         self, start=None, stop=None, use_block_num=True,
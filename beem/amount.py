@@ -6,8 +6,10 @@ from __future__ import unicode_literals
 from builtins import bytes, int, str
 from future.utils import python_2_unicode_compatible
 from beemgraphenebase.py23 import bytes_types, integer_types, string_types, text_type
+from beemgraphenebase.chains import known_chains
 from beem.instance import shared_steem_instance
 from beem.asset import Asset
+from beem.exceptions import AssetDoesNotExistsException
 from decimal import Decimal, ROUND_DOWN
 
 
@@ -438,3 +440,259 @@ class Amount(dict):
     __repr__ = __str__
     __truediv__ = __div__
     __truemul__ = __mul__
+
+
+class AssetInfo(object):
+    """ Lightweight description of a chain asset, which is used by
+        :class:`CompactAmount`. There is only one instance for each
+        asset of a chain, see :func:`get_asset_table`.
+
+        :param str symbol: asset symbol, e.g. ``STEEM``
+        :param str asset: NAI, e.g. ``@@000000021``
+        :param int precision: number of decimal places
+        :param int asset_id: asset id
+    """
+    __slots__ = ("symbol", "asset", "precision", "id")
+
+    def __init__(self, symbol, asset, precision, asset_id):
+        self.symbol = symbol
+        self.asset = asset
+        self.precision = precision
+        self.id = asset_id
+
+    def json(self):
+        return {"symbol": self.symbol, "asset": self.asset, "precision": self.precision, "id": self.id}
+
+    def __repr__(self):
+        return "<AssetInfo %s>" % self.symbol
+
+
+_asset_tables = {}
+
+
+def get_asset_table(steem_instance=None):
+    """ Returns a dict, which maps the symbol, NAI and id of each asset of
+        the chain to its :class:`AssetInfo`. The table is only created
+        once for each chain id.
+
+        :param Steem steem_instance: Steem instance
+    """
+    steem = steem_instance or shared_steem_instance()
+    chain_params = steem.chain_params
+    if chain_params is None:
+        chain_params = known_chains["STEEMAPPBASE"]
+    table = _asset_tables.get(chain_params["chain_id"])
+    if table is None:
+        table = {}
+        for asset in chain_params["chain_assets"]:
+            info = AssetInfo(asset["symbol"], asset["asset"], asset["precision"], asset["id"])
+            table[info.symbol] = info
+            table[info.asset] = info
+            table[info.id] = info
+        _asset_tables[chain_params["chain_id"]] = table
+    return table
+
+
+def _lookup_asset(asset_table, asset):
+    try:
+        return asset_table[asset]
+    except KeyError:
+        raise AssetDoesNotExistsException(str(asset))
+
+
+def _parse_amount_string(value, precision):
+    """ Converts a decimal string into an integer with ``precision``
+        decimal places (rounded down)
+    """
+    negative = value[:1] == "-"
+    if negative:
+        value = value[1:]
+    whole, _, frac = value.partition(".")
+    try:
+        amount = int(whole or "0") * 10 ** precision + int((frac + "0" * precision)[:precision] or "0")
+    except ValueError:
+        amount = int(quantize(value, precision) * 10 ** precision)
+    if negative:
+        return -amount
+    return amount
+
+
+@python_2_unicode_compatible
+class CompactAmount(object):
+    """ Memory efficient and fast amount, which stores the amount as
+        integer (satoshis) together with an :class:`AssetInfo`. All
+        operations are fixed point operations.
+
+        :param int amount: amount in satoshis (e.g. 1000 for 1.000 STEEM)
+        :param AssetInfo asset: asset of the amount
+
+        Use :func:`from_json` for parsing values from the API and
+        :func:`to_amount` / :func:`from_amount` for conversions to and from
+        :class:`Amount`.
+
+        .. code-block:: python
+
+            from beem.amount import CompactAmount, get_asset_table
+            table = get_asset_table()
+            a = CompactAmount.from_json("1.000 STEEM", asset_table=table)
+            b = CompactAmount.from_json({"amount": "2000", "nai": "@@000000021", "precision": 3}, asset_table=table)
+            print(a + b)
+            >> 3.000 STEEM
+
+    """
+    __slots__ = ("amount", "asset")
+
+    def __init__(self, amount, asset):
+        self.amount = amount
+        self.asset = asset
+
+    @classmethod
+    def from_json(cls, value, asset_table=None, steem_instance=None):
+        """ Parses an amount string (``"1.000 STEEM"``), a NAI dict or an
+            amount list (``["1000", 3, "@@000000021"]``)
+
+            :param asset_table: (optional) table from
+                :func:`get_asset_table`, which should be reused when many
+                amounts are parsed
+            :param Steem steem_instance: Steem instance
+        """
+        if asset_table is None:
+            asset_table = get_asset_table(steem_instance=steem_instance)
+        if isinstance(value, string_types):
+            amount, symbol = value.split(" ")
+            asset = _lookup_asset(asset_table, symbol)
+            return cls(_parse_amount_string(amount, asset.precision), asset)
+        elif isinstance(value, dict) and "nai" in value:
+            return cls(int(value["amount"]), _lookup_asset(asset_table, value["nai"]))
+        elif isinstance(value, (list, tuple)) and len(value) == 3:
+            return cls(int(value[0]), _lookup_asset(asset_table, value[2]))
+        elif isinstance(value, Amount):
+            return cls.from_amount(value, asset_table=asset_table)
+        raise ValueError("Unknown amount format: %s" % str(value))
+
+    @classmethod
+    def from_amount(cls, amount, asset_table=None, steem_instance=None):
+        """ Converts an :class:`Amount` into a CompactAmount"""
+        if asset_table is None:
+            asset_table = get_asset_table(steem_instance=steem_instance or amount.steem)
+        return cls(int(amount), _lookup_asset(asset_table, amount["symbol"]))
+
+    def to_amount(self, steem_instance=None):
+        """ Returns the amount as :class:`Amount`"""
+        return Amount(Decimal(self.amount).scaleb(-self.asset.precision), self.asset.json(),
+                      steem_instance=steem_instance)
+
+    @property
+    def symbol(self):
+        return self.asset.symbol
+
+    @property
+    def precision(self):
+        return self.asset.precision
+
+    def json(self):
+        return {'amount': str(self.amount), 'nai': self.asset.asset, 'precision': self.asset.precision}
+
+    def _check_asset(self, other):
+        if other.asset is not self.asset and other.asset.symbol != self.asset.symbol:
+            raise AssertionError()
+
+    def __str__(self):
+        precision = self.asset.precision
+        whole, frac = divmod(abs(self.amount), 10 ** precision)
+        sign = "-" if self.amount < 0 else ""
+        if precision:
+            return "%s%d.%0*d %s" % (sign, whole, precision, frac, self.asset.symbol)
+        return "%s%d %s" % (sign, whole, self.asset.symbol)
+
+    def __repr__(self):
+        return "<CompactAmount %s>" % str(self)
+
+    def __float__(self):
+        return self.amount / 10 ** self.asset.precision
+
+    def __int__(self):
+        return self.amount
+
+    def __bool__(self):
+        return self.amount != 0
+
+    __nonzero__ = __bool__
+
+    def __hash__(self):
+        return hash((self.amount, self.asset.symbol))
+
+    def __neg__(self):
+        return CompactAmount(-self.amount, self.asset)
+
+    def __abs__(self):
+        return CompactAmount(abs(self.amount), self.asset)
+
+    def _other_amount(self, other):
+        """ Returns the amount of ``other`` in satoshis of this asset.
+            Amounts and amount strings must have the same asset, numbers
+            are interpreted in this asset.
+        """
+        if isinstance(other, CompactAmount):
+            self._check_asset(other)
+            return other.amount
+        elif isinstance(other, Amount):
+            if other["symbol"] != self.asset.symbol:
+                raise AssertionError()
+            return int(other)
+        elif isinstance(other, string_types) and " " in other.strip():
+            amount, symbol = other.strip().split(" ")
+            if symbol != self.asset.symbol:
+                raise AssertionError()
+            return _parse_amount_string(amount, self.asset.precision)
+        elif isinstance(other, string_types + integer_types + (float, Decimal)):
+            return _parse_amount_string(str(other), self.asset.precision)
+        raise ValueError("Unknown amount format: %s" % str(other))
+
+    def __add__(self, other):
+        return CompactAmount(self.amount + self._other_amount(other), self.asset)
+
+    def __radd__(self, other):
+        # makes sum() work
+        if other == 0:
+            return self
+        return self.__add__(other)
+
+    def __sub__(self, other):
+        return CompactAmount(self.amount - self._other_amount(other), self.asset)
+
+    def __mul__(self, other):
+        if isinstance(other, integer_types):
+            return CompactAmount(self.amount * other, self.asset)
+        return CompactAmount(int(quantize(self.amount * Decimal(str(other)), 0)), self.asset)
+
+    __rmul__ = __mul__
+
+    def __div__(self, other):
+        if isinstance(other, CompactAmount):
+            self._check_asset(other)
+            return self.amount / other.amount
+        return CompactAmount(int(quantize(self.amount / Decimal(str(other)), 0)), self.asset)
+
+    __truediv__ = __div__
+
+    def _compare_value(self, other):
+        return self._other_amount(other or 0)
+
+    def __eq__(self, other):
+        return self.amount == self._compare_value(other)
+
+    def __ne__(self, other):
+        return self.amount != self._compare_value(other)
+
+    def __lt__(self, other):
+        return self.amount < self._compare_value(other)
+
+    def __le__(self, other):
+        return self.amount <= self._compare_value(other)
+
+    def __gt__(self, other):
+        return self.amount > self._compare_value(other)
+
+    def __ge__(self, other):
+        return self.amount >= self._compare_value(other)
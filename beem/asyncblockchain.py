@@ -0,0 +1,237 @@
+# This Python file uses the following encoding: utf-8
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+import asyncio
+import collections
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from .block import Block
+from .blockchain import Blockchain
+from .exceptions import OfflineHasNoRPCException
+from beemapi.rpcutils import get_query
+log = logging.getLogger(__name__)
+
+
+class AsyncBlockchain(object):
+    """ asyncio based block source, which keeps up to ``max_in_flight``
+        ``get_block`` requests outstanding and yields the blocks strictly
+        in order as soon as the oldest requested block has arrived.
+
+        :param Steem steem_instance: Steem instance
+        :param str mode: (default) Irreversible block (``irreversible``) or
+            actual head block (``head``)
+        :param int max_in_flight: maximum number of concurrent
+            ``get_block`` requests (default is 8)
+        :param int max_block_wait_repetition: maximum wait repetition for next block
+            where each repetition is block_interval long (default is 3)
+
+        All requests share the connection pool of the ``requests`` session
+        of ``steem_instance``, no additional Steem instances are created.
+        Websocket nodes are only used concurrently when ``steem_instance``
+        was created with ``ws_multiplex=True``. Calls which fail on the fast
+        path (and all calls to other websocket nodes) are retried through
+        the normal rpc with its node switching and retry logic.
+
+        .. note:: This class needs python 3.6 or higher.
+
+        .. code-block:: python
+
+            import asyncio
+            from beem.asyncblockchain import AsyncBlockchain
+
+            async def main():
+                chain = AsyncBlockchain(max_in_flight=16)
+                async for op in chain.stream(opNames=["transfer"], start=25000000, stop=25000100):
+                    print(op)
+
+            asyncio.get_event_loop().run_until_complete(main())
+
+    """
+    def __init__(
+        self,
+        steem_instance=None,
+        mode="irreversible",
+        max_in_flight=8,
+        max_block_wait_repetition=None,
+    ):
+        self.blockchain = Blockchain(steem_instance=steem_instance, mode=mode,
+                                     max_block_wait_repetition=max_block_wait_repetition)
+        self.steem = self.blockchain.steem
+        self.block_interval = self.blockchain.block_interval
+        self.max_in_flight = max_in_flight
+        self._executor = ThreadPoolExecutor(max_workers=max_in_flight)
+        self._rpc_lock = threading.Lock()
+
+    def close(self):
+        """ Shuts down the executor threads"""
+        self._executor.shutdown(wait=False)
+
+    async def _run(self, func, *args):
+        """ Runs func in the executor"""
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    def _call_locked(self, func, *args, **kwargs):
+        """ Calls func while holding the rpc lock, as the rpc object itself
+            is not thread safe
+        """
+        with self._rpc_lock:
+            return func(*args, **kwargs)
+
+    async def get_current_block_num(self):
+        """ Returns the current block number (depends on ``mode``)"""
+        return await self._run(self._call_locked, self.blockchain.get_current_block_num)
+
+    def _get_block_query(self, block_num, only_ops=False, only_virtual_ops=False):
+        """ Returns the json-rpc query for fetching a single block"""
+        rpc = self.steem.rpc
+        # shares the ids of the rpc, as replies on a multiplexed websocket are matched by id
+        request_id = rpc.get_request_id()
+        if rpc.get_use_appbase():
+            if only_ops or only_virtual_ops:
+                return get_query(True, request_id, "account_history_api", "get_ops_in_block",
+                                 [{"block_num": block_num, "only_virtual": only_virtual_ops}])
+            return get_query(True, request_id, "block_api", "get_block", [{"block_num": block_num}])
+        if rpc.is_appbase_ready():
+            api_name = "condenser_api"
+        else:
+            api_name = "database_api"
+        if only_ops or only_virtual_ops:
+            return get_query(False, request_id, api_name, "get_ops_in_block", [block_num, only_virtual_ops])
+        return get_query(False, request_id, api_name, "get_block", [block_num])
+
+    def _parse_block_reply(self, block_num, result, only_ops=False, only_virtual_ops=False):
+        """ Converts the rpc result into the block dict used by
+            :class:`beem.block.Block`. Returns None when the block is not
+            available
+        """
+        if not bool(result):
+            return None
+        if only_ops or only_virtual_ops:
+            if isinstance(result, dict):
+                ops = result.get("ops", [])
+            else:
+                ops = result
+            if bool(ops):
+                return {'block': ops[0]["block"],
+                        'timestamp': ops[0]["timestamp"],
+                        'operations': ops}
+            return {'block': block_num,
+                    'timestamp': "1970-01-01T00:00:00",
+                    'operations': []}
+        if isinstance(result, dict) and "block" in result:
+            result = result["block"]
+        if not bool(result):
+            return None
+        return result
+
+    def _fetch_block_data(self, block_num, only_ops=False, only_virtual_ops=False):
+        """ Sends a single get_block request over the shared http session
+            or the multiplexed websocket. This is thread safe, as it only
+            reads the rpc state. Returns None when the fast path is not
+            possible or has failed.
+        """
+        rpc = self.steem.rpc
+        if rpc.url is None:
+            return None
+        if rpc.ws is not None:
+            if getattr(rpc, "ws_multiplexer", None) is None:
+                return None
+        elif rpc.session is None:
+            return None
+        query = self._get_block_query(block_num, only_ops=only_ops, only_virtual_ops=only_virtual_ops)
+        payload = json.dumps(query, ensure_ascii=False).encode('utf8')
+        try:
+            if rpc.ws is not None:
+                ret = json.loads(rpc.ws_send(payload), strict=False)
+            else:
+                ret = rpc.request_send(payload).json()
+        except Exception as e:
+            log.debug("Fast path failed for block %d: %s" % (block_num, str(e)))
+            return None
+        if not isinstance(ret, dict) or "error" in ret:
+            return None
+        return self._parse_block_reply(block_num, ret.get("result"), only_ops=only_ops,
+                                       only_virtual_ops=only_virtual_ops)
+
+    def _get_block(self, block_num, only_ops=False, only_virtual_ops=False):
+        """ Returns a :class:`beem.block.Block` (runs inside the executor)"""
+        data = self._fetch_block_data(block_num, only_ops=only_ops, only_virtual_ops=only_virtual_ops)
+        if data is None:
+            return self._call_locked(
+                self.blockchain.wait_for_and_get_block, block_num, only_ops=only_ops,
+                only_virtual_ops=only_virtual_ops)
+        block = Block(data, only_ops=only_ops, only_virtual_ops=only_virtual_ops, steem_instance=self.steem)
+        block["id"] = block.block_num
+        block.identifier = block.block_num
+        return block
+
+    async def get_block(self, block_num, only_ops=False, only_virtual_ops=False):
+        """ Returns a single block
+
+            :param int block_num: block number
+            :param bool only_ops: Only return operations (default: False)
+            :param bool only_virtual_ops: Only return virtual operations (default: False)
+        """
+        return await self._run(self._get_block, block_num, only_ops, only_virtual_ops)
+
+    async def blocks(self, start=None, stop=None, only_ops=False, only_virtual_ops=False):
+        """ Yields blocks starting from ``start``.
+
+            :param int start: Starting block
+            :param int stop: Stop at this block
+            :param bool only_ops: Only yield operations (default: False).
+                Cannot be combined with ``only_virtual_ops=True``.
+            :param bool only_virtual_ops: Only yield virtual operations (default: False)
+
+            Up to ``max_in_flight`` blocks are requested concurrently. The
+            window is refilled each time the oldest block has been yielded.
+        """
+        if not self.steem.is_connected():
+            raise OfflineHasNoRPCException("No RPC available in offline mode!")
+        current_block_num = await self.get_current_block_num()
+        if not start:
+            start = current_block_num
+        pending = collections.deque()
+        try:
+            while True:
+                if stop:
+                    head_block = stop
+                else:
+                    head_block = await self.get_current_block_num()
+                blocknum = start
+                while blocknum <= head_block or len(pending) > 0:
+                    while blocknum <= head_block and len(pending) < self.max_in_flight:
+                        pending.append(asyncio.ensure_future(
+                            self.get_block(blocknum, only_ops=only_ops, only_virtual_ops=only_virtual_ops)))
+                        blocknum += 1
+                    block = await pending.popleft()
+                    yield block
+                start = head_block + 1
+                if stop and start > stop:
+                    return
+                await asyncio.sleep(self.block_interval)
+        finally:
+            for future in pending:
+                future.cancel()
+
+    async def stream(self, opNames=[], raw_ops=False, *args, **kwargs):
+        """ Yield specific operations (e.g. comments) only
+
+            :param array opNames: List of operations to filter for
+            :param bool raw_ops: When set to True, it returns the unmodified operations (default: False)
+            :param int start: Start at this block
+            :param int stop: Stop at this block
+            :param bool only_ops: Only yield operations (default: False)
+                Cannot be combined with ``only_virtual_ops=True``
+            :param bool only_virtual_ops: Only yield virtual operations (default: False)
+
+            The output is identical to :func:`beem.blockchain.Blockchain.stream`.
+        """
+        async for block in self.blocks(**kwargs):
+            for op in self.blockchain._get_ops_from_block(block, opNames=opNames, raw_ops=raw_ops):
+                yield op
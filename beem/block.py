@@ -125,6 +125,11 @@ class Block(BlockchainObject):
         """
         if self.identifier is None:
             return
+        block = self._get_stored_block()
+        if block is not None:
+            block = self._parse_json_data(block)
+            super(Block, self).__init__(block, lazy=self.lazy, full=self.full, steem_instance=self.steem)
+            return
         if not self.steem.is_connected():
             return
         self.steem.rpc.set_next_node_on_empty_reply(False)
@@ -156,9 +161,36 @@ class Block(BlockchainObject):
                 block = self.steem.rpc.get_block(self.identifier)
         if not block:
             raise BlockDoesNotExistsException("output: %s of identifier %s" % (str(block), str(self.identifier)))
+        self._store_block(block)
         block = self._parse_json_data(block)
         super(Block, self).__init__(block, lazy=self.lazy, full=self.full, steem_instance=self.steem)
 
+    def _get_stored_block(self):
+        """ Returns the block data from the block storage of the steem
+            instance or None, when it is not stored
+        """
+        block_storage = self.steem.block_storage
+        if block_storage is None:
+            return None
+        block_type = block_storage.get_block_type(self.only_ops, self.only_virtual_ops)
+        return block_storage.get_block(self.identifier, block_type=block_type,
+                                       chain_id=self.steem.chain_params["chain_id"])
+
+    def _store_block(self, block):
+        """ Stores the (unparsed) block data in the block storage of the
+            steem instance, when the block is irreversible
+        """
+        block_storage = self.steem.block_storage
+        if block_storage is None:
+            return
+        props = self.steem.get_dynamic_global_properties()
+        if props is None or "last_irreversible_block_num" not in props:
+            return
+        block_type = block_storage.get_block_type(self.only_ops, self.only_virtual_ops)
+        block_storage.store_block(self.identifier, block, block_type=block_type,
+                                  chain_id=self.steem.chain_params["chain_id"],
+                                  last_irreversible_block_num=int(props["last_irreversible_block_num"]))
+
     @property
     def block_num(self):
         """Returns the block number"""
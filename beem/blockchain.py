@@ -12,6 +12,7 @@ import time
 import hashlib
 import json
 import math
+from collections import deque
 from threading import Thread, Event
 from time import sleep
 import logging
@@ -34,7 +35,7 @@ else:
 FUTURES_MODULE = None
 if not FUTURES_MODULE:
     try:
-        from concurrent.futures import ThreadPoolExecutor, wait, as_completed
+        from concurrent.futures import ThreadPoolExecutor
         FUTURES_MODULE = "futures"
         # FUTURES_MODULE = None
     except ImportError:
@@ -394,6 +395,7 @@ class Blockchain(object):
                 Cannot be combined with threading
             :param bool threading: Enables threading. Cannot be combined with batch calls
             :param int thread_num: Defines the number of threads, when `threading` is set.
+                Up to ``4 * thread_num`` blocks are prefetched and yielded in order.
             :param bool only_ops: Only yield operations (default: False).
                 Cannot be combined with ``only_virtual_ops=True``.
             :param bool only_virtual_ops: Only yield virtual operations (default: False)
@@ -421,7 +423,12 @@ class Blockchain(object):
                 steem_instance.append(stm.Steem(node=nodelist,
                                                 num_retries=self.steem.rpc.num_retries,
                                                 num_retries_call=self.steem.rpc.num_retries_call,
-                                                timeout=self.steem.rpc.timeout))
+                                                timeout=self.steem.rpc.timeout,
+                                                block_storage=self.steem.block_storage))
+            # Idle steem instances, each one is used by only one worker at a time
+            steem_queue = Queue()
+            for stm_instance in steem_instance:
+                steem_queue.put(stm_instance)
         # We are going to loop indefinitely
         latest_block = 0
         while True:
@@ -430,46 +437,35 @@ class Blockchain(object):
             else:
                 current_block_num = self.get_current_block_num()
                 head_block = current_block_num
-            if threading and not head_block_reached:
+            if threading and FUTURES_MODULE is not None and not head_block_reached:
+                for block in self._blocks_prefetch(pool, steem_queue, start, head_block, 4 * thread_num,
+                                                   only_ops=only_ops, only_virtual_ops=only_virtual_ops,
+                                                   num_retries=self.steem.rpc.num_retries):
+                    yield block
+            elif threading and not head_block_reached:
                 latest_block = start - 1
                 result_block_nums = []
                 for blocknum in range(start, head_block + 1, thread_num):
-                    # futures = []
                     i = 0
-                    if FUTURES_MODULE is not None:
-                        futures = []
                     block_num_list = []
-                    # freeze = self.steem.rpc.nodes.freeze_current_node
                     num_retries = self.steem.rpc.nodes.num_retries
-                    # self.steem.rpc.nodes.freeze_current_node = True
                     self.steem.rpc.nodes.num_retries = thread_num
                     error_cnt = self.steem.rpc.nodes.node.error_cnt
                     while i < thread_num and blocknum + i <= head_block:
                         block_num_list.append(blocknum + i)
                         results = []
-                        if FUTURES_MODULE is not None:
-                            futures.append(pool.submit(Block, blocknum + i, only_ops=only_ops, only_virtual_ops=only_virtual_ops, steem_instance=steem_instance[i]))
-                        else:
-                            pool.enqueue(Block, blocknum + i, only_ops=only_ops, only_virtual_ops=only_virtual_ops, steem_instance=steem_instance[i])
+                        pool.enqueue(Block, blocknum + i, only_ops=only_ops, only_virtual_ops=only_virtual_ops, steem_instance=steem_instance[i])
                         i += 1
-                    if FUTURES_MODULE is not None:
-                        try:
-                            results = [r.result() for r in as_completed(futures)]
-                        except Exception as e:
-                            log.error(str(e))
-                    else:
-                        pool.run(True)
-                        pool.join()
-                        for result in pool.results():
-                            results.append(result)
-                        pool.abort()
+                    pool.run(True)
+                    pool.join()
+                    for result in pool.results():
+                        results.append(result)
+                    pool.abort()
                     self.steem.rpc.nodes.num_retries = num_retries
-                    # self.steem.rpc.nodes.freeze_current_node = freeze
                     new_error_cnt = self.steem.rpc.nodes.node.error_cnt
                     self.steem.rpc.nodes.node.error_cnt = error_cnt
                     if new_error_cnt > error_cnt:
                         self.steem.rpc.nodes.node.error_cnt += 1
-                    #    self.steem.rpc.next()
 
                     checked_results = []
                     for b in results:
@@ -512,6 +508,20 @@ class Blockchain(object):
                     # Get full block
                     if (head_block - blocknumblock) < batches:
                         batches = head_block - blocknumblock + 1
+                    stored_blocks = {}
+                    if self.steem.block_storage is not None and not only_virtual_ops:
+                        stored_blocks = self.steem.block_storage.get_blocks(
+                            blocknumblock, blocknumblock + batches - 1,
+                            chain_id=self.steem.chain_params["chain_id"])
+                    if len(stored_blocks) == batches:
+                        # The complete batch is stored, no rpc call is needed
+                        for blocknum in range(blocknumblock, blocknumblock + batches):
+                            block = Block(stored_blocks[blocknum], only_ops=only_ops, only_virtual_ops=only_virtual_ops, steem_instance=self.steem)
+                            block["id"] = block.block_num
+                            block.identifier = block.block_num
+                            yield block
+                        latest_block = blocknumblock + batches - 1
+                        continue
                     for blocknum in range(blocknumblock, blocknumblock + batches - 1):
                         if only_virtual_ops:
                             if self.steem.rpc.get_use_appbase():
@@ -544,6 +554,7 @@ class Blockchain(object):
                         blocknum = latest_block - len(block_batch) + 1
                         if not isinstance(block_batch, list):
                             block_batch = [block_batch]
+                        raw_blocks = []
                         for block in block_batch:
                             if not bool(block):
                                 continue
@@ -552,6 +563,10 @@ class Blockchain(object):
                                     block = block["ops"]
                                 else:
                                     block = block["block"]
+                            raw_blocks.append(block)
+                        if self.steem.block_storage is not None and not only_virtual_ops:
+                            self._store_blocks(raw_blocks)
+                        for block in raw_blocks:
                             block = Block(block, only_ops=only_ops, only_virtual_ops=only_virtual_ops, steem_instance=self.steem)
                             block["id"] = block.block_num
                             block.identifier = block.block_num
@@ -573,6 +588,73 @@ class Blockchain(object):
             # Sleep for one block
             time.sleep(self.block_interval)
 
+    def _store_blocks(self, blocks):
+        """ Stores unparsed full blocks in the block storage of the steem
+            instance, blocks above the last irreversible block are skipped
+        """
+        props = self.steem.get_dynamic_global_properties()
+        if props is None or "last_irreversible_block_num" not in props:
+            return
+        blocks_to_store = []
+        for block in blocks:
+            if "block_id" in block:
+                blocks_to_store.append((int(block["block_id"][:8], base=16), block))
+        self.steem.block_storage.store_blocks(
+            blocks_to_store, chain_id=self.steem.chain_params["chain_id"],
+            last_irreversible_block_num=int(props["last_irreversible_block_num"]))
+
+    def _get_block_from_queue(self, block_num, steem_queue, only_ops=False, only_virtual_ops=False):
+        """ Fetches a block with the next idle steem instance from steem_queue"""
+        steem_instance = steem_queue.get()
+        try:
+            return Block(block_num, only_ops=only_ops, only_virtual_ops=only_virtual_ops, steem_instance=steem_instance)
+        finally:
+            steem_queue.put(steem_instance)
+
+    def _blocks_prefetch(self, pool, steem_queue, start, stop, window_size, only_ops=False, only_virtual_ops=False,
+                         num_retries=100):
+        """ Yields the blocks from start to stop in order, while keeping up to
+            window_size requests submitted to the thread pool.
+
+            The window is refilled every time the oldest block was yielded,
+            so that a slow reply only delays its own block. Failed or wrong
+            replies are requested again for this block number only, at most
+            num_retries times (-1 for no limit) with a growing sleep in between.
+            Pending requests are cancelled when the generator is closed.
+        """
+        window = deque()
+        blocknum = start
+        try:
+            while blocknum <= stop or len(window) > 0:
+                while blocknum <= stop and len(window) < window_size:
+                    window.append((blocknum, pool.submit(self._get_block_from_queue, blocknum, steem_queue,
+                                                         only_ops=only_ops, only_virtual_ops=only_virtual_ops)))
+                    blocknum += 1
+                block_num, future = window.popleft()
+                try:
+                    block = future.result()
+                except Exception as e:
+                    log.error(str(e))
+                    block = None
+                cnt = 0
+                while block is None or block.block_num is None or int(block.block_num) != block_num:
+                    cnt += 1
+                    if num_retries >= 0 and cnt > num_retries:
+                        raise BlockDoesNotExistsException("Block %d could not be received after %d retries" % (block_num, num_retries))
+                    time.sleep(min((cnt - 1) * 1.5 + 0.5, 10))
+                    try:
+                        block = self._get_block_from_queue(block_num, steem_queue, only_ops=only_ops,
+                                                           only_virtual_ops=only_virtual_ops)
+                    except Exception as e:
+                        log.error(str(e))
+                        block = None
+                block["id"] = block.block_num
+                block.identifier = block.block_num
+                yield block
+        finally:
+            for block_num, future in window:
+                future.cancel()
+
     def wait_for_and_get_block(self, block_number, blocks_waiting_for=None, only_ops=False, only_virtual_ops=False, block_number_check_cnt=-1, last_current_block_num=None):
         """ Get the desired block from the chain, if the current head block is smaller (for both head and irreversible)
             then we wait, but a maxmimum of blocks_waiting_for * max_block_wait_repetition time before failure.
@@ -721,63 +803,70 @@ class Blockchain(object):
 
         """
         for block in self.blocks(**kwargs):
-            if "transactions" in block:
-                trx = block["transactions"]
-            else:
-                trx = [block]
-            block_num = 0
-            trx_id = ""
-            _id = ""
-            timestamp = ""
-            for trx_nr in range(len(trx)):
-                if "operations" not in trx[trx_nr]:
-                    continue
-                for event in trx[trx_nr]["operations"]:
-                    if isinstance(event, list):
-                        op_type, op = event
-                        trx_id = block["transaction_ids"][trx_nr]
-                        block_num = block.get("id")
-                        _id = self.hash_op(event)
-                        timestamp = block.get("timestamp")
-                    elif isinstance(event, dict) and "type" in event and "value" in event:
-                        op_type = event["type"]
-                        if len(op_type) > 10 and op_type[len(op_type) - 10:] == "_operation":
-                            op_type = op_type[:-10]
-                        op = event["value"]
-                        trx_id = block["transaction_ids"][trx_nr]
-                        block_num = block.get("id")
-                        _id = self.hash_op(event)
-                        timestamp = block.get("timestamp")
-                    elif "op" in event and isinstance(event["op"], dict) and "type" in event["op"] and "value" in event["op"]:
-                        op_type = event["op"]["type"]
-                        if len(op_type) > 10 and op_type[len(op_type) - 10:] == "_operation":
-                            op_type = op_type[:-10]
-                        op = event["op"]["value"]
-                        trx_id = event.get("trx_id")
-                        block_num = event.get("block")
-                        _id = self.hash_op(event["op"])
-                        timestamp = event.get("timestamp")
+            for op in self._get_ops_from_block(block, opNames=opNames, raw_ops=raw_ops):
+                yield op
+
+    def _get_ops_from_block(self, block, opNames=[], raw_ops=False):
+        """ Yields the (filtered) operations of a single block in the
+            format used by :func:`stream`
+        """
+        if "transactions" in block:
+            trx = block["transactions"]
+        else:
+            trx = [block]
+        block_num = 0
+        trx_id = ""
+        _id = ""
+        timestamp = ""
+        for trx_nr in range(len(trx)):
+            if "operations" not in trx[trx_nr]:
+                continue
+            for event in trx[trx_nr]["operations"]:
+                if isinstance(event, list):
+                    op_type, op = event
+                    trx_id = block["transaction_ids"][trx_nr]
+                    block_num = block.get("id")
+                    _id = self.hash_op(event)
+                    timestamp = block.get("timestamp")
+                elif isinstance(event, dict) and "type" in event and "value" in event:
+                    op_type = event["type"]
+                    if len(op_type) > 10 and op_type[len(op_type) - 10:] == "_operation":
+                        op_type = op_type[:-10]
+                    op = event["value"]
+                    trx_id = block["transaction_ids"][trx_nr]
+                    block_num = block.get("id")
+                    _id = self.hash_op(event)
+                    timestamp = block.get("timestamp")
+                elif "op" in event and isinstance(event["op"], dict) and "type" in event["op"] and "value" in event["op"]:
+                    op_type = event["op"]["type"]
+                    if len(op_type) > 10 and op_type[len(op_type) - 10:] == "_operation":
+                        op_type = op_type[:-10]
+                    op = event["op"]["value"]
+                    trx_id = event.get("trx_id")
+                    block_num = event.get("block")
+                    _id = self.hash_op(event["op"])
+                    timestamp = event.get("timestamp")
+                else:
+                    op_type, op = event["op"]
+                    trx_id = event.get("trx_id")
+                    block_num = event.get("block")
+                    _id = self.hash_op(event["op"])
+                    timestamp = event.get("timestamp")
+                if not bool(opNames) or op_type in opNames and block_num > 0:
+                    if raw_ops:
+                        yield {"block_num": block_num,
+                               "trx_num": trx_nr,
+                               "op": [op_type, op],
+                               "timestamp": timestamp}
                     else:
-                        op_type, op = event["op"]
-                        trx_id = event.get("trx_id")
-                        block_num = event.get("block")
-                        _id = self.hash_op(event["op"])
-                        timestamp = event.get("timestamp")
-                    if not bool(opNames) or op_type in opNames and block_num > 0:
-                        if raw_ops:
-                            yield {"block_num": block_num,
-                                   "trx_num": trx_nr,
-                                   "op": [op_type, op],
-                                   "timestamp": timestamp}
-                        else:
-                            updated_op = {"type": op_type}
-                            updated_op.update(op.copy())
-                            updated_op.update({"_id": _id,
-                                               "timestamp": timestamp,
-                                               "block_num": block_num,
-                                               "trx_num": trx_nr,
-                                               "trx_id": trx_id})
-                            yield updated_op
+                        updated_op = {"type": op_type}
+                        updated_op.update(op.copy())
+                        updated_op.update({"_id": _id,
+                                           "timestamp": timestamp,
+                                           "block_num": block_num,
+                                           "trx_num": trx_nr,
+                                           "trx_id": trx_id})
+                        yield updated_op
 
     def awaitTxConfirmation(self, transaction, limit=10):
         """ Returns the transaction as seen by the blockchain after being
@@ -7,82 +7,179 @@ from builtins import str
 from future.utils import python_2_unicode_compatible
 from beemgraphenebase.py23 import bytes_types, integer_types, string_types, text_type
 from beem.instance import shared_steem_instance
-from datetime import datetime, timedelta
+from collections import OrderedDict, deque
 import json
+import sys
 import threading
+import time
+if hasattr(time, "monotonic"):
+    _monotonic = time.monotonic
+else:
+    _monotonic = time.time
 
 
 @python_2_unicode_compatible
 class ObjectCache(dict):
-
-    def __init__(self, initial_data={}, default_expiration=10, auto_clean=True):
-        super(ObjectCache, self).__init__(initial_data)
+    """ Thread safe LRU cache with expiring items
+
+        :param dict initial_data: items which are stored at creation
+        :param int default_expiration: items expire after this number of seconds (default is 10)
+        :param bool auto_clean: When True, expired items are removed during inserts (default is True)
+        :param int max_entries: When set, the least recently used items are removed when
+            more than ``max_entries`` items are stored (default is None)
+        :param int max_bytes: When set, the least recently used items are removed when the
+            approximate size of all items exceeds ``max_bytes`` (default is None)
+
+        Expiration uses a monotonic clock. The order of the last access is kept
+        in a separate OrderedDict, so that removing expired and least recently
+        used items is done in constant time per removed item.
+    """
+
+    def __init__(self, initial_data={}, default_expiration=10, auto_clean=True, max_entries=None, max_bytes=None):
+        super(ObjectCache, self).__init__()
         self.default_expiration = default_expiration
         self.auto_clean = auto_clean
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
         self.lock = threading.RLock()
+        # keys in the order of their last access, the least recently used first
+        self._lru = OrderedDict()
+        # (expires, key) in insert order, used for the amortized removal of expired items
+        self._expire_queue = deque()
+        self.n_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        for key in initial_data:
+            self[key] = initial_data[key]
+
+    @staticmethod
+    def _approx_size(value):
+        """ Returns a rough estimation of the memory size of value"""
+        size = sys.getsizeof(value)
+        if isinstance(value, dict):
+            for v in value.values():
+                size += sys.getsizeof(v)
+        elif isinstance(value, (list, tuple)):
+            for v in value:
+                size += sys.getsizeof(v)
+        return size
+
+    def _remove(self, key):
+        """ Removes key without counting it"""
+        value = dict.pop(self, key)
+        del self._lru[key]
+        self.n_bytes -= value[2]
 
     def __setitem__(self, key, value):
-        data = {
-            "expires": datetime.utcnow() + timedelta(
-                seconds=self.default_expiration),
-            "data": value
-        }
+        expires = _monotonic() + self.default_expiration
+        if self.max_bytes is not None:
+            size = self._approx_size(value)
+        else:
+            size = 0
         with self.lock:
-            if key in self:
-                del self[key]
-            dict.__setitem__(self, key, data)
-        if self.auto_clean:
-            self.clear_expired_items()
+            if dict.__contains__(self, key):
+                self._remove(key)
+            dict.__setitem__(self, key, [expires, value, size])
+            self._lru[key] = None
+            self.n_bytes += size
+            self._expire_queue.append((expires, key))
+            if self.auto_clean:
+                self.clear_expired_items()
+            self._evict()
+
+    def _evict(self):
+        """ Removes the least recently used items until the size bounds are fulfilled"""
+        while (self.max_entries is not None and len(self) > self.max_entries) or \
+                (self.max_bytes is not None and self.n_bytes > self.max_bytes and len(self) > 1):
+            key = self._lru.popitem(last=False)[0]
+            value = dict.pop(self, key)
+            self.n_bytes -= value[2]
+            self.evictions += 1
+
+    def _lookup(self, key):
+        """ Returns the stored item for key or None, counts hits and misses"""
+        with self.lock:
+            value = dict.get(self, key)
+            if value is None:
+                self.misses += 1
+                return None
+            if _monotonic() >= value[0]:
+                if self.auto_clean:
+                    self._remove(key)
+                    self.expirations += 1
+                self.misses += 1
+                return None
+            # Mark as recently used
+            del self._lru[key]
+            self._lru[key] = None
+            self.hits += 1
+            return value
 
     def __getitem__(self, key):
-        with self.lock:
-            if key in self:
-                value = dict.__getitem__(self, key)
-                if value is not None:
-                    return value["data"]
+        value = self._lookup(key)
+        if value is not None:
+            return value[1]
 
-    def get(self, key, default):
-        with self.lock:
-            if key in self:
-                if self[key] is not None:
-                    return self[key]
-                else:
-                    return default
-            else:
-                return default
+    def get(self, key, default=None):
+        value = self._lookup(key)
+        if value is None or value[1] is None:
+            return default
+        return value[1]
 
     def clear_expired_items(self):
+        """ Removes all expired items"""
         with self.lock:
-            del_list = []
-            utc_now = datetime.utcnow()
-            for key in self:
-                value = dict.__getitem__(self, key)
-                if value is None:
-                    del_list.append(key)
-                    continue
-                if utc_now >= value["expires"]:
-                    del_list.append(key)
-            for key in del_list:
-                del self[key]
+            now = _monotonic()
+            while len(self._expire_queue) > 0 and self._expire_queue[0][0] <= now:
+                expires, key = self._expire_queue.popleft()
+                value = dict.get(self, key)
+                # the key may have been overwritten in the meantime
+                if value is not None and value[0] == expires:
+                    self._remove(key)
+                    self.expirations += 1
+            if len(self._expire_queue) > 2 * len(self) + 1000:
+                # drop entries of overwritten or removed keys
+                self._expire_queue = deque((value[0], key) for key, value in sorted(
+                    dict.items(self), key=lambda item: item[1][0]))
 
     def __contains__(self, key):
         with self.lock:
-            if dict.__contains__(self, key):
-                value = dict.__getitem__(self, key)
-                if value is None:
-                    return False
-                if datetime.utcnow() < value["expires"]:
-                    return True
-                else:
-                    value["data"] = None
-            return False
+            value = dict.get(self, key)
+            if value is None:
+                return False
+            return _monotonic() < value[0]
+
+    def __delitem__(self, key):
+        with self.lock:
+            self._remove(key)
+
+    def __iter__(self):
+        with self.lock:
+            return iter(list(self._lru))
+
+    def clear(self):
+        with self.lock:
+            dict.clear(self)
+            self._lru.clear()
+            self._expire_queue.clear()
+            self.n_bytes = 0
+
+    def stats(self):
+        """ Returns a dict with the number of stored items, their approximate size
+            and the hit, miss, eviction and expiration counters
+        """
+        with self.lock:
+            return {"n": len(self), "bytes": self.n_bytes, "hits": self.hits, "misses": self.misses,
+                    "evictions": self.evictions, "expirations": self.expirations}
 
     def __str__(self):
         if self.auto_clean:
             self.clear_expired_items()
         n = 0
         with self.lock:
-            n = len(list(self.keys()))
+            n = len(self)
         return "ObjectCache(n={}, default_expiration={})".format(
             n, self.default_expiration)
 
@@ -175,10 +272,14 @@ class BlockchainObject(dict):
         if not self.type_ids:
             self.type_ids = [self.type_id]
 
+    def _cache_key(self, id):
+        # Every class has its own namespace in the shared cache
+        return (self.__class__.__name__, id)
+
     def cache(self):
         # store in cache
         if dict.__contains__(self, self.id_item):
-            BlockchainObject._cache[self.get(self.id_item)] = self
+            BlockchainObject._cache[self._cache_key(self.get(self.id_item))] = self
 
     def clear_cache_from_expired_items(self):
         BlockchainObject._cache.clear_expired_items()
@@ -189,17 +290,26 @@ class BlockchainObject(dict):
     def set_cache_auto_clean(self, auto_clean):
         BlockchainObject._cache.auto_clean = auto_clean
 
+    def set_cache_max_entries(self, max_entries):
+        BlockchainObject._cache.max_entries = max_entries
+
+    def set_cache_max_bytes(self, max_bytes):
+        BlockchainObject._cache.max_bytes = max_bytes
+
     def get_cache_expiration(self):
         return BlockchainObject._cache.default_expiration
 
     def get_cache_auto_clean(self):
         return BlockchainObject._cache.auto_clean
 
+    def get_cache_stats(self):
+        return BlockchainObject._cache.stats()
+
     def iscached(self, id):
-        return id in BlockchainObject._cache
+        return self._cache_key(id) in BlockchainObject._cache
 
     def getcache(self, id):
-        return BlockchainObject._cache.get(id, None)
+        return BlockchainObject._cache.get(self._cache_key(id), None)
 
     def __getitem__(self, key):
         if not self.cached:
@@ -59,14 +59,6 @@ try:
 except ImportError:
     KEYRING_AVAILABLE = False
 
-FUTURES_MODULE = None
-if not FUTURES_MODULE:
-    try:
-        from concurrent.futures import ThreadPoolExecutor, wait, as_completed
-        FUTURES_MODULE = "futures"
-    except ImportError:
-        FUTURES_MODULE = None
-
 
 availableConfigurationKeys = [
     "default_account",
@@ -310,8 +302,11 @@ def nextnode(results):
     help="Remove node with errors from list")
 @click.option(
     '--threading', is_flag=True, default=False,
-    help="Use a thread for each node")
-def pingnode(raw, sort, remove, threading):
+    help="Deprecated, all nodes are probed in parallel")
+@click.option(
+    '--deadline', default=30,
+    help="Maximum time in seconds for probing all nodes (default is 30)")
+def pingnode(raw, sort, remove, threading, deadline):
     """ Returns the answer time in milliseconds
     """
     stm = shared_steem_instance()
@@ -319,28 +314,11 @@ def pingnode(raw, sort, remove, threading):
         stm.rpc.rpcconnect()
     nodes = stm.get_default_nodes()
     if not raw:
-        t = PrettyTable(["Node", "Answer time [ms]"])
+        t = PrettyTable(["Node", "Answer time [ms]", "Head block lag"])
         t.align = "l"
     if sort:
-        ping_times = []
-        for node in nodes:
-            ping_times.append(1000.)
-        if threading and FUTURES_MODULE:
-            pool = ThreadPoolExecutor(max_workers=len(nodes) + 1)
-            futures = []
-        for i in range(len(nodes)):
-            try:
-                if not threading or not FUTURES_MODULE:
-                    ping_times[i] = node_answer_time(nodes[i])
-                else:
-                    futures.append(pool.submit(node_answer_time, nodes[i]))
-                if not threading or not FUTURES_MODULE:
-                    print("node %s results in %.2f" % (nodes[i], ping_times[i]))
-            except KeyboardInterrupt:
-                ping_times[i] = float("inf")
-                break
-        if threading and FUTURES_MODULE:
-            ping_times = [r.result() for r in as_completed(futures)]
+        results = NodeList().probe_nodes(nodes, timeout=10, deadline=float(deadline), num_blocks=0)
+        ping_times = [r["config_time"] for r in results]
         sorted_arg = sorted(range(len(ping_times)), key=ping_times.__getitem__)
         sorted_nodes = []
         for i in sorted_arg:
@@ -349,10 +327,10 @@ def pingnode(raw, sort, remove, threading):
         stm.set_default_nodes(sorted_nodes)
         if not raw:
             for i in sorted_arg:
-                t.add_row([nodes[i], "%.2f" % (ping_times[i] * 1000)])
+                t.add_row([nodes[i], "%.2f" % (ping_times[i] * 1000), results[i]["head_block_lag"]])
             print(t)
         else:
-            print(ping_times[sorted_arg])
+            print([ping_times[i] for i in sorted_arg])
     else:
         node = stm.rpc.url
         rpc_answer_time = node_answer_time(node)
@@ -360,7 +338,7 @@ def pingnode(raw, sort, remove, threading):
         if raw:
             print(rpc_time_str)
             return
-        t.add_row([node, rpc_time_str])
+        t.add_row([node, rpc_time_str, ""])
         print(t)
 
 
@@ -2595,8 +2573,9 @@ def curation(authorperm, account, limit, min_vote, max_vote, min_performance, ma
         sum_curation = [0, 0, 0, 0]
         max_curation = [0, 0, 0, 0, 0, 0]
         highest_vote = [0, 0, 0, 0, 0, 0]
-        for vote in comment["active_votes"]:
-            vote_SBD = stm.rshares_to_sbd(int(vote["rshares"]))
+        vote_SBD_list = stm.rshares_to_sbd_array([int(vote["rshares"]) for vote in comment["active_votes"]])
+        for vote, vote_SBD in zip(comment["active_votes"], vote_SBD_list):
+            vote_SBD = float(vote_SBD)
             curation_SBD = curation_rewards_SBD["active_votes"][vote["voter"]]
             curation_SP = curation_rewards_SP["active_votes"][vote["voter"]]
             if vote_SBD > 0:
@@ -3240,17 +3219,18 @@ def verify(blocknumber, trx, use_api):
     t.align = "l"
     if not use_api:
         from beembase.signedtransactions import Signed_Transaction
-    for trx in trxs:
+        from beemgraphenebase.signedtransactions import verify_transactions
+        from multiprocessing import cpu_count
+        # trx is now identical to the output of get_transaction
+        signed_txs = [Signed_Transaction(trx.copy()) for trx in trxs]
+        processes = None
+        if len(signed_txs) > 10:
+            processes = min(4, cpu_count())
+        all_public_keys = verify_transactions(signed_txs, chain=stm.chain_params, processes=processes)
+    for trx_index, trx in enumerate(trxs):
         if not use_api:
-            # trx is now identical to the output of get_transaction
-            # This is just for testing porpuse
-            if True:
-                signed_tx = Signed_Transaction(trx.copy())
-            else:
-                tx = b.get_transaction(trx["transaction_id"])
-                signed_tx = Signed_Transaction(tx)
             public_keys = []
-            for key in signed_tx.verify(chain=stm.chain_params, recover_parameter=True):
+            for key in all_public_keys[trx_index]:
                 public_keys.append(format(Base58(key, prefix=stm.prefix), stm.prefix))
         else:
             tx = TransactionBuilder(tx=trx, steem_instance=stm)
@@ -233,14 +233,14 @@ class Memo(object):
             nonce = ""
 
         try:
-            memo_wif = self.steem.wallet.getPrivateKeyForPublicKey(
+            memo_key = self.steem.wallet.getPrivateKeyObjectForPublicKey(
                 memo_to["memo_key"]
             )
             pubkey = memo_from["memo_key"]
         except MissingKeyError:
             try:
                 # if that failed, we assume that we have sent the memo
-                memo_wif = self.steem.wallet.getPrivateKeyForPublicKey(
+                memo_key = self.steem.wallet.getPrivateKeyObjectForPublicKey(
                     memo_from["memo_key"]
                 )
                 pubkey = memo_to["memo_key"]
@@ -256,13 +256,82 @@ class Memo(object):
 
         if message[0] == '#':
             return BtsMemo.decode_memo(
-                PrivateKey(memo_wif),
+                memo_key,
                 message
             )
         else:
             return BtsMemo.decode_memo_bts(
-                PrivateKey(memo_wif),
+                memo_key,
                 PublicKey(pubkey, prefix=self.chain_prefix),
                 nonce,
                 message
             )
+
+    def decrypt_many(self, ops):
+        """ Decrypts the memos of many transfer operations at once
+
+            :param list ops: transfer operations, either as dict (with a
+                ``memo`` field) or as ``[op_name, op_dict]``, e.g. from
+                :func:`beem.account.Account.history`
+            :returns: list with one memo for each operation (in the same
+                order). Memos without a leading ``#`` are not encrypted and
+                are returned unchanged, ``None`` is returned when the memo
+                cannot be decrypted with the keys in the wallet.
+            :rtype: list
+
+            The memo public keys are read from the encrypted memos, no
+            account lookups are needed. Each wallet key is only looked up
+            once and the shared secrets are cached by
+            :func:`beembase.memo.get_shared_secret`.
+
+            .. code-block:: python
+
+                from beem.account import Account
+                from beem.memo import Memo
+                m = Memo()
+                m.unlock_wallet("secret")
+                ops = list(Account("beem").history(only_ops=["transfer"]))
+                for op, memo in zip(ops, m.decrypt_many(ops)):
+                    print(op["from"], memo)
+
+        """
+        prefix = self.steem.prefix
+        private_keys = {}
+
+        def get_private_key(pub):
+            pub = format(pub, prefix)
+            if pub not in private_keys:
+                try:
+                    private_keys[pub] = self.steem.wallet.getPrivateKeyObjectForPublicKey(pub)
+                except MissingKeyError:
+                    private_keys[pub] = None
+            return private_keys[pub]
+
+        memos = []
+        for op in ops:
+            if isinstance(op, (list, tuple)):
+                op = op[1]
+            if isinstance(op, dict):
+                message = op.get("memo")
+            else:
+                message = op
+            if not message or message[0] != "#":
+                memos.append(message)
+                continue
+            try:
+                from_key, to_key = BtsMemo.extract_memo_data(message)[:2]
+            except Exception:
+                # not a valid encrypted memo
+                memos.append(None)
+                continue
+            memo_key = get_private_key(to_key)
+            if memo_key is None:
+                memo_key = get_private_key(from_key)
+            if memo_key is None:
+                memos.append(None)
+                continue
+            try:
+                memos.append(BtsMemo.decode_memo(memo_key, message))
+            except (ValueError, AssertionError):
+                memos.append(None)
+        return memos
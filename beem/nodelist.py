@@ -5,13 +5,58 @@ from __future__ import print_function
 from __future__ import unicode_literals
 from builtins import next
 import re
+import sys
 import time
+import threading
 import math
 import json
+from timeit import default_timer as timer
 from beem.instance import shared_steem_instance
 from beem.account import Account
 import logging
 log = logging.getLogger(__name__)
+if sys.version_info < (3, 0):
+    from Queue import Queue, Empty
+else:
+    from queue import Queue, Empty
+
+
+def probe_node(url, timeout=10, num_blocks=3):
+    """ Measures the answer times of a node
+
+        :param str url: node url
+        :param int timeout: timeout of a single request in seconds (default is 10)
+        :param int num_blocks: number of blocks which are fetched for measuring
+            the block throughput (default is 3)
+
+        Returns a dict with the keys ``url``, ``ok``, ``error``, ``connect_time``,
+        ``config_time`` (in seconds), ``blocks_per_second`` and ``head_block``.
+        Failed measurements are set to ``float("inf")``, ``0`` or ``None``.
+    """
+    from beem.steem import Steem
+    from beem.block import Block
+    result = {"url": url, "ok": False, "error": None, "connect_time": float("inf"),
+              "config_time": float("inf"), "blocks_per_second": 0., "head_block": None}
+    try:
+        start = timer()
+        stm = Steem(node=url, num_retries=2, num_retries_call=2, timeout=timeout)
+        result["connect_time"] = timer() - start
+        start = timer()
+        stm.get_config(use_stored_data=False)
+        result["config_time"] = timer() - start
+        props = stm.get_dynamic_global_properties(use_stored_data=False)
+        result["head_block"] = props["head_block_number"]
+        if num_blocks > 0:
+            start = timer()
+            for block_num in range(result["head_block"] - num_blocks, result["head_block"]):
+                Block(block_num, steem_instance=stm)
+            result["blocks_per_second"] = num_blocks / max(timer() - start, 1e-6)
+        result["ok"] = True
+    except KeyboardInterrupt:
+        raise
+    except Exception as e:
+        result["error"] = str(e)
+    return result
 
 
 class NodeList(list):
@@ -287,11 +332,121 @@ class NodeList(list):
             }]
         super(NodeList, self).__init__(nodes)
 
-    def update_nodes(self, weights=None, steem_instance=None):
+    def probe_nodes(self, urls=None, timeout=10, deadline=30, num_blocks=3, max_workers=None):
+        """ Probes all nodes in parallel (see :func:`probe_node`)
+
+            :param list urls: node urls, when None all nodes of the list are probed
+            :param int timeout: timeout of a single request in seconds (default is 10),
+                it is shortened to the time left until the deadline
+            :param int deadline: all probes which have not finished after ``deadline``
+                seconds are counted as failed (default is 30)
+            :param int num_blocks: number of fetched blocks for measuring the
+                block throughput (default is 3)
+            :param int max_workers: number of threads (default is one per node)
+
+            Returns the results in the order of ``urls``. The ``head_block_lag``
+            key contains the number of blocks, the node is behind the node with
+            the highest head block.
+
+            .. code-block:: python
+
+                from beem.nodelist import NodeList
+                nl = NodeList()
+                for r in nl.probe_nodes(deadline=15):
+                    print(r["url"], r["ok"], r["config_time"], r["head_block_lag"])
+
+        """
+        if urls is None:
+            urls = [node["url"] for node in self]
+        results = [None] * len(urls)
+        start = timer()
+
+        def get_timeout():
+            # a single request must not run past the deadline
+            if deadline is None:
+                return timeout
+            return min(timeout, max(deadline - (timer() - start), 0.))
+
+        if len(urls) > 1:
+            probe_results = [None] * len(urls)
+            url_queue = Queue()
+            for i in range(len(urls)):
+                url_queue.put(i)
+
+            def probe():
+                while get_timeout() > 0:
+                    try:
+                        i = url_queue.get(False)
+                    except Empty:
+                        return
+                    probe_results[i] = probe_node(urls[i], timeout=get_timeout(), num_blocks=num_blocks)
+
+            # daemon threads of unfinished probes do not block the interpreter exit
+            threads = []
+            for i in range(min(max_workers or len(urls), len(urls))):
+                thread = threading.Thread(target=probe)
+                thread.daemon = True
+                thread.start()
+                threads.append(thread)
+            for thread in threads:
+                thread.join(None if deadline is None else max(deadline - (timer() - start), 0.))
+            # probes which are still running cannot change the results anymore
+            results = list(probe_results)
+        else:
+            for i in range(len(urls)):
+                if get_timeout() <= 0:
+                    break
+                results[i] = probe_node(urls[i], timeout=get_timeout(), num_blocks=num_blocks)
+        for i in range(len(urls)):
+            if results[i] is None:
+                results[i] = {"url": urls[i], "ok": False, "error": "Deadline reached",
+                              "connect_time": float("inf"), "config_time": float("inf"),
+                              "blocks_per_second": 0., "head_block": None}
+        head_blocks = [r["head_block"] for r in results if r["head_block"] is not None]
+        for r in results:
+            if r["head_block"] is not None:
+                r["head_block_lag"] = max(head_blocks) - r["head_block"]
+            else:
+                r["head_block_lag"] = None
+        return results
+
+    def apply_probe_results(self, results, max_head_block_lag=20):
+        """ Sets the score of the probed nodes from the results of :func:`probe_nodes`
+
+            :param list results: results of :func:`probe_nodes`
+            :param int max_head_block_lag: nodes which are further behind are
+                counted as not working (default is 20)
+
+            The fastest node gets a score of 100, the other working nodes
+            ``100 * fastest config_time / config_time``. Failed nodes get a
+            score of -1.
+        """
+        working = [r for r in results if r["ok"] and r["head_block_lag"] <= max_head_block_lag]
+        scores = {}
+        if len(working) > 0:
+            fastest = max(min([r["config_time"] for r in working]), 1e-6)
+            for r in working:
+                scores[r["url"]] = 100. * fastest / max(r["config_time"], 1e-6)
+        probed = [r["url"] for r in results]
+        new_nodes = []
+        for node in self:
+            new_node = node.copy()
+            if node["url"] in scores:
+                new_node["score"] = scores[node["url"]]
+            elif node["url"] in probed:
+                new_node["score"] = -1
+            new_nodes.append(new_node)
+        super(NodeList, self).__init__(new_nodes)
+
+    def update_nodes(self, weights=None, steem_instance=None, probe=False, probe_deadline=30):
         """ Reads metadata from fullnodeupdate and recalculates the nodes score
 
             :param list/dict weight: can be used to weight the different benchmarks
             :type weight: list, dict
+            :param bool probe: When True, all nodes are probed in parallel
+                afterwards (see :func:`probe_nodes`) and the scores are set from
+                the measured answer times (default is False)
+            :param int probe_deadline: maximum time in seconds for probing all nodes (default is 30)
 
             .. code-block:: python
 
@@ -316,6 +471,8 @@ class NodeList(list):
                 account = None
                 metadata = None
         if metadata is None:
+            if probe:
+                self.apply_probe_results(self.probe_nodes(deadline=probe_deadline))
             return
         report = metadata["report"]
         failing_nodes = metadata["failing_nodes"]
@@ -374,6 +531,8 @@ class NodeList(list):
                     new_node["score"] = -1
             new_nodes.append(new_node)
         super(NodeList, self).__init__(new_nodes)
+        if probe:
+            self.apply_probe_results(self.probe_nodes(deadline=probe_deadline))
 
     def get_nodes(self, exclude_limited=False, dev=False, testnet=False, testnetdev=False, wss=True, https=True, not_working=False, normal=True, appbase=True):
         """ Returns nodes as list
@@ -11,9 +11,11 @@ from datetime import datetime, timedelta, date, time
 import math
 import random
 import logging
+from array import array
 from bisect import bisect_left
-from beem.utils import formatTimeString, formatTimedelta, remove_from_dict, reputation_to_score, addTzInfo, parse_time
-from beem.amount import Amount
+from decimal import Decimal
+from beem.utils import formatTimeString, formatTimedelta, remove_from_dict, reputation_to_score, addTzInfo, parse_time, load_numpy
+from beem.amount import Amount, CompactAmount, get_asset_table, quantize
 from beem.account import Account
 from beem.vote import Vote
 from beem.instance import shared_steem_instance
@@ -21,6 +23,108 @@ from beem.constants import STEEM_VOTE_REGENERATION_SECONDS, STEEM_1_PERCENT, STE
 
 log = logging.getLogger(__name__)
 
+_epoch = addTzInfo(datetime(1970, 1, 1, 0, 0, 0, 0))
+
+
+def _to_seconds(timestamp):
+    """ Returns the seconds since epoch of a datetime"""
+    return (addTzInfo(timestamp) - _epoch).total_seconds()
+
+
+def _from_seconds(seconds):
+    """ Returns the datetime (UTC) for seconds since epoch"""
+    return _epoch + timedelta(seconds=seconds)
+
+
+def _to_decimal(value):
+    """ Returns an Amount, CompactAmount or number as Decimal"""
+    if isinstance(value, Amount):
+        return value["amount"]
+    elif isinstance(value, CompactAmount):
+        return Decimal(value.amount).scaleb(-value.precision)
+    return Decimal(value)
+
+
+def _to_satoshis(value, precision):
+    """ Returns the Decimal ``value`` as integer, rounded down to ``precision``"""
+    return int(quantize(value, precision).scaleb(precision))
+
+
+class _DelegationLog(object):
+    """ Stores the changes of the delegations of an account as event log.
+        Each event sets the delegation of one account (in satoshis) at a
+        row of the snapshot, 0 removes the delegation.
+
+        ``current`` contains the active delegations after the last event
+        and ``total`` their sum.
+    """
+    __slots__ = ("rows", "accounts", "amounts", "current", "total", "_replay")
+
+    def __init__(self):
+        self.rows = array("q")
+        self.accounts = []
+        self.amounts = array("q")
+        self.current = {}
+        self.total = 0
+        self._replay = (0, 0, {})
+
+    def set(self, row, account, amount):
+        """ Sets or removes (``amount`` is 0) the delegation of ``account``"""
+        old_amount = self.current.get(account, 0)
+        if amount == old_amount:
+            return
+        if amount:
+            self.current[account] = amount
+        else:
+            del self.current[account]
+        self.total += amount - old_amount
+        self.rows.append(row)
+        self.accounts.append(account)
+        self.amounts.append(amount)
+
+    def find(self, amount):
+        """ Returns the first account which delegates ``amount``"""
+        for account in self.current:
+            if self.current[account] == amount:
+                return account
+        return None
+
+    def _apply(self, delegations, pos):
+        if self.amounts[pos]:
+            delegations[self.accounts[pos]] = self.amounts[pos]
+        else:
+            del delegations[self.accounts[pos]]
+
+    def at(self, row):
+        """ Returns the delegations (account -> satoshis) at ``row``.
+            Subsequent calls with increasing rows continue the replay, the
+            returned dict must not be modified.
+        """
+        replay_row, pos, delegations = self._replay
+        if row < replay_row:
+            pos, delegations = 0, {}
+        while pos < len(self.rows) and self.rows[pos] <= row:
+            self._apply(delegations, pos)
+            pos += 1
+        self._replay = (row, pos, delegations)
+        return delegations
+
+    def history(self, num_rows):
+        """ Returns the delegations for all rows, unchanged rows share
+            the same dict
+        """
+        delegations = {}
+        ret = []
+        pos = 0
+        for row in range(num_rows):
+            if pos < len(self.rows) and self.rows[pos] <= row:
+                delegations = dict(delegations)
+                while pos < len(self.rows) and self.rows[pos] <= row:
+                    self._apply(delegations, pos)
+                    pos += 1
+            ret.append(delegations)
+        return ret
+
 
 class AccountSnapshot(list):
     """ This class allows to easily access Account history
@@ -28,6 +132,16 @@ class AccountSnapshot(list):
         :param str account_name: Name of the account
         :param Steem steem_instance: Steem
                instance
+
+        The state is stored column wise: the time stamps in seconds and
+        the vests, steem and sbd balances as integers (satoshis) in typed
+        arrays, delegations as event log. Each update adds two rows, one
+        with the old state one second before the operation and one with
+        the new state. ``timestamps``, ``own_vests``, ``own_steem``,
+        ``own_sbd``, ``delegated_vests_in`` and ``delegated_vests_out``
+        return the columns as lists of datetime, :class:`beem.amount.Amount`
+        and dict objects, these lists are created on first access and
+        kept until the next update. Assigning a list replaces the column.
     """
     def __init__(self, account, account_history=[], steem_instance=None):
         self.steem = steem_instance or shared_steem_instance()
@@ -38,12 +152,25 @@ class AccountSnapshot(list):
     def reset(self):
         """ Resets the arrays not the stored account history
         """
-        self.own_vests = [Amount(0, self.steem.vests_symbol, steem_instance=self.steem)]
-        self.own_steem = [Amount(0, self.steem.steem_symbol, steem_instance=self.steem)]
-        self.own_sbd = [Amount(0, self.steem.sbd_symbol, steem_instance=self.steem)]
-        self.delegated_vests_in = [{}]
-        self.delegated_vests_out = [{}]
-        self.timestamps = [addTzInfo(datetime(1970, 1, 1, 0, 0, 0, 0))]
+        asset_table = get_asset_table(steem_instance=self.steem)
+        self._vests_asset = asset_table[self.steem.vests_symbol]
+        self._steem_asset = asset_table[self.steem.steem_symbol]
+        self._sbd_asset = asset_table[self.steem.sbd_symbol]
+        self._timestamps = array("d", [0.0])
+        self._own_vests = array("q", [0])
+        # the unrounded vests total of each row, used for the SP conversion
+        self._own_vests_float = array("d", [0.0])
+        self._own_steem = array("q", [0])
+        self._own_sbd = array("q", [0])
+        self._delegated_vests_in_sum = array("q", [0])
+        self._delegated_vests_out_sum = array("q", [0])
+        self._delegations_in = _DelegationLog()
+        self._delegations_out = _DelegationLog()
+        # lists of the columns, which were created since the last update
+        self._columns = {}
+        self._vests_total = Decimal(0)
+        self._steem_total = Decimal(0)
+        self._sbd_total = Decimal(0)
         import beembase.operationids
         self.ops_statistics = beembase.operationids.operations.copy()
         for key in self.ops_statistics:
@@ -64,6 +191,108 @@ class AccountSnapshot(list):
         self.rep = []
         self.rep_timestamp = []
 
+    def _amount(self, satoshis, asset):
+        return Amount(Decimal(satoshis).scaleb(-asset.precision), asset.symbol, steem_instance=self.steem)
+
+    def _delegations_to_amounts(self, delegations):
+        return {account: self._amount(delegations[account], self._vests_asset) for account in delegations}
+
+    def _delegation_history(self, delegation_log):
+        ret = []
+        last = None
+        for delegations in delegation_log.history(len(self._timestamps)):
+            if delegations is not last:
+                last = delegations
+                amounts = self._delegations_to_amounts(delegations)
+            ret.append(amounts)
+        return ret
+
+    def _delegation_log_from_history(self, value):
+        """ Returns the delegation log and the sums for a list of delegation dicts"""
+        delegation_log = _DelegationLog()
+        sums = array("q")
+        vests_precision = self._vests_asset.precision
+        for row, delegations in enumerate(value):
+            for account in list(delegation_log.current):
+                if account not in delegations:
+                    delegation_log.set(row, account, 0)
+            for account in delegations:
+                delegation_log.set(row, account, _to_satoshis(_to_decimal(delegations[account]), vests_precision))
+            sums.append(delegation_log.total)
+        return delegation_log, sums
+
+    def _column(self, name, create):
+        """ Returns the cached list of a column, which is created on first access"""
+        column = self._columns.get(name)
+        if column is None:
+            column = create()
+            self._columns[name] = column
+        return column
+
+    @property
+    def timestamps(self):
+        """ Returns all time stamps as datetime list"""
+        return self._column("timestamps", lambda: [_from_seconds(ts) for ts in self._timestamps])
+
+    @timestamps.setter
+    def timestamps(self, value):
+        self._timestamps = array("d", [_to_seconds(ts) for ts in value])
+        self._columns.clear()
+
+    @property
+    def own_vests(self):
+        """ Returns the own vests for all time stamps as Amount list"""
+        return self._column("own_vests", lambda: [self._amount(vests, self._vests_asset) for vests in self._own_vests])
+
+    @own_vests.setter
+    def own_vests(self, value):
+        self._own_vests = array("q", [_to_satoshis(_to_decimal(vests), self._vests_asset.precision) for vests in value])
+        self._own_vests_float = array("d", [float(_to_decimal(vests)) for vests in value])
+        self._vests_total = _to_decimal(value[-1]) if len(value) > 0 else Decimal(0)
+        self._columns.clear()
+
+    @property
+    def own_steem(self):
+        """ Returns the steem balance for all time stamps as Amount list"""
+        return self._column("own_steem", lambda: [self._amount(steem, self._steem_asset) for steem in self._own_steem])
+
+    @own_steem.setter
+    def own_steem(self, value):
+        self._own_steem = array("q", [_to_satoshis(_to_decimal(steem), self._steem_asset.precision) for steem in value])
+        self._steem_total = _to_decimal(value[-1]) if len(value) > 0 else Decimal(0)
+        self._columns.clear()
+
+    @property
+    def own_sbd(self):
+        """ Returns the sbd balance for all time stamps as Amount list"""
+        return self._column("own_sbd", lambda: [self._amount(sbd, self._sbd_asset) for sbd in self._own_sbd])
+
+    @own_sbd.setter
+    def own_sbd(self, value):
+        self._own_sbd = array("q", [_to_satoshis(_to_decimal(sbd), self._sbd_asset.precision) for sbd in value])
+        self._sbd_total = _to_decimal(value[-1]) if len(value) > 0 else Decimal(0)
+        self._columns.clear()
+
+    @property
+    def delegated_vests_in(self):
+        """ Returns the incoming delegations for all time stamps as list of dicts"""
+        return self._column("delegated_vests_in", lambda: self._delegation_history(self._delegations_in))
+
+    @delegated_vests_in.setter
+    def delegated_vests_in(self, value):
+        self._delegations_in, self._delegated_vests_in_sum = self._delegation_log_from_history(value)
+        self._columns.clear()
+
+    @property
+    def delegated_vests_out(self):
+        """ Returns the outgoing delegations for all time stamps as list of dicts"""
+        return self._column("delegated_vests_out", lambda: self._delegation_history(self._delegations_out))
+
+    @delegated_vests_out.setter
+    def delegated_vests_out(self, value):
+        self._delegations_out, self._delegated_vests_out_sum = self._delegation_log_from_history(value)
+        self._columns.clear()
+
     def search(self, search_str, start=None, stop=None, use_block_num=True):
         """ Returns ops in the given range"""
         ops = []
@@ -129,21 +358,21 @@ class AccountSnapshot(list):
         """ Returns snapshot for given timestamp"""
         if timestamp is None:
             timestamp = datetime.utcnow()
-        timestamp = addTzInfo(timestamp)
         # Find rightmost value less than x
-        i = bisect_left(self.timestamps, timestamp)
+        i = bisect_left(self._timestamps, _to_seconds(timestamp))
         if i:
             index = i - 1
         else:
             return {}
-        ts = self.timestamps[index]
-        own = self.own_vests[index]
-        din = self.delegated_vests_in[index]
-        dout = self.delegated_vests_out[index]
-        steem = self.own_steem[index]
-        sbd = self.own_sbd[index]
-        sum_in = sum([din[key].amount for key in din])
-        sum_out = sum([dout[key].amount for key in dout])
+        ts = _from_seconds(self._timestamps[index])
+        own = self._amount(self._own_vests[index], self._vests_asset)
+        din = self._delegations_to_amounts(self._delegations_in.at(index))
+        dout = self._delegations_to_amounts(self._delegations_out.at(index))
+        steem = self._amount(self._own_steem[index], self._steem_asset)
+        sbd = self._amount(self._own_sbd[index], self._sbd_asset)
+        vests_precision = 10 ** self._vests_asset.precision
+        sum_in = self._delegated_vests_in_sum[index] / vests_precision
+        sum_out = self._delegated_vests_out_sum[index] / vests_precision
         sp_in = self.steem.vests_to_sp(sum_in, timestamp=ts)
         sp_out = self.steem.vests_to_sp(sum_out, timestamp=ts)
         sp_own = self.steem.vests_to_sp(own, timestamp=ts)
@@ -206,43 +435,48 @@ class AccountSnapshot(list):
             :type sbd: amount.Amount, float
 
         """
-        self.timestamps.append(timestamp - timedelta(seconds=1))
-        self.own_vests.append(self.own_vests[-1])
-        self.own_steem.append(self.own_steem[-1])
-        self.own_sbd.append(self.own_sbd[-1])
-        self.delegated_vests_in.append(self.delegated_vests_in[-1])
-        self.delegated_vests_out.append(self.delegated_vests_out[-1])
-
-        self.timestamps.append(timestamp)
-        self.own_vests.append(self.own_vests[-1] + own)
-        self.own_steem.append(self.own_steem[-1] + steem)
-        self.own_sbd.append(self.own_sbd[-1] + sbd)
-
-        new_deleg = dict(self.delegated_vests_in[-1])
+        self._columns.clear()
+        seconds = _to_seconds(timestamp)
+        self._timestamps.append(seconds - 1)
+        self._own_vests.append(self._own_vests[-1])
+        self._own_vests_float.append(self._own_vests_float[-1])
+        self._own_steem.append(self._own_steem[-1])
+        self._own_sbd.append(self._own_sbd[-1])
+        self._delegated_vests_in_sum.append(self._delegations_in.total)
+        self._delegated_vests_out_sum.append(self._delegations_out.total)
+
+        row = len(self._timestamps)
+        self._timestamps.append(seconds)
+        # the balances are summed up exactly, the columns store them rounded down
+        self._vests_total += _to_decimal(own)
+        self._steem_total += _to_decimal(steem)
+        self._sbd_total += _to_decimal(sbd)
+        self._own_vests.append(_to_satoshis(self._vests_total, self._vests_asset.precision))
+        self._own_vests_float.append(float(self._vests_total))
+        self._own_steem.append(_to_satoshis(self._steem_total, self._steem_asset.precision))
+        self._own_sbd.append(_to_satoshis(self._sbd_total, self._sbd_asset.precision))
+
+        vests_precision = self._vests_asset.precision
         if delegated_in is not None and delegated_in:
-            if delegated_in['amount'] == 0:
-                del new_deleg[delegated_in['account']]
-            else:
-                new_deleg[delegated_in['account']] = delegated_in['amount']
-        self.delegated_vests_in.append(new_deleg)
+            self._delegations_in.set(row, delegated_in['account'],
+                                     _to_satoshis(_to_decimal(delegated_in['amount']), vests_precision))
 
-        new_deleg = dict(self.delegated_vests_out[-1])
         if delegated_out is not None and delegated_out:
+            amount = _to_satoshis(_to_decimal(delegated_out['amount']), vests_precision)
             if delegated_out['account'] is None:
                 # return_vesting_delegation
-                for delegatee in new_deleg:
-                    if new_deleg[delegatee]['amount'] == delegated_out['amount']:
-                        del new_deleg[delegatee]
-                        break
+                delegatee = self._delegations_out.find(amount)
+                if delegatee is not None:
+                    self._delegations_out.set(row, delegatee, 0)
 
-            elif delegated_out['amount'] != 0:
+            elif amount != 0:
                 # new or updated non-zero delegation
-                new_deleg[delegated_out['account']] = delegated_out['amount']
+                self._delegations_out.set(row, delegated_out['account'], amount)
 
                 # skip undelegations here, wait for 'return_vesting_delegation'
-                # del new_deleg[delegated_out['account']]
 
-        self.delegated_vests_out.append(new_deleg)
+        self._delegated_vests_in_sum.append(self._delegations_in.total)
+        self._delegated_vests_out_sum.append(self._delegations_out.total)
 
     def build(self, only_ops=[], exclude_ops=[], enable_rewards=False, enable_out_votes=False, enable_in_votes=False):
         """ Builds the account history based on all account operations
@@ -253,13 +487,9 @@ class AccountSnapshot(list):
                 generator (*optional*)
 
         """
-        if len(self.timestamps) > 0:
-            start_timestamp = self.timestamps[-1]
-        else:
-            start_timestamp = None
+        start_timestamp = self._timestamps[-1]
         for op in sorted(self, key=lambda k: k['timestamp']):
-            ts = parse_time(op['timestamp'])
-            if start_timestamp is not None and start_timestamp > ts:
+            if start_timestamp > _to_seconds(parse_time(op['timestamp'])):
                 continue
             # print(op)
             if op['type'] in exclude_ops:
@@ -452,72 +682,101 @@ class AccountSnapshot(list):
         # else:
         # print(op)
 
+    def _float_column(self, column, divisor=1):
+        """ Returns a typed column as numpy float array, or as list of
+            floats when numpy is not installed
+        """
+        np = load_numpy()
+        if np is not None:
+            return np.array(column, dtype=float) / divisor
+        return [value / divisor for value in column]
+
+    def _sp_columns(self):
+        """ Returns the own and the effective SP for all rows as list"""
+        np = load_numpy()
+        vests_precision = 10 ** self._vests_asset.precision
+        timestamps = self._float_column(self._timestamps)
+        sp_own = self.steem.vests_to_sp_array(self._float_column(self._own_vests_float),
+                                              timestamps=timestamps)
+        sp_in = self.steem.vests_to_sp_array(self._float_column(self._delegated_vests_in_sum, vests_precision),
+                                             timestamps=timestamps)
+        sp_out = self.steem.vests_to_sp_array(self._float_column(self._delegated_vests_out_sum, vests_precision),
+                                              timestamps=timestamps)
+        if np is not None:
+            return sp_own.tolist(), (sp_own + sp_in - sp_out).tolist()
+        return sp_own, [own + sp_in_value - sp_out_value for (own, sp_in_value, sp_out_value) in zip(sp_own, sp_in, sp_out)]
+
     def build_sp_arrays(self):
         """ Builds the own_sp and eff_sp array"""
-        self.own_sp = []
-        self.eff_sp = []
-        for (ts, own, din, dout) in zip(self.timestamps, self.own_vests,
-                                        self.delegated_vests_in,
-                                        self.delegated_vests_out):
-            sum_in = sum([din[key].amount for key in din])
-            sum_out = sum([dout[key].amount for key in dout])
-            sp_in = self.steem.vests_to_sp(sum_in, timestamp=ts)
-            sp_out = self.steem.vests_to_sp(sum_out, timestamp=ts)
-            sp_own = self.steem.vests_to_sp(own, timestamp=ts)
-            sp_eff = sp_own + sp_in - sp_out
-            self.own_sp.append(sp_own)
-            self.eff_sp.append(sp_eff)
+        self.own_sp, self.eff_sp = self._sp_columns()
 
     def build_rep_arrays(self):
         """ Build reputation arrays """
-        self.rep_timestamp = [self.timestamps[1]]
+        self.rep_timestamp = [_from_seconds(self._timestamps[1])]
         self.rep = [reputation_to_score(0)]
         current_reputation = 0
+        score = self.rep[0]
         for (ts, rshares, rep) in zip(self.in_vote_timestamp, self.in_vote_rshares, self.in_vote_rep):
             if rep > 0:
                 if rshares > 0 or (rshares < 0 and rep > current_reputation):
                     current_reputation += rshares >> 6
-            self.rep.append(reputation_to_score(current_reputation))
+                    score = reputation_to_score(current_reputation)
+            self.rep.append(score)
             self.rep_timestamp.append(ts)
 
     def build_vp_arrays(self):
         """ Build vote power arrays"""
-        self.vp_timestamp = [self.timestamps[1]]
+        self.vp_timestamp = [_from_seconds(self._timestamps[1])]
         self.vp = [STEEM_100_PERCENT]
+        if len(self.out_vote_timestamp) == 0:
+            return
+        max_vote_denom = self.steem._max_vote_denom()
+        vp = STEEM_100_PERCENT
+        last_ts = self.vp_timestamp[0]
         for (ts, weight) in zip(self.out_vote_timestamp, self.out_vote_weight):
-            self.vp.append(self.vp[-1])
-
-            if self.vp[-1] < STEEM_100_PERCENT:
-                regenerated_vp = ((ts - self.vp_timestamp[-1]).total_seconds()) * STEEM_100_PERCENT / STEEM_VOTE_REGENERATION_SECONDS
-                self.vp[-1] += int(regenerated_vp)
+            if vp < STEEM_100_PERCENT:
+                regenerated_vp = ((ts - last_ts).total_seconds()) * STEEM_100_PERCENT / STEEM_VOTE_REGENERATION_SECONDS
+                vp += int(regenerated_vp)
 
-            if self.vp[-1] > STEEM_100_PERCENT:
-                self.vp[-1] = STEEM_100_PERCENT
-            self.vp[-1] -= self.steem._calc_resulting_vote(self.vp[-1], weight)
-            if self.vp[-1] < 0:
-                self.vp[-1] = 0
+            if vp > STEEM_100_PERCENT:
+                vp = STEEM_100_PERCENT
+            vp -= self.steem._calc_resulting_vote(vp, weight, max_vote_denom=max_vote_denom)
+            if vp < 0:
+                vp = 0
 
+            self.vp.append(vp)
             self.vp_timestamp.append(ts)
+            last_ts = ts
 
     def build_curation_arrays(self, end_date=None, sum_days=7):
         """ Build curation arrays"""
+        np = load_numpy()
         self.curation_per_1000_SP_timestamp = []
         self.curation_per_1000_SP = []
         if sum_days <= 0:
             raise ValueError("sum_days must be greater than 0")
-        index = 0
         curation_sum = 0
         days = (self.reward_timestamps[-1] - self.reward_timestamps[0]).days // sum_days * sum_days
         if end_date is None:
             end_date = self.reward_timestamps[-1] - timedelta(days=days)
+        reward_timestamps = []
+        reward_vests = []
         for (ts, vests) in zip(self.reward_timestamps, self.curation_rewards):
             if vests == 0:
                 continue
-            sp = self.steem.vests_to_sp(vests, timestamp=ts)
-            data = self.get_data(timestamp=ts, index=index)
-            index = data["index"]
-            if "sp_eff" in data and data["sp_eff"] > 0:
-                curation_1k_sp = sp / data["sp_eff"] * 1000 / sum_days * 7
+            reward_timestamps.append(ts)
+            reward_vests.append(vests)
+        if len(reward_vests) == 0:
+            return
+        reward_sp = self.steem.vests_to_sp_array(reward_vests, timestamps=reward_timestamps)
+        if np is not None:
+            reward_sp = reward_sp.tolist()
+        eff_sp = self._sp_columns()[1]
+        for (ts, sp) in zip(reward_timestamps, reward_sp):
+            # eff_sp of the rightmost row before ts, see get_data()
+            index = bisect_left(self._timestamps, _to_seconds(ts))
+            if index and eff_sp[index - 1] > 0:
+                curation_1k_sp = sp / eff_sp[index - 1] * 1000 / sum_days * 7
             else:
                 curation_1k_sp = 0
             if ts < end_date:
@@ -23,6 +23,7 @@ from .account import Account
 from .amount import Amount
 from .price import Price
 from .storage import configStorage as config
+from .storage import BlockStorage, AccountHistoryStorage
 from .version import version as beem_version
 from .exceptions import (
     AccountExistsException,
@@ -31,11 +32,27 @@ from .exceptions import (
 from .wallet import Wallet
 from .steemconnect import SteemConnect
 from .transactionbuilder import TransactionBuilder
-from .utils import formatTime, resolve_authorperm, derive_permlink, sanitize_permlink, remove_from_dict, addTzInfo, formatToTimeStamp
+from .utils import formatTime, resolve_authorperm, derive_permlink, sanitize_permlink, remove_from_dict, addTzInfo, formatToTimeStamp, load_numpy
 from beem.constants import STEEM_VOTE_REGENERATION_SECONDS, STEEM_100_PERCENT, STEEM_1_PERCENT, STEEM_RC_REGEN_TIME
 
 log = logging.getLogger(__name__)
 
+# Linear fit of the STEEM per MVEST ratio over time (two segments)
+_STEEM_PER_MVEST_FIT = (2.1325476281078992e-05, -31099.685481490847,
+                        2.9019227739473682e-07, 48.41432402074669)
+
+
+def _float_array(values):
+    """ Returns values as numpy float array, or as list of floats when
+        numpy is not installed
+    """
+    np = load_numpy()
+    if np is not None:
+        if isinstance(values, np.ndarray):
+            return values.astype(float)
+        return np.array([float(v) for v in values], dtype=float)
+    return [float(v) for v in values]
+
 
 class Steem(object):
     """ Connect to the Steem network.
@@ -69,10 +86,30 @@ class Steem(object):
             NumRetriesReached is raised. Disabled for -1. (default is -1)
         :param int num_retries_call: Repeat num_retries_call times a rpc call on node error (default is 5)
         :param int timeout: Timeout setting for https nodes (default is 60)
+        :param int pool_maxsize: When set, a connection pool with up to ``pool_maxsize``
+            keep-alive connections per node is used (default is None)
+        :param int max_batch_size: maximum number of calls in one batch request of
+            ``steem.rpc.batch()`` (default is 50)
+        :param bool latency_aware: When True, calls are routed to the node with the
+            best latency, error rate and head block lag (default is False)
+        :param float hedge_percentile: When set, slow http requests are sent
+            additionally to a second node (see :class:`beemapi.graphenerpc.GrapheneRPC`)
+        :param float key_cache_timeout: When set, decrypted wallet keys are kept in
+            memory until they were not used for ``key_cache_timeout`` seconds or the
+            wallet is locked (see :class:`beem.wallet.Wallet`) (default is None)
+        :param bool ws_multiplex: When True, several threads can send requests
+            concurrently over one websocket connection (default is False)
         :param bool use_sc2: When True, a steemconnect object is created. Can be used for
             broadcast posting op or creating hot_links (default is False)
         :param SteemConnect steemconnect: A SteemConnect object can be set manually, set use_sc2 to True
         :param dict custom_chains: custom chain which should be added to the known chains
+        :param block_storage: When True or a database file name, irreversible blocks are
+            cached on disk (see :class:`beem.storage.BlockStorage`) (default is None)
+        :type block_storage: bool, str, BlockStorage
+        :param account_history_storage: When True or a database file name, the irreversible
+            account history operations are stored on disk and only newer operations are
+            requested from the node (see :class:`beem.storage.AccountHistoryStorage`) (default is None)
+        :type account_history_storage: bool, str, AccountHistoryStorage
 
         Three wallet operation modes are possible:
 
@@ -168,6 +205,10 @@ class Steem(object):
             :param bool use_sc2: When True, a steemconnect object is created. Can be used for broadcast
                 posting op or creating hot_links  (default is False)
             :param SteemConnect steemconnect: A SteemConnect object can be set manually, set use_sc2 to True
+            :param bool,str,BlockStorage block_storage: When True or a database file name, irreversible
+                blocks are cached on disk (default is None)
+            :param bool,str,AccountHistoryStorage account_history_storage: When True or a database
+                file name, irreversible account history operations are stored on disk (default is None)
 
         """
 
@@ -183,6 +224,20 @@ class Steem(object):
         self.use_sc2 = bool(kwargs.get("use_sc2", False))
         self.blocking = kwargs.get("blocking", False)
         self.custom_chains = kwargs.get("custom_chains", {})
+        self.block_storage = kwargs.get("block_storage", None)
+        if self.block_storage is True:
+            self.block_storage = BlockStorage()
+        elif isinstance(self.block_storage, string_types):
+            self.block_storage = BlockStorage(self.block_storage)
+        elif self.block_storage is False:
+            self.block_storage = None
+        self.account_history_storage = kwargs.get("account_history_storage", None)
+        if self.account_history_storage is True:
+            self.account_history_storage = AccountHistoryStorage()
+        elif isinstance(self.account_history_storage, string_types):
+            self.account_history_storage = AccountHistoryStorage(self.account_history_storage)
+        elif self.account_history_storage is False:
+            self.account_history_storage = None
 
         # Store config for access through other Classes
         self.config = config
@@ -549,10 +604,7 @@ class Steem(object):
         if time_stamp is not None:
             if isinstance(time_stamp, (datetime, date)):
                 time_stamp = formatToTimeStamp(time_stamp)
-            a = 2.1325476281078992e-05
-            b = -31099.685481490847
-            a2 = 2.9019227739473682e-07
-            b2 = 48.41432402074669
+            a, b, a2, b2 = _STEEM_PER_MVEST_FIT
 
             if (time_stamp < (b2 - b) / (a - a2)):
                 return a * time_stamp + b
@@ -586,6 +638,77 @@ class Steem(object):
         """
         return sp * 1e6 / self.get_steem_per_mvest(timestamp, use_stored_data=use_stored_data)
 
+    def get_steem_per_mvest_array(self, time_stamps):
+        """ Returns the estimated MVEST to STEEM ratio for many time stamps,
+            see :func:`get_steem_per_mvest`
+
+            :param list time_stamps: time stamps as int or datetime
+            :returns: numpy array (list, when numpy is not installed)
+        """
+        np = load_numpy()
+        a, b, a2, b2 = _STEEM_PER_MVEST_FIT
+        cut = (b2 - b) / (a - a2)
+        if np is not None and isinstance(time_stamps, np.ndarray):
+            time_stamps = time_stamps.astype(float)
+        else:
+            time_stamps = _float_array([formatToTimeStamp(t) if isinstance(t, (datetime, date)) else t for t in time_stamps])
+        if np is not None:
+            return np.where(time_stamps < cut, a * time_stamps + b, a2 * time_stamps + b2)
+        return [a * t + b if t < cut else a2 * t + b2 for t in time_stamps]
+
+    def _get_steem_per_mvest_for(self, timestamps, use_stored_data=True):
+        """ Returns a single ratio or one ratio per value, when timestamps
+            is a list
+        """
+        if timestamps is None or isinstance(timestamps, (datetime, date) + integer_types + (float, )):
+            return self.get_steem_per_mvest(timestamps, use_stored_data=use_stored_data)
+        return self.get_steem_per_mvest_array(timestamps)
+
+    def vests_to_sp_array(self, vests, timestamps=None, use_stored_data=True):
+        """ Converts many vests values to SP. The chain parameters are
+            only read once.
+
+            :param list vests: vests (float or amount.Amount) to convert
+            :param timestamps: (Optional) a single time stamp or one time
+                stamp for each value, to calculate the conversion rate
+                from the past
+            :returns: numpy array (list, when numpy is not installed)
+
+            .. code-block:: python
+
+                from beem import Steem
+                stm = Steem()
+                stm.vests_to_sp_array([1e6, 2e6, 3e6])
+
+        """
+        np = load_numpy()
+        vests = _float_array(vests)
+        steem_per_mvest = self._get_steem_per_mvest_for(timestamps, use_stored_data=use_stored_data)
+        if np is not None:
+            return vests / 1e6 * steem_per_mvest
+        if isinstance(steem_per_mvest, list):
+            return [v / 1e6 * r for v, r in zip(vests, steem_per_mvest)]
+        return [v / 1e6 * steem_per_mvest for v in vests]
+
+    def sp_to_vests_array(self, sp, timestamps=None, use_stored_data=True):
+        """ Converts many SP values to vests. The chain parameters are
+            only read once.
+
+            :param list sp: Steem power values to convert
+            :param timestamps: (Optional) a single time stamp or one time
+                stamp for each value, to calculate the conversion rate
+                from the past
+            :returns: numpy array (list, when numpy is not installed)
+        """
+        np = load_numpy()
+        sp = _float_array(sp)
+        steem_per_mvest = self._get_steem_per_mvest_for(timestamps, use_stored_data=use_stored_data)
+        if np is not None:
+            return sp * 1e6 / steem_per_mvest
+        if isinstance(steem_per_mvest, list):
+            return [s * 1e6 / r for s, r in zip(sp, steem_per_mvest)]
+        return [s * 1e6 / steem_per_mvest for s in sp]
+
     def sp_to_sbd(self, sp, voting_power=STEEM_100_PERCENT, vote_pct=STEEM_100_PERCENT, not_broadcasted_vote=True, use_stored_data=True):
         """ Obtain the resulting SBD vote value from Steem power
 
@@ -621,10 +744,11 @@ class Steem(object):
         max_vote_denom = vote_power_reserve_rate * STEEM_VOTE_REGENERATION_SECONDS
         return max_vote_denom
 
-    def _calc_resulting_vote(self, voting_power=STEEM_100_PERCENT, vote_pct=STEEM_100_PERCENT, use_stored_data=True):
+    def _calc_resulting_vote(self, voting_power=STEEM_100_PERCENT, vote_pct=STEEM_100_PERCENT, use_stored_data=True, max_vote_denom=None):
         # determine voting power used
         used_power = int((voting_power * abs(vote_pct)) / STEEM_100_PERCENT * (60 * 60 * 24))
-        max_vote_denom = self._max_vote_denom(use_stored_data=use_stored_data)
+        if max_vote_denom is None:
+            max_vote_denom = self._max_vote_denom(use_stored_data=use_stored_data)
         used_power = int((used_power + max_vote_denom - 1) / max_vote_denom)
         return used_power
 
@@ -657,6 +781,65 @@ class Steem(object):
             rshares -= math.copysign(self.get_dust_threshold(use_stored_data=use_stored_data), vote_pct)
         return rshares
 
+    def vests_to_rshares_array(self, vests, voting_power=STEEM_100_PERCENT, vote_pct=STEEM_100_PERCENT, subtract_dust_threshold=True, use_stored_data=True):
+        """ Obtain the r-shares for many vests values, see
+            :func:`vests_to_rshares`. The chain parameters are only read
+            once.
+
+            :param list vests: vesting shares
+            :param int voting_power: voting power (100% = 10000)
+            :param int vote_pct: voting percentage (100% = 10000)
+            :returns: numpy array (list, when numpy is not installed)
+
+        """
+        np = load_numpy()
+        vests = _float_array(vests)
+        used_power = self._calc_resulting_vote(voting_power=voting_power, vote_pct=vote_pct, use_stored_data=use_stored_data)
+        dust_threshold = self.get_dust_threshold(use_stored_data=use_stored_data)
+        if np is not None:
+            rshares = np.copysign(np.trunc(vests * 1e6 * used_power / STEEM_100_PERCENT), vote_pct)
+            if subtract_dust_threshold:
+                rshares = np.where(np.abs(rshares) <= dust_threshold, 0,
+                                   rshares - math.copysign(dust_threshold, vote_pct))
+            return rshares
+        ret = []
+        for v in vests:
+            rshares = int(math.copysign(v * 1e6 * used_power / STEEM_100_PERCENT, vote_pct))
+            if subtract_dust_threshold:
+                if abs(rshares) <= dust_threshold:
+                    rshares = 0
+                else:
+                    rshares -= math.copysign(dust_threshold, vote_pct)
+            ret.append(rshares)
+        return ret
+
+    def rshares_to_sbd_array(self, rshares, not_broadcasted_vote=False, use_stored_data=True):
+        """ Calculates the current SBD value for many rshares values, see
+            :func:`rshares_to_sbd`. The chain parameters are only read once.
+
+            :param list rshares: rshares values
+            :param bool not_broadcasted_vote: not_broadcasted or already broadcasted votes
+            :returns: numpy array (list, when numpy is not installed)
+        """
+        np = load_numpy()
+        rshares = _float_array(rshares)
+        median_price = self.get_median_price(use_stored_data=use_stored_data)
+        if median_price is None:
+            if np is not None:
+                return np.zeros(len(rshares))
+            return [0] * len(rshares)
+        reward_fund = self.get_reward_funds(use_stored_data=use_stored_data)
+        reward_balance = float(Amount(reward_fund["reward_balance"], steem_instance=self))
+        recent_claims = float(reward_fund["recent_claims"])
+        SBD_price = float(median_price * (Amount(1, self.steem_symbol, steem_instance=self)))
+        if np is not None:
+            if not_broadcasted_vote:
+                return rshares * (reward_balance / (recent_claims + rshares)) * SBD_price
+            return rshares * (reward_balance / recent_claims) * SBD_price
+        if not_broadcasted_vote:
+            return [r * (reward_balance / (recent_claims + r)) * SBD_price for r in rshares]
+        return [r * (reward_balance / recent_claims) * SBD_price for r in rshares]
+
     def sbd_to_rshares(self, sbd, not_broadcasted_vote=False, use_stored_data=True):
         """ Obtain the r-shares from SBD
 
@@ -9,7 +9,10 @@ from beemgraphenebase.py23 import py23_bytes, bytes_types
 import shutil
 import time
 import os
+import json
+import zlib
 import sqlite3
+import threading
 from .aes import AESCipher
 from appdirs import user_data_dir
 from datetime import datetime
@@ -18,7 +21,6 @@ from binascii import hexlify
 import random
 import hashlib
 from .exceptions import WrongMasterPasswordException, NoWriteAccess
-from .nodelist import NodeList
 log = logging.getLogger(__name__)
 log.setLevel(logging.DEBUG)
 log.addHandler(logging.StreamHandler())
@@ -53,10 +55,64 @@ class DataDir(object):
     data_dir = user_data_dir(appname, appauthor)
     sqlDataBaseFile = os.path.join(data_dir, storageDatabase)
 
+    #: Shared connections, one for each database file
+    connections = {}
+    #: Locks which serialize the use of the shared connections
+    locks = {}
+    connections_lock = threading.Lock()
+    #: Connection and lock of a ``:memory:`` database, which is not shared
+    memory_connection = None
+    memory_lock = None
+
     def __init__(self):
         #: Storage
         self.mkdir_p()
 
+    def open_memory_connection(self):
+        """ Opens a ``:memory:`` database, which is used only by this object"""
+        self.memory_connection = sqlite3.connect(":memory:", check_same_thread=False)
+        self.memory_lock = threading.RLock()
+
+    def get_connection(self):
+        """ Returns the connection to ``sqlDataBaseFile``, which is shared by all
+            storage objects of this database file. The connection is opened on
+            first use, file databases are switched to WAL mode.
+        """
+        if self.memory_connection is not None:
+            return self.memory_connection
+        with DataDir.connections_lock:
+            connection = DataDir.connections.get(self.sqlDataBaseFile)
+            if connection is None:
+                connection = sqlite3.connect(self.sqlDataBaseFile, check_same_thread=False)
+                if self.sqlDataBaseFile != ":memory:":
+                    try:
+                        connection.execute("PRAGMA journal_mode=WAL")
+                    except sqlite3.OperationalError:
+                        log.debug("Could not set WAL mode (database: %s)" % (self.sqlDataBaseFile))
+                DataDir.connections[self.sqlDataBaseFile] = connection
+        return connection
+
+    def get_lock(self):
+        """ Returns the lock of the shared connection to ``sqlDataBaseFile``.
+            It has to be held while the connection is used, as the
+            connection is shared between threads.
+        """
+        if self.memory_lock is not None:
+            return self.memory_lock
+        with DataDir.connections_lock:
+            lock = DataDir.locks.get(self.sqlDataBaseFile)
+            if lock is None:
+                lock = threading.RLock()
+                DataDir.locks[self.sqlDataBaseFile] = lock
+        return lock
+
+    def close_connection(self):
+        """ Closes the shared connection to ``sqlDataBaseFile``"""
+        with DataDir.connections_lock:
+            connection = DataDir.connections.pop(self.sqlDataBaseFile, None)
+        if connection is not None:
+            connection.close()
+
     def mkdir_p(self):
         """ Ensure that the directory in which the data is stored
             exists
@@ -93,6 +149,13 @@ class DataDir(object):
             return
         if not os.path.isfile(src):
             return
+        # Move all changes from the WAL file into the database file
+        try:
+            self.get_connection().execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        except sqlite3.OperationalError:
+            pass
+        if dst == self.sqlDataBaseFile:
+            self.close_connection()
         connection = sqlite3.connect(self.sqlDataBaseFile)
         cursor = connection.cursor()
         # Lock database before making a backup
@@ -102,6 +165,7 @@ class DataDir(object):
         log.info("Creating {}...".format(dst))
         # Unlock database
         connection.rollback()
+        connection.close()
 
     def recover_with_latest_backup(self, backupdir="backups"):
         """ Replace database with latest backup"""
@@ -121,6 +185,10 @@ class DataDir(object):
                     newest_backup_file = backup_file
         if newest_backup_file is not None:
             self.sqlite3_copy(newest_backup_file, self.sqlDataBaseFile)
+            # The cached configuration belongs to the replaced database
+            configStorage.clear_cache()
+            if isinstance(self, Configuration):
+                self.clear_cache()
 
     def clean_data(self):
         """ Delete files older than 70 days
@@ -159,10 +227,11 @@ class Key(DataDir):
         query = ("SELECT name FROM sqlite_master "
                  "WHERE type='table' AND name=?", (self.__tablename__, ))
         try:
-            connection = sqlite3.connect(self.sqlDataBaseFile)
-            cursor = connection.cursor()
-            cursor.execute(*query)
-            return True if cursor.fetchone() else False
+            connection = self.get_connection()
+            with self.get_lock():
+                cursor = connection.cursor()
+                cursor.execute(*query)
+                return True if cursor.fetchone() else False
         except sqlite3.OperationalError:
             self.sqlDataBaseFile = ":memory:"
             log.warning("Could not read(database: %s)" % (self.sqlDataBaseFile))
@@ -175,27 +244,29 @@ class Key(DataDir):
                  "id INTEGER PRIMARY KEY AUTOINCREMENT,"
                  "pub STRING(256),"
                  "wif STRING(256))".format(self.__tablename__))
-        connection = sqlite3.connect(self.sqlDataBaseFile)
-        cursor = connection.cursor()
-        cursor.execute(query)
-        connection.commit()
+        connection = self.get_connection()
+        with self.get_lock():
+            cursor = connection.cursor()
+            cursor.execute(query)
+            connection.commit()
 
     def getPublicKeys(self, prefix="STM"):
         """ Returns the public keys stored in the database
         """
         query = ("SELECT pub from {0} ".format(self.__tablename__))
-        connection = sqlite3.connect(self.sqlDataBaseFile)
-        cursor = connection.cursor()
-        try:
-            cursor.execute(query)
-            results = cursor.fetchall()
-            keys = []
-            for x in results:
-                if prefix == x[0][:len(prefix)]:
-                    keys.append(x[0])
-            return keys
-        except sqlite3.OperationalError:
-            return []
+        connection = self.get_connection()
+        with self.get_lock():
+            cursor = connection.cursor()
+            try:
+                cursor.execute(query)
+                results = cursor.fetchall()
+                keys = []
+                for x in results:
+                    if prefix == x[0][:len(prefix)]:
+                        keys.append(x[0])
+                return keys
+            except sqlite3.OperationalError:
+                return []
 
     def getPrivateKeyForPublicKey(self, pub):
         """Returns the (possibly encrypted) private key that
@@ -206,14 +277,15 @@ class Key(DataDir):
            The encryption scheme is BIP38
         """
         query = ("SELECT wif from {0} WHERE pub=?".format(self.__tablename__), (pub,))
-        connection = sqlite3.connect(self.sqlDataBaseFile)
-        cursor = connection.cursor()
-        cursor.execute(*query)
-        key = cursor.fetchone()
-        if key:
-            return key[0]
-        else:
-            return None
+        connection = self.get_connection()
+        with self.get_lock():
+            cursor = connection.cursor()
+            cursor.execute(*query)
+            key = cursor.fetchone()
+            if key:
+                return key[0]
+            else:
+                return None
 
     def updateWif(self, pub, wif):
         """ Change the wif to a pubkey
@@ -222,10 +294,11 @@ class Key(DataDir):
            :param str wif: Private key
         """
         query = ("UPDATE {0} SET wif=? WHERE pub=?".format(self.__tablename__), (wif, pub))
-        connection = sqlite3.connect(self.sqlDataBaseFile)
-        cursor = connection.cursor()
-        cursor.execute(*query)
-        connection.commit()
+        connection = self.get_connection()
+        with self.get_lock():
+            cursor = connection.cursor()
+            cursor.execute(*query)
+            connection.commit()
 
     def add(self, wif, pub):
         """Add a new public/private key pair (correspondence has to be
@@ -237,10 +310,11 @@ class Key(DataDir):
         if self.getPrivateKeyForPublicKey(pub):
             raise ValueError("Key already in storage")
         query = ("INSERT INTO {0} (pub, wif) VALUES (?, ?)".format(self.__tablename__), (pub, wif))
-        connection = sqlite3.connect(self.sqlDataBaseFile)
-        cursor = connection.cursor()
-        cursor.execute(*query)
-        connection.commit()
+        connection = self.get_connection()
+        with self.get_lock():
+            cursor = connection.cursor()
+            cursor.execute(*query)
+            connection.commit()
 
     def delete(self, pub):
         """ Delete the key identified as `pub`
@@ -248,10 +322,11 @@ class Key(DataDir):
            :param str pub: Public key
         """
         query = ("DELETE FROM {0} WHERE pub=?".format(self.__tablename__), (pub,))
-        connection = sqlite3.connect(self.sqlDataBaseFile)
-        cursor = connection.cursor()
-        cursor.execute(*query)
-        connection.commit()
+        connection = self.get_connection()
+        with self.get_lock():
+            cursor = connection.cursor()
+            cursor.execute(*query)
+            connection.commit()
 
     def wipe(self, sure=False):
         """Purge the entire wallet. No keys will survive this!"""
@@ -264,10 +339,11 @@ class Key(DataDir):
             return
         else:
             query = ("DELETE FROM {0} ".format(self.__tablename__))
-            connection = sqlite3.connect(self.sqlDataBaseFile)
-            cursor = connection.cursor()
-            cursor.execute(query)
-            connection.commit()
+            connection = self.get_connection()
+            with self.get_lock():
+                cursor = connection.cursor()
+                cursor.execute(query)
+                connection.commit()
 
 
 class Token(DataDir):
@@ -286,10 +362,11 @@ class Token(DataDir):
         query = ("SELECT name FROM sqlite_master "
                  "WHERE type='table' AND name=?", (self.__tablename__, ))
         try:
-            connection = sqlite3.connect(self.sqlDataBaseFile)
-            cursor = connection.cursor()
-            cursor.execute(*query)
-            return True if cursor.fetchone() else False
+            connection = self.get_connection()
+            with self.get_lock():
+                cursor = connection.cursor()
+                cursor.execute(*query)
+                return True if cursor.fetchone() else False
         except sqlite3.OperationalError:
             self.sqlDataBaseFile = ":memory:"
             log.warning("Could not read(database: %s)" % (self.sqlDataBaseFile))
@@ -302,23 +379,25 @@ class Token(DataDir):
                  "id INTEGER PRIMARY KEY AUTOINCREMENT,"
                  "name STRING(256),"
                  "token STRING(256))".format(self.__tablename__))
-        connection = sqlite3.connect(self.sqlDataBaseFile)
-        cursor = connection.cursor()
-        cursor.execute(query)
-        connection.commit()
+        connection = self.get_connection()
+        with self.get_lock():
+            cursor = connection.cursor()
+            cursor.execute(query)
+            connection.commit()
 
     def getPublicNames(self):
         """ Returns the public names stored in the database
         """
         query = ("SELECT name from {0} ".format(self.__tablename__))
-        connection = sqlite3.connect(self.sqlDataBaseFile)
-        cursor = connection.cursor()
-        try:
-            cursor.execute(query)
-            results = cursor.fetchall()
-            return [x[0] for x in results]
-        except sqlite3.OperationalError:
-            return []
+        connection = self.get_connection()
+        with self.get_lock():
+            cursor = connection.cursor()
+            try:
+                cursor.execute(query)
+                results = cursor.fetchall()
+                return [x[0] for x in results]
+            except sqlite3.OperationalError:
+                return []
 
     def getTokenForPublicName(self, name):
         """Returns the (possibly encrypted) private token that
@@ -329,14 +408,15 @@ class Token(DataDir):
            The encryption scheme is BIP38
         """
         query = ("SELECT token from {0} WHERE name=?".format(self.__tablename__), (name,))
-        connection = sqlite3.connect(self.sqlDataBaseFile)
-        cursor = connection.cursor()
-        cursor.execute(*query)
-        token = cursor.fetchone()
-        if token:
-            return token[0]
-        else:
-            return None
+        connection = self.get_connection()
+        with self.get_lock():
+            cursor = connection.cursor()
+            cursor.execute(*query)
+            token = cursor.fetchone()
+            if token:
+                return token[0]
+            else:
+                return None
 
     def updateToken(self, name, token):
         """ Change the token to a name
@@ -345,10 +425,11 @@ class Token(DataDir):
            :param str token: Private token
         """
         query = ("UPDATE {0} SET token=? WHERE name=?".format(self.__tablename__), (token, name))
-        connection = sqlite3.connect(self.sqlDataBaseFile)
-        cursor = connection.cursor()
-        cursor.execute(*query)
-        connection.commit()
+        connection = self.get_connection()
+        with self.get_lock():
+            cursor = connection.cursor()
+            cursor.execute(*query)
+            connection.commit()
 
     def add(self, name, token):
         """Add a new public/private token pair (correspondence has to be
@@ -360,10 +441,11 @@ class Token(DataDir):
         if self.getTokenForPublicName(name):
             raise ValueError("Key already in storage")
         query = ("INSERT INTO {0} (name, token) VALUES (?, ?)".format(self.__tablename__), (name, token))
-        connection = sqlite3.connect(self.sqlDataBaseFile)
-        cursor = connection.cursor()
-        cursor.execute(*query)
-        connection.commit()
+        connection = self.get_connection()
+        with self.get_lock():
+            cursor = connection.cursor()
+            cursor.execute(*query)
+            connection.commit()
 
     def delete(self, name):
         """ Delete the key identified as `name`
@@ -371,10 +453,11 @@ class Token(DataDir):
            :param str name: Public name
         """
         query = ("DELETE FROM {0} WHERE name=?".format(self.__tablename__), (name,))
-        connection = sqlite3.connect(self.sqlDataBaseFile)
-        cursor = connection.cursor()
-        cursor.execute(*query)
-        connection.commit()
+        connection = self.get_connection()
+        with self.get_lock():
+            cursor = connection.cursor()
+            cursor.execute(*query)
+            connection.commit()
 
     def wipe(self, sure=False):
         """Purge the entire wallet. No keys will survive this!"""
@@ -387,23 +470,46 @@ class Token(DataDir):
             return
         else:
             query = ("DELETE FROM {0} ".format(self.__tablename__))
-            connection = sqlite3.connect(self.sqlDataBaseFile)
-            cursor = connection.cursor()
-            cursor.execute(query)
-            connection.commit()
+            connection = self.get_connection()
+            with self.get_lock():
+                cursor = connection.cursor()
+                cursor.execute(query)
+                connection.commit()
+
+
+def get_default_nodes():
+    """ Returns the default node list"""
+    from .nodelist import NodeList
+    return NodeList().get_nodes(normal=True, appbase=True, dev=False, testnet=False)
+
+
+class LazyDefaults(dict):
+    """ dict, whose callable values are replaced by their return value on first access"""
+    def __getitem__(self, key):
+        value = super(LazyDefaults, self).__getitem__(key)
+        if callable(value):
+            value = value()
+            self[key] = value
+        return value
+
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+        return default
 
 
 class Configuration(DataDir):
     """ This is the configuration storage that stores key/value
         pairs in the `config` table of the SQLite3 database.
+
+        All key/value pairs are read at once on first access and are
+        kept in memory, :func:`clear_cache` forces a reload.
     """
     __tablename__ = "config"
 
     #: Default configuration
-    nodelist = NodeList()
-    nodes = nodelist.get_nodes(normal=True, appbase=True, dev=False, testnet=False)
-    config_defaults = {
-        "node": nodes,
+    config_defaults = LazyDefaults({
+        "node": get_default_nodes,
         "password_storage": "environment",
         "rpcpassword": "",
         "rpcuser": "",
@@ -411,10 +517,39 @@ class Configuration(DataDir):
         "client_id": "",
         "hot_sign_redirect_uri": None,
         "sc2_api_url": "https://steemconnect.com/api/",
-        "oauth_base_url": "https://steemconnect.com/oauth2/"}
+        "oauth_base_url": "https://steemconnect.com/oauth2/"})
 
     def __init__(self):
         super(Configuration, self).__init__()
+        self._cache = None
+        self._cache_lock = threading.Lock()
+
+    def clear_cache(self):
+        """ Forces a reload of the configuration on next access"""
+        self._cache = None
+
+    def _get_cache(self):
+        """ Returns all stored key/value pairs (read from the database on first access)"""
+        cache = self._cache
+        if cache is not None:
+            return cache
+        with self._cache_lock:
+            if self._cache is None:
+                query = ("SELECT key, value from {0} ".format(self.__tablename__))
+                connection = self.get_connection()
+                with self.get_lock():
+                    cursor = connection.cursor()
+                    try:
+                        cursor.execute(query)
+                    except sqlite3.OperationalError:
+                        log.warning("Could not read (database: %s)" % (self.__tablename__))
+                        return {}
+                    cache = {}
+                    for key, value in cursor.fetchall():
+                        if key not in cache:
+                            cache[key] = value
+                    self._cache = cache
+            return self._cache
 
     def exists_table(self):
         """ Check if the database table exists
@@ -422,10 +557,11 @@ class Configuration(DataDir):
         query = ("SELECT name FROM sqlite_master "
                  "WHERE type='table' AND name=?", (self.__tablename__,))
         try:
-            connection = sqlite3.connect(self.sqlDataBaseFile)
-            cursor = connection.cursor()
-            cursor.execute(*query)
-            return True if cursor.fetchone() else False
+            connection = self.get_connection()
+            with self.get_lock():
+                cursor = connection.cursor()
+                cursor.execute(*query)
+                return True if cursor.fetchone() else False
         except sqlite3.OperationalError:
             self.sqlDataBaseFile = ":memory:"
             log.warning("Could not read(database: %s)" % (self.sqlDataBaseFile))
@@ -438,14 +574,15 @@ class Configuration(DataDir):
                  "id INTEGER PRIMARY KEY AUTOINCREMENT,"
                  "key STRING(256),"
                  "value STRING(256))".format(self.__tablename__))
-        connection = sqlite3.connect(self.sqlDataBaseFile)
-        cursor = connection.cursor()
-        try:
-            cursor.execute(query)
-            connection.commit()
-        except sqlite3.OperationalError:
-            log.error("Could not write to database: %s" % (self.__tablename__))
-            raise NoWriteAccess("Could not write to database: %s" % (self.__tablename__))
+        connection = self.get_connection()
+        with self.get_lock():
+            cursor = connection.cursor()
+            try:
+                cursor.execute(query)
+                connection.commit()
+            except sqlite3.OperationalError:
+                log.error("Could not write to database: %s" % (self.__tablename__))
+                raise NoWriteAccess("Could not write to database: %s" % (self.__tablename__))
 
     def checkBackup(self):
         """ Backup the SQL database every 7 days
@@ -468,39 +605,19 @@ class Configuration(DataDir):
     def _haveKey(self, key):
         """ Is the key `key` available int he configuration?
         """
-        query = ("SELECT value FROM {0} WHERE key=?".format(self.__tablename__), (key,))
-        connection = sqlite3.connect(self.sqlDataBaseFile)
-        cursor = connection.cursor()
-        try:
-            cursor.execute(*query)
-            return True if cursor.fetchone() else False
-        except sqlite3.OperationalError:
-            log.warning("Could not read %s (database: %s)" % (str(key), self.__tablename__))
-            return False
+        return key in self._get_cache()
 
     def __getitem__(self, key):
         """ This method behaves differently from regular `dict` in that
             it returns `None` if a key is not found!
         """
-        query = ("SELECT value FROM {0} WHERE key=?".format(self.__tablename__), (key,))
-        connection = sqlite3.connect(self.sqlDataBaseFile)
-        cursor = connection.cursor()
-        try:
-            cursor.execute(*query)
-            result = cursor.fetchone()
-            if result:
-                return result[0]
-            else:
-                if key in self.config_defaults:
-                    return self.config_defaults[key]
-                else:
-                    return None
-        except sqlite3.OperationalError:
-            log.warning("Could not read %s (database: %s)" % (str(key), self.__tablename__))
-            if key in self.config_defaults:
-                return self.config_defaults[key]
-            else:
-                return None
+        cache = self._get_cache()
+        if key in cache:
+            return cache[key]
+        elif key in self.config_defaults:
+            return self.config_defaults[key]
+        else:
+            return None
 
     def get(self, key, default=None):
         """ Return the key if exists or a default value
@@ -521,47 +638,425 @@ class Configuration(DataDir):
             query = ("UPDATE {0} SET value=? WHERE key=?".format(self.__tablename__), (value, key))
         else:
             query = ("INSERT INTO {0} (key, value) VALUES (?, ?)".format(self.__tablename__), (key, value))
-        connection = sqlite3.connect(self.sqlDataBaseFile)
-        cursor = connection.cursor()
-        try:
-            cursor.execute(*query)
-            connection.commit()
-        except sqlite3.OperationalError:
-            log.error("Could not write to %s (database: %s)" % (str(key), self.__tablename__))
-            raise NoWriteAccess("Could not write to %s (database: %s)" % (str(key), self.__tablename__))
+        connection = self.get_connection()
+        with self.get_lock():
+            cursor = connection.cursor()
+            try:
+                cursor.execute(*query)
+                connection.commit()
+            except sqlite3.OperationalError:
+                log.error("Could not write to %s (database: %s)" % (str(key), self.__tablename__))
+                raise NoWriteAccess("Could not write to %s (database: %s)" % (str(key), self.__tablename__))
+        self._get_cache()[key] = value
 
     def delete(self, key):
         """ Delete a key from the configuration store
         """
         query = ("DELETE FROM {0} WHERE key=?".format(self.__tablename__), (key,))
-        connection = sqlite3.connect(self.sqlDataBaseFile)
-        cursor = connection.cursor()
-        try:
-            cursor.execute(*query)
-            connection.commit()
-        except sqlite3.OperationalError:
-            log.error("Could not write to %s (database: %s)" % (str(key), self.__tablename__))
-            raise NoWriteAccess("Could not write to %s (database: %s)" % (str(key), self.__tablename__))
+        connection = self.get_connection()
+        with self.get_lock():
+            cursor = connection.cursor()
+            try:
+                cursor.execute(*query)
+                connection.commit()
+            except sqlite3.OperationalError:
+                log.error("Could not write to %s (database: %s)" % (str(key), self.__tablename__))
+                raise NoWriteAccess("Could not write to %s (database: %s)" % (str(key), self.__tablename__))
+        self._get_cache().pop(key, None)
 
     def __iter__(self):
         return iter(list(self.items()))
 
     def items(self):
         query = ("SELECT key, value from {0} ".format(self.__tablename__))
-        connection = sqlite3.connect(self.sqlDataBaseFile)
-        cursor = connection.cursor()
-        cursor.execute(query)
-        r = {}
-        for key, value in cursor.fetchall():
-            r[key] = value
-        return r
+        connection = self.get_connection()
+        with self.get_lock():
+            cursor = connection.cursor()
+            cursor.execute(query)
+            r = {}
+            for key, value in cursor.fetchall():
+                r[key] = value
+            return r
 
     def __len__(self):
         query = ("SELECT id from {0} ".format(self.__tablename__))
-        connection = sqlite3.connect(self.sqlDataBaseFile)
-        cursor = connection.cursor()
-        cursor.execute(query)
-        return len(cursor.fetchall())
+        connection = self.get_connection()
+        with self.get_lock():
+            cursor = connection.cursor()
+            cursor.execute(query)
+            return len(cursor.fetchall())
+
+
+class BlockStorage(DataDir):
+    """ This is a persistent block cache that stores the zlib compressed
+        json of irreversible blocks in the `blocks` table of a separate
+        SQLite3 database (``blocks.sqlite`` in the data directory).
+
+        :param str sqlDataBaseFile: Use this database file instead of the
+            default one (``:memory:`` is also possible)
+
+        Blocks are keyed by chain id, block number and block type
+        (full block, operations only or virtual operations only). Only
+        blocks which are irreversible are stored, as they never change.
+
+        .. code-block:: python
+
+            from beem import Steem
+            from beem.block import Block
+            stm = Steem(block_storage=True)
+            block = Block(1, steem_instance=stm)  # stored on disk
+            block = Block(1, steem_instance=stm)  # read from disk
+
+    """
+    __tablename__ = 'blocks'
+    storageDatabase = "blocks.sqlite"
+    sqlDataBaseFile = os.path.join(DataDir.data_dir, storageDatabase)
+
+    def __init__(self, sqlDataBaseFile=None):
+        super(BlockStorage, self).__init__()
+        if sqlDataBaseFile is not None:
+            self.sqlDataBaseFile = sqlDataBaseFile
+        if self.sqlDataBaseFile == ":memory:":
+            # the database exists only within its connection
+            self.open_memory_connection()
+        if not self.exists_table():
+            self.create_table()
+
+    @staticmethod
+    def get_block_type(only_ops=False, only_virtual_ops=False):
+        """ Returns the block type which is used as part of the key"""
+        if only_virtual_ops:
+            return 2
+        elif only_ops:
+            return 1
+        return 0
+
+    def exists_table(self):
+        """ Check if the database table exists
+        """
+        query = ("SELECT name FROM sqlite_master "
+                 "WHERE type='table' AND name=?", (self.__tablename__, ))
+        connection = self.get_connection()
+        with self.get_lock():
+            cursor = connection.cursor()
+            cursor.execute(*query)
+            return True if cursor.fetchone() else False
+
+    def create_table(self):
+        """ Create the new table in the SQLite database
+        """
+        query = ("CREATE TABLE {0} ("
+                 "chain_id STRING(64),"
+                 "block_num INTEGER,"
+                 "block_type INTEGER,"
+                 "data BLOB,"
+                 "PRIMARY KEY (chain_id, block_num, block_type))".format(self.__tablename__))
+        connection = self.get_connection()
+        with self.get_lock():
+            cursor = connection.cursor()
+            try:
+                cursor.execute(query)
+                connection.commit()
+            except sqlite3.OperationalError:
+                log.error("Could not write to database: %s" % (self.__tablename__))
+                raise NoWriteAccess("Could not write to database: %s" % (self.__tablename__))
+
+    def get_block(self, block_num, block_type=0, chain_id=""):
+        """ Returns the stored block data as dict or None
+
+            :param int block_num: block number
+            :param int block_type: 0 for full blocks, 1 for operations and 2 for virtual operations
+            :param str chain_id: chain id
+        """
+        query = ("SELECT data FROM {0} WHERE chain_id=? AND block_num=? AND block_type=?".format(self.__tablename__),
+                 (chain_id, int(block_num), block_type))
+        connection = self.get_connection()
+        with self.get_lock():
+            cursor = connection.cursor()
+            cursor.execute(*query)
+            result = cursor.fetchone()
+        if result is None:
+            return None
+        return json.loads(zlib.decompress(result[0]).decode("utf-8"))
+
+    def get_blocks(self, start, stop, block_type=0, chain_id=""):
+        """ Returns a dict with all stored blocks between start and stop
+            (both included), keyed by the block number
+
+            :param int start: first block number
+            :param int stop: last block number
+            :param int block_type: 0 for full blocks, 1 for operations and 2 for virtual operations
+            :param str chain_id: chain id
+        """
+        query = ("SELECT block_num, data FROM {0} WHERE chain_id=? AND block_type=? AND "
+                 "block_num>=? AND block_num<=?".format(self.__tablename__),
+                 (chain_id, block_type, int(start), int(stop)))
+        connection = self.get_connection()
+        with self.get_lock():
+            cursor = connection.cursor()
+            cursor.execute(*query)
+            results = cursor.fetchall()
+        return {block_num: json.loads(zlib.decompress(data).decode("utf-8")) for block_num, data in results}
+
+    def store_blocks(self, blocks, block_type=0, chain_id="", last_irreversible_block_num=None):
+        """ Stores blocks, blocks above last_irreversible_block_num are skipped
+
+            :param list blocks: list of (block_num, block_data) tuples, block_data
+                has to be json serializable
+            :param int block_type: 0 for full blocks, 1 for operations and 2 for virtual operations
+            :param str chain_id: chain id
+            :param int last_irreversible_block_num: blocks above this number are not stored.
+                When None, all blocks are stored.
+        """
+        rows = []
+        for block_num, data in blocks:
+            if last_irreversible_block_num is not None and int(block_num) > last_irreversible_block_num:
+                continue
+            data = zlib.compress(py23_bytes(json.dumps(data, separators=(',', ':')), "utf-8"))
+            rows.append((chain_id, int(block_num), block_type, sqlite3.Binary(data)))
+        if len(rows) == 0:
+            return
+        query = "INSERT OR REPLACE INTO {0} (chain_id, block_num, block_type, data) VALUES (?, ?, ?, ?)".format(self.__tablename__)
+        connection = self.get_connection()
+        with self.get_lock():
+            cursor = connection.cursor()
+            try:
+                cursor.executemany(query, rows)
+                connection.commit()
+            except sqlite3.OperationalError:
+                log.error("Could not write to database: %s" % (self.__tablename__))
+                raise NoWriteAccess("Could not write to database: %s" % (self.__tablename__))
+
+    def store_block(self, block_num, data, block_type=0, chain_id="", last_irreversible_block_num=None):
+        """ Stores a single block, see :func:`store_blocks`
+        """
+        self.store_blocks([(block_num, data)], block_type=block_type, chain_id=chain_id,
+                          last_irreversible_block_num=last_irreversible_block_num)
+
+    def __len__(self):
+        query = ("SELECT COUNT(*) from {0} ".format(self.__tablename__))
+        connection = self.get_connection()
+        with self.get_lock():
+            cursor = connection.cursor()
+            cursor.execute(query)
+            return cursor.fetchone()[0]
+
+    def wipe(self):
+        """ Removes all stored blocks"""
+        query = ("DELETE FROM {0} ".format(self.__tablename__))
+        connection = self.get_connection()
+        with self.get_lock():
+            cursor = connection.cursor()
+            cursor.execute(query)
+            connection.commit()
+
+
+class AccountHistoryStorage(DataDir):
+    """ This is a persistent store for account history operations. The
+        zlib compressed json of each irreversible operation is stored in
+        the `account_history` table of a separate SQLite3 database
+        (``account_history.sqlite`` in the data directory).
+
+        :param str sqlDataBaseFile: Use this database file instead of the
+            default one (``:memory:`` is also possible)
+
+        Operations are keyed by chain id, account name and operation index,
+        the ``_id`` from :func:`beem.blockchain.Blockchain.hash_op` is
+        stored as well. Once a range of operations was synced, it is read
+        from the store and only newer operations are requested from the node.
+
+        .. code-block:: python
+
+            from beem import Steem
+            from beem.account import Account
+            stm = Steem(account_history_storage=True)
+            acc = Account("beem", steem_instance=stm)
+            ops = list(acc.history())  # stored on disk
+            ops = list(acc.history())  # only new operations are fetched
+
+    """
+    __tablename__ = 'account_history'
+    storageDatabase = "account_history.sqlite"
+    sqlDataBaseFile = os.path.join(DataDir.data_dir, storageDatabase)
+
+    def __init__(self, sqlDataBaseFile=None):
+        super(AccountHistoryStorage, self).__init__()
+        if sqlDataBaseFile is not None:
+            self.sqlDataBaseFile = sqlDataBaseFile
+        if self.sqlDataBaseFile == ":memory:":
+            # the database exists only within its connection
+            self.open_memory_connection()
+        if not self.exists_table():
+            self.create_table()
+
+    def exists_table(self):
+        """ Check if the database table exists
+        """
+        query = ("SELECT name FROM sqlite_master "
+                 "WHERE type='table' AND name=?", (self.__tablename__, ))
+        connection = self.get_connection()
+        with self.get_lock():
+            cursor = connection.cursor()
+            cursor.execute(*query)
+            return True if cursor.fetchone() else False
+
+    def create_table(self):
+        """ Create the new table in the SQLite database
+        """
+        query = ("CREATE TABLE {0} ("
+                 "chain_id STRING(64),"
+                 "account STRING(16),"
+                 "op_index INTEGER,"
+                 "op_id STRING(40),"
+                 "block_num INTEGER,"
+                 "data BLOB,"
+                 "PRIMARY KEY (chain_id, account, op_index))".format(self.__tablename__))
+        connection = self.get_connection()
+        with self.get_lock():
+            cursor = connection.cursor()
+            try:
+                cursor.execute(query)
+                cursor.execute("CREATE INDEX {0}_op_id ON {0} (op_id)".format(self.__tablename__))
+                cursor.execute("CREATE INDEX {0}_block_num ON {0} (chain_id, account, block_num)".format(self.__tablename__))
+                connection.commit()
+            except sqlite3.OperationalError:
+                log.error("Could not write to database: %s" % (self.__tablename__))
+                raise NoWriteAccess("Could not write to database: %s" % (self.__tablename__))
+
+    def get_ops(self, account, start, stop, chain_id=""):
+        """ Returns the stored operations with an index between start and
+            stop (both included), sorted by index. Each operation is returned
+            as ``[index, op]`` list, as it is returned by ``get_account_history``.
+
+            :param str account: account name
+            :param int start: first operation index
+            :param int stop: last operation index
+            :param str chain_id: chain id
+        """
+        query = ("SELECT op_index, data FROM {0} WHERE chain_id=? AND account=? AND "
+                 "op_index>=? AND op_index<=? ORDER BY op_index".format(self.__tablename__),
+                 (chain_id, account, int(start), int(stop)))
+        connection = self.get_connection()
+        with self.get_lock():
+            cursor = connection.cursor()
+            cursor.execute(*query)
+            results = cursor.fetchall()
+        return [[op_index, json.loads(zlib.decompress(data).decode("utf-8"))] for op_index, data in results]
+
+    def get_op_by_id(self, op_id, chain_id=""):
+        """ Returns the stored operation with the given ``_id`` as
+            ``[account, index, op]`` or None
+
+            :param str op_id: ``_id`` of the operation
+            :param str chain_id: chain id
+        """
+        query = ("SELECT account, op_index, data FROM {0} WHERE chain_id=? AND op_id=?".format(self.__tablename__),
+                 (chain_id, op_id))
+        connection = self.get_connection()
+        with self.get_lock():
+            cursor = connection.cursor()
+            cursor.execute(*query)
+            result = cursor.fetchone()
+        if result is None:
+            return None
+        return [result[0], result[1], json.loads(zlib.decompress(result[2]).decode("utf-8"))]
+
+    def get_op_bounds(self, account, block_num, chain_id=""):
+        """ Returns the stored operations next to block_num as
+            ``(op_index, block_num)`` tuples: the last operation before
+            block_num and the first operation at or after block_num (or
+            None, when there is no such operation)
+
+            :param str account: account name
+            :param int block_num: block number
+            :param str chain_id: chain id
+        """
+        queries = [
+            ("SELECT op_index, block_num FROM {0} WHERE chain_id=? AND account=? AND block_num<? "
+             "ORDER BY block_num DESC, op_index DESC LIMIT 1".format(self.__tablename__),
+             (chain_id, account, int(block_num))),
+            ("SELECT op_index, block_num FROM {0} WHERE chain_id=? AND account=? AND block_num>=? "
+             "ORDER BY block_num, op_index LIMIT 1".format(self.__tablename__),
+             (chain_id, account, int(block_num)))]
+        bounds = []
+        connection = self.get_connection()
+        with self.get_lock():
+            cursor = connection.cursor()
+            for query in queries:
+                cursor.execute(*query)
+                result = cursor.fetchone()
+                bounds.append(tuple(result) if result is not None else None)
+        return bounds[0], bounds[1]
+
+    def get_synced_index(self, account, chain_id=""):
+        """ Returns the highest stored operation index of an account or
+            -1, when nothing is stored
+
+            :param str account: account name
+            :param str chain_id: chain id
+        """
+        query = ("SELECT MAX(op_index) FROM {0} WHERE chain_id=? AND account=?".format(self.__tablename__),
+                 (chain_id, account))
+        connection = self.get_connection()
+        with self.get_lock():
+            cursor = connection.cursor()
+            cursor.execute(*query)
+            result = cursor.fetchone()
+        if result is None or result[0] is None:
+            return -1
+        return result[0]
+
+    def store_ops(self, account, ops, chain_id="", last_irreversible_block_num=None):
+        """ Stores account history operations, operations in blocks above
+            last_irreversible_block_num are skipped
+
+            :param str account: account name
+            :param list ops: list of (index, op_id, op) tuples, op is the json
+                of the history item and has to contain ``block``
+            :param str chain_id: chain id
+            :param int last_irreversible_block_num: operations above this block
+                are not stored. When None, all operations are stored.
+        """
+        rows = []
+        for op_index, op_id, data in ops:
+            block_num = int(data["block"])
+            if last_irreversible_block_num is not None and block_num > last_irreversible_block_num:
+                continue
+            data = zlib.compress(py23_bytes(json.dumps(data, separators=(',', ':')), "utf-8"))
+            rows.append((chain_id, account, int(op_index), op_id, block_num, sqlite3.Binary(data)))
+        if len(rows) == 0:
+            return
+        query = ("INSERT OR REPLACE INTO {0} (chain_id, account, op_index, op_id, block_num, data) "
+                 "VALUES (?, ?, ?, ?, ?, ?)".format(self.__tablename__))
+        connection = self.get_connection()
+        with self.get_lock():
+            cursor = connection.cursor()
+            try:
+                cursor.executemany(query, rows)
+                connection.commit()
+            except sqlite3.OperationalError:
+                log.error("Could not write to database: %s" % (self.__tablename__))
+                raise NoWriteAccess("Could not write to database: %s" % (self.__tablename__))
+
+    def __len__(self):
+        query = ("SELECT COUNT(*) from {0} ".format(self.__tablename__))
+        connection = self.get_connection()
+        with self.get_lock():
+            cursor = connection.cursor()
+            cursor.execute(query)
+            return cursor.fetchone()[0]
+
+    def wipe(self, account=None):
+        """ Removes all stored operations (of ``account``, when set)"""
+        if account is None:
+            query = ("DELETE FROM {0} ".format(self.__tablename__), ())
+        else:
+            query = ("DELETE FROM {0} WHERE account=?".format(self.__tablename__), (account, ))
+        connection = self.get_connection()
+        with self.get_lock():
+            cursor = connection.cursor()
+            cursor.execute(*query)
+            connection.commit()
 
 
 class MasterPassword(object):
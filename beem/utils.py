@@ -20,6 +20,25 @@ RE_HUNK_HEADER = re.compile(
     r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))?\ @@[ ]?(.*)$", flags=re.MULTILINE
 )
 
+_numpy = None
+_numpy_loaded = False
+
+
+def load_numpy():
+    """ Returns the numpy module or None, when numpy is not installed.
+        numpy is imported on first use, so that importing beem does not
+        import it.
+    """
+    global _numpy, _numpy_loaded
+    if not _numpy_loaded:
+        try:
+            import numpy
+            _numpy = numpy
+        except ImportError:
+            _numpy = None
+        _numpy_loaded = True
+    return _numpy
+
 
 def formatTime(t):
     """ Properly Format Time for permlinks
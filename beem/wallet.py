@@ -6,6 +6,8 @@ from builtins import str, bytes
 from builtins import object
 import logging
 import os
+import time
+import threading
 import hashlib
 from beemgraphenebase import bip38
 from beemgraphenebase.account import PrivateKey
@@ -35,6 +37,10 @@ except ImportError:
     KEYRING_AVAILABLE = False
 
 log = logging.getLogger(__name__)
+try:
+    _monotonic = time.monotonic
+except AttributeError:
+    _monotonic = time.time
 
 
 class Wallet(object):
@@ -46,6 +52,10 @@ class Wallet(object):
         :param keys: Predefine the wif keys to shortcut the
                wallet database
         :type keys: array, dict, str
+        :param float key_cache_timeout: When set, decrypted keys from the wallet
+               database are kept in memory and removed after they have not been
+               used for ``key_cache_timeout`` seconds or when the wallet is locked.
+               (default is None, every key is decrypted on each use)
 
         Three wallet operation modes are possible:
 
@@ -114,6 +124,10 @@ class Wallet(object):
 
     def __init__(self, steem_instance=None, *args, **kwargs):
         self.steem = steem_instance or shared_steem_instance()
+        self.key_cache_timeout = kwargs.get("key_cache_timeout", None)
+        # pubkey -> [PrivateKey, wif, last use]
+        self.key_cache = {}
+        self.key_cache_lock = threading.Lock()
 
         # Compatibility after name change from wif->keys
         if "wif" in kwargs and "keys" not in kwargs:
@@ -226,6 +240,41 @@ class Wallet(object):
         """ Lock the wallet database
         """
         self.masterpassword = None
+        self.clear_key_cache()
+
+    def clear_key_cache(self):
+        """ Removes all decrypted keys from the key cache"""
+        with self.key_cache_lock:
+            self.key_cache = {}
+
+    def _get_cached_key(self, pub):
+        """ Returns the key cache entry for pub or None. The entry is removed when it has expired."""
+        if self.key_cache_timeout is None:
+            return None
+        now = _monotonic()
+        with self.key_cache_lock:
+            entry = self.key_cache.get(pub)
+            if entry is None:
+                return None
+            if now - entry[2] > self.key_cache_timeout:
+                del self.key_cache[pub]
+                return None
+            entry[2] = now
+            return entry
+
+    def _add_cached_key(self, pub, wif):
+        """ Stores a decrypted key in the key cache and returns the cache entry.
+            All expired entries are removed.
+        """
+        now = _monotonic()
+        entry = [PrivateKey(wif, prefix=self.prefix), wif, now]
+        if self.key_cache_timeout is not None:
+            with self.key_cache_lock:
+                for key in list(self.key_cache.keys()):
+                    if now - self.key_cache[key][2] > self.key_cache_timeout:
+                        del self.key_cache[key]
+                self.key_cache[pub] = entry
+        return entry
 
     def unlocked(self):
         """ Is the wallet database unlocked?
@@ -300,6 +349,7 @@ class Wallet(object):
             keyStorage.wipe(sure)
             tokenStorage.wipe(sure)
             self.clear_local_keys()
+            self.clear_key_cache()
 
     def clear_local_keys(self):
         """Clear all manually provided keys"""
@@ -443,12 +493,34 @@ class Wallet(object):
                 raise NoWalletException
 
             if not self.unlocked():
+                # the wallet may have been locked without lock()
+                self.clear_key_cache()
                 raise WalletLocked
 
+            entry = self._get_cached_key(pub)
+            if entry is not None:
+                return entry[1]
+
             encwif = self.keyStorage.getPrivateKeyForPublicKey(pub)
             if not encwif:
                 raise MissingKeyError("No private key for {} found".format(pub))
-            return self.decrypt_wif(encwif)
+            wif = self.decrypt_wif(encwif)
+            if self.key_cache_timeout is not None:
+                self._add_cached_key(pub, wif)
+            return wif
+
+    def getPrivateKeyObjectForPublicKey(self, pub):
+        """ Obtain the private key for a given public key as
+            :class:`beemgraphenebase.account.PrivateKey` object. The object
+            is taken from the key cache, when ``key_cache_timeout`` is set.
+
+            :param str pub: Public Key
+        """
+        wif = self.getPrivateKeyForPublicKey(pub)
+        entry = self._get_cached_key(pub)
+        if entry is not None:
+            return entry[0]
+        return PrivateKey(wif, prefix=self.prefix)
 
     def removePrivateKeyFromPublicKey(self, pub):
         """ Remove a key from the wallet database
@@ -460,6 +532,8 @@ class Wallet(object):
             if not self.created():
                 raise NoWalletException
             self.keyStorage.delete(pub)
+        with self.key_cache_lock:
+            self.key_cache.pop(pub, None)
 
     def removeAccount(self, account):
         """ Remove all keys associated with a given account
@@ -29,8 +29,10 @@ from beemgraphenebase.version import version as beem_version
 from beemgraphenebase.chains import known_chains
 if sys.version_info[0] < 3:
     from thread import interrupt_main
+    from Queue import Queue, Empty
 else:
     from _thread import interrupt_main
+    from queue import Queue, Empty
 WEBSOCKET_MODULE = None
 if not WEBSOCKET_MODULE:
     try:
@@ -72,6 +74,21 @@ def shared_session_instance():
     return SessionInstance.instance
 
 
+def create_session(pool_connections=10, pool_maxsize=10):
+    """Create a new session with its own connection pool
+
+    :param int pool_connections: number of nodes (hosts) for which connections are kept
+    :param int pool_maxsize: number of keep-alive connections per node
+    """
+    if REQUEST_MODULE is None:
+        raise Exception()
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
 def create_ws_instance(use_ssl=True, enable_multithread=True):
     """Get websocket instance"""
     if WEBSOCKET_MODULE is None:
@@ -84,6 +101,116 @@ def create_ws_instance(use_ssl=True, enable_multithread=True):
         return websocket.WebSocket(enable_multithread=enable_multithread)
 
 
+class WebsocketMultiplexer(object):
+    """ Allows several threads to send json-rpc requests over one websocket
+        at the same time. A reader thread receives all replies and hands
+        them to the waiting caller with the same json-rpc id.
+
+        :param websocket ws: connected websocket
+        :param int timeout: maximum time in seconds to wait for a reply (default is 60)
+    """
+    def __init__(self, ws, timeout=60):
+        self.ws = ws
+        self.timeout = timeout
+        self.send_lock = threading.Lock()
+        self.pending_lock = threading.Lock()
+        # request id -> [event, reply]
+        self.pending = {}
+        self.error = None
+        self.closed = False
+        self.reader = threading.Thread(target=self._run)
+        self.reader.daemon = True
+        self.reader.start()
+
+    @staticmethod
+    def get_request_key(data):
+        """ Returns the smallest id of a request or reply (single or batch)"""
+        if isinstance(data, dict):
+            return data.get("id")
+        elif isinstance(data, list):
+            ids = [d.get("id") for d in data if isinstance(d, dict) and d.get("id") is not None]
+            if len(ids) > 0:
+                return min(ids)
+        return None
+
+    def _run(self):
+        """ Reader thread loop"""
+        while True:
+            try:
+                reply = self.ws.recv()
+            except WebSocketTimeoutException:
+                if self.closed:
+                    return
+                # every caller waits with its own timeout
+                continue
+            except Exception as e:
+                if not self.closed:
+                    self._set_error(e)
+                return
+            try:
+                key = self.get_request_key(json.loads(reply, strict=False))
+            except ValueError:
+                key = None
+            with self.pending_lock:
+                if key is None and len(self.pending) == 1:
+                    # e.g. error replies without id
+                    key = list(self.pending.keys())[0]
+                waiting = self.pending.pop(key, None)
+            if waiting is None:
+                # e.g. a late reply to a request which has timed out
+                log.warning("Dropped websocket reply for unknown request %s" % str(key))
+                continue
+            waiting[1] = reply
+            waiting[0].set()
+
+    def _set_error(self, e):
+        """ Stores the reader error and wakes up all waiting callers"""
+        with self.pending_lock:
+            self.error = e
+            pending = list(self.pending.values())
+            self.pending = {}
+        for waiting in pending:
+            waiting[0].set()
+
+    def close(self):
+        """ Stops the reader thread, waiting callers receive an error.
+            The websocket itself has to be closed by the caller.
+        """
+        self.closed = True
+        self._set_error(WebSocketConnectionClosedException("Websocket multiplexer was closed"))
+
+    def send(self, payload):
+        """ Sends the payload and returns the reply to it
+
+            :param bytes payload: json encoded single or batch request
+
+            Raises a ValueError, when a request with the same id is still
+            waiting for its reply.
+        """
+        key = self.get_request_key(json.loads(payload.decode("utf8") if isinstance(payload, bytes) else payload))
+        waiting = [threading.Event(), None]
+        with self.pending_lock:
+            if self.error is not None:
+                raise self.error
+            if key in self.pending:
+                raise ValueError("A request with id %s is already pending" % str(key))
+            self.pending[key] = waiting
+        try:
+            with self.send_lock:
+                self.ws.send(payload)
+        except Exception:
+            with self.pending_lock:
+                self.pending.pop(key, None)
+            raise
+        if not waiting[0].wait(self.timeout):
+            with self.pending_lock:
+                self.pending.pop(key, None)
+            raise WebSocketTimeoutException("No reply for request %s within %s s" % (str(key), str(self.timeout)))
+        if waiting[1] is None:
+            raise self.error
+        return waiting[1]
+
+
 class GrapheneRPC(object):
     """
     This class allows to call API methods synchronously, without callbacks.
@@ -100,6 +227,22 @@ class GrapheneRPC(object):
     :param bool use_condenser: Use the old condenser_api rpc protocol on nodes with version
         0.19.4 or higher. The settings has no effect on nodes with version of 0.19.3 or lower.
     :param dict custom_chains: custom chain which should be added to the known chains
+    :param int pool_maxsize: When set, a session with its own connection pool and up to
+        ``pool_maxsize`` keep-alive connections per node is used instead of the shared
+        session (default is None)
+    :param int max_batch_size: maximum number of calls which are sent in one json-rpc
+        batch request by :func:`batch` (default is 50)
+    :param bool latency_aware: When True, the node with the lowest latency and error rate
+        EWMAs and the smallest head block lag is used, instead of the next node in the list.
+        The node is switched when another node answers ``switch_factor`` times faster
+        (default is False)
+    :param float switch_factor: see ``latency_aware`` (default is 2)
+    :param float hedge_percentile: When set (e.g. 0.9), a http request which has not been
+        answered within this percentile of the last answer times of the node is sent
+        additionally to the best other node (default is None)
+    :param bool ws_multiplex: When True, websocket requests from several threads are sent
+        concurrently over one websocket and the replies are matched by their id
+        (see :class:`WebsocketMultiplexer`) (default is False)
 
     Available APIs:
 
@@ -141,16 +284,25 @@ class GrapheneRPC(object):
                 if c not in self.known_chains:
                     self.known_chains[c] = custom_chain[c]
 
-        self.nodes = Nodes(urls, num_retries, num_retries_call)
+        self.nodes = Nodes(urls, num_retries, num_retries_call, latency_aware=kwargs.get("latency_aware", False))
+        self.hedge_percentile = kwargs.get("hedge_percentile", None)
+        self.switch_factor = kwargs.get("switch_factor", 2.)
         if self.nodes.working_nodes_count == 0:
             self.current_rpc = self.rpc_methods["offline"]
 
+        self.pool_maxsize = kwargs.get("pool_maxsize", None)
+        self.max_batch_size = kwargs.get("max_batch_size", 50)
+        self.ws_multiplex = kwargs.get("ws_multiplex", False)
+        self.ws_multiplexer = None
         self.user = user
         self.password = password
         self.ws = None
         self.url = None
         self.session = None
         self.rpc_queue = []
+        self._request_id_lock = threading.Lock()
+        self._ws_lock = threading.Lock()
+        self._connecting = False
         if kwargs.get("autoconnect", True):
             self.rpcconnect()
 
@@ -172,8 +324,9 @@ class GrapheneRPC(object):
 
     def get_request_id(self):
         """Get request id."""
-        self._request_id += 1
-        return self._request_id
+        with self._request_id_lock:
+            self._request_id += 1
+            return self._request_id
 
     def next(self):
         """Switches to the next node url"""
@@ -196,8 +349,22 @@ class GrapheneRPC(object):
         """Connect to next url in a loop."""
         if self.nodes.working_nodes_count == 0:
             return
+        connecting = self._connecting
+        self._connecting = True
+        try:
+            self._rpcconnect(next_url=next_url)
+        finally:
+            self._connecting = connecting
+
+    def _rpcconnect(self, next_url=True):
         while True:
             if next_url:
+                if self.ws is not None:
+                    # stop the reader thread and close the old websocket
+                    try:
+                        self.rpcclose()
+                    except Exception as e:
+                        log.warning(str(e))
                 self.url = next(self.nodes)
                 self.nodes.reset_error_cnt_call()
                 log.debug("Trying to connect to node %s" % self.url)
@@ -211,13 +378,22 @@ class GrapheneRPC(object):
                     self.current_rpc = self.rpc_methods["ws"]
                 else:
                     self.ws = None
-                    self.session = shared_session_instance()
+                    self.ws_multiplexer = None
+                    if self.pool_maxsize is None:
+                        self.session = shared_session_instance()
+                    elif self.session is None or self.session is SessionInstance.instance:
+                        self.session = create_session(pool_connections=max(len(self.nodes), 1),
+                                                      pool_maxsize=self.pool_maxsize)
                     self.current_rpc = self.rpc_methods["jsonrpc"]
                     self.headers = {'User-Agent': 'beem v%s' % (beem_version),
                                     'content-type': 'application/json; charset=utf-8'}
             try:
                 if self.ws:
                     self.ws.connect(self.url)
+                    if self.ws_multiplex:
+                        self.ws_multiplexer = WebsocketMultiplexer(self.ws, timeout=self.timeout)
+                    else:
+                        self.ws_multiplexer = None
                     self.rpclogin(self.user, self.password)
                 if self.disable_chain_detection:
                     # Set to appbase rpc format
@@ -247,6 +423,7 @@ class GrapheneRPC(object):
                         self.current_rpc = self.rpc_methods["wsappbase"]
                     else:
                         self.current_rpc = self.rpc_methods["appbase"]
+                self.nodes.node.rpc_method = self.current_rpc
                 break
             except KeyboardInterrupt:
                 raise
@@ -265,18 +442,23 @@ class GrapheneRPC(object):
         """Close Websocket"""
         if self.ws is None:
             return
+        if self.ws_multiplexer is not None:
+            self.ws_multiplexer.close()
+            self.ws_multiplexer = None
         # if self.ws.connected:
         self.ws.close()
 
-    def request_send(self, payload):
+    def request_send(self, payload, url=None):
+        if url is None:
+            url = self.url
         if self.user is not None and self.password is not None:
-            response = self.session.post(self.url,
+            response = self.session.post(url,
                                          data=payload,
                                          headers=self.headers,
                                          timeout=self.timeout,
                                          auth=(self.user, self.password))
         else:
-            response = self.session.post(self.url,
+            response = self.session.post(url,
                                          data=payload,
                                          headers=self.headers,
                                          timeout=self.timeout)
@@ -284,11 +466,61 @@ class GrapheneRPC(object):
             raise UnauthorizedError
         return response
 
+    def hedged_request_send(self, payload):
+        """ Sends the payload to the current node. When there is no answer
+            within the ``hedge_percentile`` answer time of the node, the payload
+            is sent additionally to the best other node with the same rpc format.
+            The first successful answer is returned and its answer time is
+            added to the latency of the node which has answered.
+        """
+        delay = self.nodes.get_hedge_delay(self.hedge_percentile)
+        index = self.nodes.get_best_node_index(exclude_current=True, rpc_method=self.current_rpc)
+        if delay is None or index is None:
+            start = time.time()
+            response = self.request_send(payload)
+            self.nodes.update_latency(time.time() - start)
+            return response
+        answers = Queue()
+
+        def send(node):
+            start = time.time()
+            try:
+                response = self.request_send(payload, url=node.url)
+            except Exception as e:
+                answers.put((node, None, e))
+                return
+            self.nodes.update_latency(time.time() - start, node=node)
+            answers.put((node, response, None))
+
+        thread = threading.Thread(target=send, args=(self.nodes.node, ))
+        thread.daemon = True
+        thread.start()
+        try:
+            node, response, error = answers.get(timeout=delay)
+        except Empty:
+            hedge_node = self.nodes[index]
+            log.debug("Sending hedged request to %s" % hedge_node.url)
+            thread = threading.Thread(target=send, args=(hedge_node, ))
+            thread.daemon = True
+            thread.start()
+            node, response, error = answers.get()
+            if error is not None:
+                node, response, error = answers.get()
+        if error is not None:
+            raise error
+        if node.url != self.url:
+            log.debug("Hedged request to %s answered first" % node.url)
+        return response
+
     def ws_send(self, payload):
         if self.ws is None:
             raise RPCConnection("No websocket available!")
-        self.ws.send(payload)
-        reply = self.ws.recv()
+        if self.ws_multiplexer is not None:
+            return self.ws_multiplexer.send(payload)
+        # send and recv have to be paired, when the rpc is used from several threads
+        with self._ws_lock:
+            self.ws.send(payload)
+            reply = self.ws.recv()
         return reply
 
     def version_string_to_int(self, network_version):
@@ -371,6 +603,10 @@ class GrapheneRPC(object):
             raise WorkingNodeMissing
         if self.url is None:
             raise RPCConnection("RPC is not connected!")
+        if not self._connecting and self.nodes.should_switch(self.switch_factor):
+            # not while connecting, as rpcconnect itself sends calls
+            log.debug("Switching from %s to a faster node" % self.url)
+            self.next()
         reply = {}
         response = None
         while True:
@@ -378,8 +614,15 @@ class GrapheneRPC(object):
             try:
                 if self.current_rpc == self.rpc_methods['ws'] or \
                    self.current_rpc == self.rpc_methods['wsappbase']:
+                    start = time.time()
                     reply = self.ws_send(json.dumps(payload, ensure_ascii=False).encode('utf8'))
+                elif self.hedge_percentile is not None:
+                    # measures the latency of the answering node itself
+                    start = None
+                    response = self.hedged_request_send(json.dumps(payload, ensure_ascii=False).encode('utf8'))
+                    reply = response.text
                 else:
+                    start = time.time()
                     response = self.request_send(json.dumps(payload, ensure_ascii=False).encode('utf8'))
                     reply = response.text
                 if not bool(reply):
@@ -390,6 +633,8 @@ class GrapheneRPC(object):
                         self.nodes.sleep_and_check_retries("Empty Reply", sleep=False, call_retry=False)
                         self.rpcconnect()
                 else:
+                    if start is not None:
+                        self.nodes.update_latency(time.time() - start)
                     break
             except KeyboardInterrupt:
                 raise
@@ -433,6 +678,9 @@ class GrapheneRPC(object):
         else:
             if isinstance(ret, list):
                 ret_list = []
+                if all(isinstance(r, dict) and isinstance(r.get("id"), int) for r in ret):
+                    # batch replies may be returned in any order
+                    ret = sorted(ret, key=lambda r: r["id"])
                 for r in ret:
                     if isinstance(r, dict) and 'error' in r:
                         if 'detail' in r['error']:
@@ -447,6 +695,8 @@ class GrapheneRPC(object):
                 return ret_list
             elif isinstance(ret, dict) and "result" in ret:
                 self.nodes.reset_error_cnt_call()
+                if isinstance(ret["result"], dict) and "head_block_number" in ret["result"]:
+                    self.nodes.update_head_block(ret["result"]["head_block_number"])
                 return ret["result"]
             elif isinstance(ret, int):
                 raise RPCError("Client returned invalid format. Expected JSON! Output: %s" % (str(ret)))
@@ -455,6 +705,56 @@ class GrapheneRPC(object):
                 return ret
         return ret
 
+    def batch(self, calls, max_batch_size=None):
+        """ Sends calls as json-rpc batch requests and returns their results in order
+
+            :param list calls: list of ``(name, args)`` or ``(name, args, kwargs)`` tuples,
+                where ``args`` and ``kwargs`` are the arguments of the corresponding rpc
+                method call (e.g. ``("get_block", [{"block_num": 1}], {"api": "block"})``)
+            :param int max_batch_size: maximum number of calls per request
+                (default is ``self.max_batch_size``)
+
+            The calls are split into chunks of ``max_batch_size`` calls, every chunk
+            is sent as one request.
+
+            .. code-block:: python
+
+                from beemapi.graphenerpc import GrapheneRPC
+                rpc = GrapheneRPC("https://api.steemit.com")
+                blocks = rpc.batch([("get_block", [{"block_num": i}], {"api": "block"}) for i in range(1, 101)])
+
+        """
+        if max_batch_size is None:
+            max_batch_size = self.max_batch_size
+        if max_batch_size is None or max_batch_size < 1:
+            max_batch_size = len(calls)
+        queries = []
+        for call in calls:
+            name = call[0]
+            args = call[1] if len(call) > 1 else []
+            kwargs = call[2] if len(call) > 2 else {}
+            api_name = get_api_name(self.is_appbase_ready(), *args, **kwargs)
+            if self.is_appbase_ready() and self.use_condenser:
+                api_name = "condenser_api"
+            if (api_name is None):
+                api_name = 'database_api'
+            query = get_query(self.is_appbase_ready() and not self.use_condenser, self.get_request_id(), api_name, name, args)
+            if isinstance(query, list):
+                raise ValueError("%s: batch() supports one call per list entry only" % name)
+            queries.append(query)
+        results = []
+        for i in range(0, len(queries), max_batch_size):
+            chunk = queries[i:i + max_batch_size]
+            # The ids need to be ascending, as the replies are sorted by them
+            for query in chunk:
+                query["id"] = self.get_request_id()
+            ret = self.rpcexec(chunk)
+            if not isinstance(ret, list) or len(ret) != len(chunk):
+                raise RPCError("Batch request returned %s results instead of %d" % (
+                    str(len(ret)) if isinstance(ret, list) else "no", len(chunk)))
+            results.extend(ret)
+        return results
+
     # End of Deprecated methods
     ####################################################################
     def __getattr__(self, name):
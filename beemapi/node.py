@@ -8,6 +8,7 @@ import json
 import re
 import time
 import logging
+from collections import deque
 from .exceptions import (
     UnauthorizedError, RPCConnection, RPCError, NumRetriesReached, CallRetriesReached
 )
@@ -22,14 +23,55 @@ class Node(object):
         self.url = url
         self.error_cnt = 0
         self.error_cnt_call = 0
+        # EWMA of the answer time in seconds, None until the first answer
+        self.latency = None
+        # EWMA of the failed call ratio
+        self.error_rate = 0.
+        self.head_block = None
+        # rpc format of the node, known after the first connect
+        self.rpc_method = None
+        self.latencies = deque(maxlen=100)
+
+    def update_latency(self, latency, alpha=0.3):
+        """Adds an answer time (in seconds) to the latency and error rate EWMAs"""
+        if self.latency is None:
+            self.latency = latency
+        else:
+            self.latency = alpha * latency + (1. - alpha) * self.latency
+        self.error_rate = (1. - alpha) * self.error_rate
+        self.latencies.append(latency)
+
+    def update_error_rate(self, alpha=0.3):
+        """Adds a failed call to the error rate EWMA"""
+        self.error_rate = alpha + (1. - alpha) * self.error_rate
+
+    def latency_percentile(self, percentile=0.9):
+        """Returns the given percentile of the last answer times or None"""
+        if len(self.latencies) == 0:
+            return None
+        latencies = sorted(self.latencies)
+        return latencies[min(int(percentile * len(latencies)), len(latencies) - 1)]
 
     def __repr__(self):
         return self.url
 
 
 class Nodes(list):
-    """Stores Node URLs and error counts"""
-    def __init__(self, urls, num_retries, num_retries_call):
+    """Stores Node URLs and error counts
+
+        :param urls: Node URLs (list or string separated by "," or ";")
+        :param int num_retries: maximum number of reconnects to a node
+        :param int num_retries_call: maximum number of retries of a call
+        :param bool latency_aware: When True, the node with the best score
+            (see :func:`get_score`) is used instead of the next node in the list
+            (default is False)
+        :param float ewma_alpha: smoothing factor of the latency and error rate
+            EWMAs (default is 0.3)
+        :param float lag_penalty: added to the score for each block, a node is
+            behind the highest known head block (default is 3)
+
+    """
+    def __init__(self, urls, num_retries, num_retries_call, latency_aware=False, ewma_alpha=0.3, lag_penalty=3.):
         if isinstance(urls, str):
             url_list = re.split(r",|;", urls)
             if url_list is None:
@@ -47,6 +89,9 @@ class Nodes(list):
         self.num_retries_call = num_retries_call
         self.current_node_index = -1
         self.freeze_current_node = False
+        self.latency_aware = latency_aware
+        self.ewma_alpha = ewma_alpha
+        self.lag_penalty = lag_penalty
 
     def __iter__(self):
         return self
@@ -55,6 +100,12 @@ class Nodes(list):
         next_node_count = 0
         if self.freeze_current_node:
             return self.url
+        if self.latency_aware:
+            index = self.get_best_node_index(exclude_current=self.current_node_index >= 0)
+            if index is None:
+                raise StopIteration
+            self.current_node_index = index
+            return self.url
         while next_node_count == 0 and (self.num_retries < 0 or self.node.error_cnt < self.num_retries):
             self.current_node_index += 1
             if self.current_node_index >= self.working_nodes_count:
@@ -66,6 +117,99 @@ class Nodes(list):
 
     next = __next__  # Python 2
 
+    def is_working(self, index):
+        """Returns True when the node has not reached num_retries"""
+        return self.num_retries < 0 or self[index].error_cnt <= self.num_retries
+
+    @property
+    def max_head_block(self):
+        """Returns the highest head block reported by a node or None"""
+        head_blocks = [self[i].head_block for i in range(len(self)) if self[i].head_block is not None]
+        if len(head_blocks) == 0:
+            return None
+        return max(head_blocks)
+
+    def get_score(self, node, max_head_block=None):
+        """Returns the score of a node, lower is better.
+
+            The score is the latency EWMA in seconds, increased by the error
+            rate EWMA and by ``lag_penalty`` for each block the node is behind the
+            highest known head block. Nodes without measured latency have a
+            score of zero, so that they are tried first.
+        """
+        if node.latency is None:
+            return 0.
+        score = node.latency * (1. + 10. * node.error_rate)
+        if max_head_block is None:
+            max_head_block = self.max_head_block
+        if max_head_block is not None and node.head_block is not None:
+            score += (max_head_block - node.head_block) * self.lag_penalty
+        return score
+
+    def get_best_node_index(self, exclude_current=False, rpc_method=None, measured_only=False):
+        """Returns the index of the working node with the lowest score or None
+
+            :param bool exclude_current: When True, the current node is only
+                returned when it is the only working node
+            :param int rpc_method: When set, only nodes with this rpc format are used
+            :param bool measured_only: When True, nodes without measured latency
+                are skipped
+        """
+        best_index = None
+        best_score = None
+        max_head_block = self.max_head_block
+        for i in range(len(self)):
+            if not self.is_working(i):
+                continue
+            if rpc_method is not None and self[i].rpc_method != rpc_method:
+                continue
+            if exclude_current and i == self.current_node_index:
+                continue
+            if measured_only and self[i].latency is None:
+                continue
+            score = self.get_score(self[i], max_head_block=max_head_block)
+            if best_score is None or score < best_score:
+                best_index = i
+                best_score = score
+        if best_index is None and exclude_current and rpc_method is None and self.current_node_index >= 0 and \
+                self.is_working(self.current_node_index):
+            best_index = self.current_node_index
+        return best_index
+
+    def should_switch(self, switch_factor=2.):
+        """Returns True when another working node has a score which is
+            at least ``switch_factor`` times better than the current one.
+            Only nodes with measured latency are compared.
+        """
+        if not self.latency_aware or self.freeze_current_node or self.node.latency is None:
+            return False
+        index = self.get_best_node_index(exclude_current=True, measured_only=True)
+        if index is None or index == self.current_node_index:
+            return False
+        return self.get_score(self[index]) * switch_factor < self.get_score(self.node)
+
+    def get_hedge_delay(self, percentile=0.9):
+        """Returns the latency percentile of the current node, after which a
+            hedged request to a second node should be sent (or None)
+        """
+        if self.node is None:
+            return None
+        return self.node.latency_percentile(percentile)
+
+    def update_latency(self, latency, node=None):
+        """Adds an answer time (in seconds) of the current node (or ``node``)"""
+        if node is None:
+            node = self.node
+        if node is not None:
+            node.update_latency(latency, alpha=self.ewma_alpha)
+
+    def update_head_block(self, head_block, node=None):
+        """Stores the head block reported by the current node (or ``node``)"""
+        if node is None:
+            node = self.node
+        if node is not None:
+            node.head_block = head_block
+
     def export_working_nodes(self):
         nodes_list = []
         for i in range(len(self)):
@@ -129,6 +273,7 @@ class Nodes(list):
         """Increase node error count for current node"""
         if self.node is not None:
             self.node.error_cnt += 1
+            self.node.update_error_rate(alpha=self.ewma_alpha)
 
     def increase_error_cnt_call(self):
         """Increase call error count for current node"""
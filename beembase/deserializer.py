@@ -0,0 +1,552 @@
+# This Python file uses the following encoding: utf-8
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from beemgraphenebase.chains import known_chains
+from beemgraphenebase.deserializer import BinaryReader, DeserializationError
+from .operationids import ops, ops_wls
+
+default_prefix = "STM"
+
+_schemas = {}
+
+
+def _read_string(reader):
+    return reader.read_string()
+
+
+def _read_uint16(reader):
+    return reader.read_uint16()
+
+
+def _read_uint32(reader):
+    return reader.read_uint32()
+
+
+def _read_uint64(reader):
+    return reader.read_uint64()
+
+
+def _read_int16(reader):
+    return reader.read_int16()
+
+
+def _read_bool(reader):
+    return reader.read_bool()
+
+
+def _read_time(reader):
+    return reader.read_time()
+
+
+def _read_hex(reader):
+    return reader.read_hex()
+
+
+def _read_signature(reader):
+    return reader.read_signature()
+
+
+def _read_extensions(reader):
+    """ Extensions of operations and transactions (``future_extensions``)"""
+    return reader.read_array(lambda r: [r.read_varint(), {}])
+
+
+def _get_nais(prefix):
+    """ Returns a dict which maps asset symbols to their NAI"""
+    nais = {}
+    for chain in known_chains.values():
+        if chain["prefix"] != prefix:
+            continue
+        for asset in chain["chain_assets"]:
+            if asset["asset"] != asset["symbol"]:
+                nais.setdefault(asset["symbol"], asset["asset"])
+    return nais
+
+
+def format_amount(amount, precision, symbol):
+    """ Formats an integer amount like the legacy API, e.g. ``1.000 STEEM``"""
+    sign = "-" if amount < 0 else ""
+    amount = abs(amount)
+    if precision > 0:
+        factor = 10 ** precision
+        return "%s%d.%0*d %s" % (sign, amount // factor, precision, amount % factor, symbol)
+    return "%s%d %s" % (sign, amount, symbol)
+
+
+def _amount_reader(prefix, appbase):
+    nais = _get_nais(prefix)
+
+    def read_amount(reader):
+        amount = reader.read_int64()
+        precision = reader.read_uint8()
+        symbol = reader.read(7).rstrip(b"\x00").decode("ascii")
+        if appbase and symbol in nais:
+            return {"amount": str(amount), "precision": precision, "nai": nais[symbol]}
+        return format_amount(amount, precision, symbol)
+    return read_amount
+
+
+def _build_schema(prefix, appbase):
+    """ Returns the field readers of all operations, they are the inverse of
+        the operation classes in :mod:`beembase.operations`
+    """
+    read_amount = _amount_reader(prefix, appbase)
+
+    def read_public_key(reader):
+        return reader.read_public_key(prefix)
+
+    def read_permission(reader):
+        return reader.read_object([
+            ('weight_threshold', _read_uint32),
+            ('account_auths', lambda r: r.read_map(_read_string, _read_uint16)),
+            ('key_auths', lambda r: r.read_map(read_public_key, _read_uint16)),
+        ])
+
+    def read_optional_permission(reader):
+        return reader.read_optional(read_permission)
+
+    def read_exchange_rate(reader):
+        return reader.read_object([
+            ('base', read_amount),
+            ('quote', read_amount),
+        ])
+
+    if prefix == "WLS":
+        witness_props = [
+            ('account_creation_fee', read_amount),
+            ('maximum_block_size', _read_uint32),
+        ]
+        reward_fields = [
+            ('account', _read_string),
+            ('reward_steem', read_amount),
+            ('reward_vests', read_amount),
+        ]
+    else:
+        witness_props = [
+            ('account_creation_fee', read_amount),
+            ('maximum_block_size', _read_uint32),
+            ('sbd_interest_rate', _read_uint16),
+        ]
+        reward_fields = [
+            ('account', _read_string),
+            ('reward_steem', read_amount),
+            ('reward_sbd', read_amount),
+            ('reward_vests', read_amount),
+        ]
+
+    def read_beneficiary(reader):
+        return reader.read_object([
+            ('account', _read_string),
+            ('weight', _read_int16),
+        ])
+
+    def read_comment_option_extension(reader):
+        type_id = reader.read_varint()
+        if type_id != 0:
+            raise DeserializationError("Unknown CommentOptionExtension %d" % type_id)
+        value = {'beneficiaries': reader.read_array(read_beneficiary)}
+        if appbase:
+            return {"type": "comment_payout_beneficiaries", "value": value}
+        return [type_id, value]
+
+    social_actions = [
+        [
+            ('permlink', _read_string),
+            ('parent_author', _read_string),
+            ('parent_permlink', _read_string),
+            ('pod', lambda r: r.read_optional(_read_string)),
+            ('max_accepted_payout', lambda r: r.read_optional(read_amount)),
+            ('allow_replies', lambda r: r.read_optional(_read_bool)),
+            ('allow_votes', lambda r: r.read_optional(_read_bool)),
+            ('allow_curation_rewards', lambda r: r.read_optional(_read_bool)),
+            ('allow_friends', lambda r: r.read_optional(_read_bool)),
+            ('title', _read_string),
+            ('body', _read_string),
+            ('json_metadata', _read_string),
+        ],
+        [
+            ('permlink', _read_string),
+            ('title', lambda r: r.read_optional(_read_string)),
+            ('body', lambda r: r.read_optional(_read_string)),
+            ('json_metadata', lambda r: r.read_optional(_read_string)),
+        ],
+        [
+            ('permlink', _read_string),
+        ],
+    ]
+
+    def read_social_action(reader):
+        type_id = reader.read_varint()
+        if type_id >= len(social_actions):
+            raise DeserializationError("Unknown SocialAction %d" % type_id)
+        return [type_id, reader.read_object(social_actions[type_id])]
+
+    account_create = [
+        ('fee', read_amount),
+        ('creator', _read_string),
+        ('new_account_name', _read_string),
+        ('owner', read_permission),
+        ('active', read_permission),
+        ('posting', read_permission),
+        ('memo_key', read_public_key),
+        ('json_metadata', _read_string),
+    ]
+
+    return {
+        'vote': [
+            ('voter', _read_string),
+            ('author', _read_string),
+            ('permlink', _read_string),
+            ('weight', _read_int16),
+        ],
+        'comment': [
+            ('parent_author', _read_string),
+            ('parent_permlink', _read_string),
+            ('author', _read_string),
+            ('permlink', _read_string),
+            ('title', _read_string),
+            ('body', _read_string),
+            ('json_metadata', _read_string),
+        ],
+        'transfer': [
+            ('from', _read_string),
+            ('to', _read_string),
+            ('amount', read_amount),
+            ('memo', _read_string),
+        ],
+        'transfer_to_vesting': [
+            ('from', _read_string),
+            ('to', _read_string),
+            ('amount', read_amount),
+        ],
+        'withdraw_vesting': [
+            ('account', _read_string),
+            ('vesting_shares', read_amount),
+        ],
+        'limit_order_create': [
+            ('owner', _read_string),
+            ('orderid', _read_uint32),
+            ('amount_to_sell', read_amount),
+            ('min_to_receive', read_amount),
+            ('fill_or_kill', _read_bool),
+            ('expiration', _read_time),
+        ],
+        'limit_order_cancel': [
+            ('owner', _read_string),
+            ('orderid', _read_uint32),
+        ],
+        'feed_publish': [
+            ('publisher', _read_string),
+            ('exchange_rate', read_exchange_rate),
+        ],
+        'convert': [
+            ('owner', _read_string),
+            ('requestid', _read_uint32),
+            ('amount', read_amount),
+        ],
+        'account_create': account_create,
+        'account_update': [
+            ('account', _read_string),
+            ('owner', read_optional_permission),
+            ('active', read_optional_permission),
+            ('posting', read_optional_permission),
+            ('memo_key', read_public_key),
+            ('json_metadata', _read_string),
+        ],
+        'witness_update': [
+            ('owner', _read_string),
+            ('url', _read_string),
+            ('block_signing_key', read_public_key),
+            ('props', lambda r: r.read_object(witness_props)),
+            ('fee', read_amount),
+        ],
+        'account_witness_vote': [
+            ('account', _read_string),
+            ('witness', _read_string),
+            ('approve', _read_bool),
+        ],
+        'account_witness_proxy': [
+            ('account', _read_string),
+            ('proxy', _read_string),
+        ],
+        'custom': [
+            ('required_auths', lambda r: r.read_array(_read_string)),
+            ('id', _read_uint16),
+            ('data', _read_string),
+        ],
+        'delete_comment': [
+            ('author', _read_string),
+            ('permlink', _read_string),
+        ],
+        'custom_json': [
+            ('required_auths', lambda r: r.read_array(_read_string)),
+            ('required_posting_auths', lambda r: r.read_array(_read_string)),
+            ('id', _read_string),
+            ('json', _read_string),
+        ],
+        'comment_options': [
+            ('author', _read_string),
+            ('permlink', _read_string),
+            ('max_accepted_payout', read_amount),
+            ('percent_steem_dollars', _read_uint16),
+            ('allow_votes', _read_bool),
+            ('allow_curation_rewards', _read_bool),
+            ('extensions', lambda r: r.read_array(read_comment_option_extension)),
+        ],
+        'set_withdraw_vesting_route': [
+            ('from_account', _read_string),
+            ('to_account', _read_string),
+            ('percent', _read_uint16),
+            ('auto_vest', _read_bool),
+        ],
+        'limit_order_create2': [
+            ('owner', _read_string),
+            ('orderid', _read_uint32),
+            ('amount_to_sell', read_amount),
+            ('fill_or_kill', _read_bool),
+            ('exchange_rate', read_exchange_rate),
+            ('expiration', _read_time),
+        ],
+        'claim_account': [
+            ('creator', _read_string),
+            ('fee', read_amount),
+            ('extensions', _read_extensions),
+        ],
+        'create_claimed_account': [
+            ('creator', _read_string),
+            ('new_account_name', _read_string),
+            ('owner', read_permission),
+            ('active', read_permission),
+            ('posting', read_permission),
+            ('memo_key', read_public_key),
+            ('json_metadata', _read_string),
+            ('extensions', _read_extensions),
+        ],
+        'request_account_recovery': [
+            ('recovery_account', _read_string),
+            ('account_to_recover', _read_string),
+            ('new_owner_authority', read_permission),
+            ('extensions', _read_extensions),
+        ],
+        'recover_account': [
+            ('account_to_recover', _read_string),
+            ('new_owner_authority', read_permission),
+            ('recent_owner_authority', read_permission),
+            ('extensions', _read_extensions),
+        ],
+        'change_recovery_account': [
+            ('account_to_recover', _read_string),
+            ('new_recovery_account', _read_string),
+            ('extensions', _read_extensions),
+        ],
+        'escrow_transfer': [
+            ('from', _read_string),
+            ('to', _read_string),
+            ('agent', _read_string),
+            ('escrow_id', _read_uint32),
+            ('sbd_amount', read_amount),
+            ('steem_amount', read_amount),
+            ('fee', read_amount),
+            ('ratification_deadline', _read_time),
+            ('escrow_expiration', _read_time),
+            ('json_meta', _read_string),
+        ],
+        'escrow_dispute': [
+            ('from', _read_string),
+            ('to', _read_string),
+            ('who', _read_string),
+            ('escrow_id', _read_uint32),
+        ],
+        'escrow_release': [
+            ('from', _read_string),
+            ('to', _read_string),
+            ('who', _read_string),
+            ('escrow_id', _read_uint32),
+            ('sbd_amount', read_amount),
+            ('steem_amount', read_amount),
+        ],
+        'escrow_approve': [
+            ('from', _read_string),
+            ('to', _read_string),
+            ('agent', _read_string),
+            ('who', _read_string),
+            ('escrow_id', _read_uint32),
+            ('approve', _read_bool),
+        ],
+        'transfer_to_savings': [
+            ('from', _read_string),
+            ('to', _read_string),
+            ('amount', read_amount),
+            ('memo', _read_string),
+        ],
+        'transfer_from_savings': [
+            ('from', _read_string),
+            ('request_id', _read_uint32),
+            ('to', _read_string),
+            ('amount', read_amount),
+            ('memo', _read_string),
+        ],
+        'cancel_transfer_from_savings': [
+            ('from', _read_string),
+            ('request_id', _read_uint32),
+        ],
+        'custom_binary': [
+            ('id', _read_uint16),
+            ('data', _read_string),
+        ],
+        'decline_voting_rights': [
+            ('account', _read_string),
+            ('decline', _read_bool),
+        ],
+        'claim_reward_balance': reward_fields,
+        'delegate_vesting_shares': [
+            ('delegator', _read_string),
+            ('delegatee', _read_string),
+            ('vesting_shares', read_amount),
+        ],
+        'account_create_with_delegation': account_create[:1] + [('delegation', read_amount)] +
+        account_create[1:] + [('extensions', _read_extensions)],
+        'witness_set_properties': [
+            ('owner', _read_string),
+            ('props', lambda r: r.read_map(_read_string, _read_hex)),
+            ('extensions', _read_extensions),
+        ],
+        'account_update2': [
+            ('account', _read_string),
+            ('owner', read_optional_permission),
+            ('active', read_optional_permission),
+            ('posting', read_optional_permission),
+            ('memo_key', lambda r: r.read_optional(read_public_key)),
+            ('json_metadata', _read_string),
+            ('posting_json_metadata', _read_string),
+        ],
+        'create_proposal': [
+            ('creator', _read_string),
+            ('receiver', _read_string),
+            ('start_date', _read_time),
+            ('end_date', _read_time),
+            ('daily_pay', read_amount),
+            ('subject', _read_string),
+            ('permlink', _read_string),
+            ('extensions', _read_extensions),
+        ],
+        'update_proposal_votes': [
+            ('voter', _read_string),
+            ('proposal_ids', lambda r: r.read_array(_read_uint64)),
+            ('approve', _read_bool),
+            ('extensions', _read_extensions),
+        ],
+        'remove_proposal': [
+            ('proposal_owner', _read_string),
+            ('proposal_ids', lambda r: r.read_array(_read_uint64)),
+            ('extensions', _read_extensions),
+        ],
+        'social_action': [
+            ('account', _read_string),
+            ('action', read_social_action),
+        ],
+    }
+
+
+def get_schema(prefix=default_prefix, appbase=False):
+    """ Returns the field readers of all operations for the given prefix"""
+    key = (prefix, appbase)
+    if key not in _schemas:
+        _schemas[key] = _build_schema(prefix, appbase)
+    return _schemas[key]
+
+
+def read_operation(reader, prefix=default_prefix, appbase=False):
+    """ Reads a single operation from a
+        :class:`beemgraphenebase.deserializer.BinaryReader`
+    """
+    op_names = ops_wls if prefix == "WLS" else ops
+    op_id = reader.read_varint()
+    if op_id >= len(op_names):
+        raise DeserializationError("Unknown operation id %d" % op_id)
+    name = op_names[op_id]
+    fields = get_schema(prefix, appbase).get(name)
+    if fields is None:
+        raise NotImplementedError("Unimplemented Operation %s" % name)
+    value = reader.read_object(fields)
+    if appbase:
+        return {"type": name + "_operation", "value": value}
+    return [name, value]
+
+
+def read_transaction(reader, prefix=default_prefix, appbase=False):
+    """ Reads a signed transaction from a
+        :class:`beemgraphenebase.deserializer.BinaryReader`. An unsigned
+        transaction is returned with an empty signature list, when the data
+        ends after its extensions.
+    """
+    tx = {
+        "ref_block_num": reader.read_uint16(),
+        "ref_block_prefix": reader.read_uint32(),
+        "expiration": reader.read_time(),
+        "operations": reader.read_array(lambda r: read_operation(r, prefix=prefix, appbase=appbase)),
+        "extensions": _read_extensions(reader),
+    }
+    if reader.eof():
+        tx["signatures"] = []
+    else:
+        tx["signatures"] = reader.read_array(_read_signature)
+    return tx
+
+
+def deserialize_operation(data, prefix=default_prefix, appbase=False):
+    """ Decodes the wire format of one operation (see
+        :class:`beembase.objects.Operation`)
+
+        :param data: bytes or hex string
+        :param str prefix: public key prefix (default is ``STM``)
+        :param bool appbase: When True, the appbase format is returned
+            (operation type and asset NAI), otherwise the legacy format
+            (default is False)
+    """
+    reader = BinaryReader(data)
+    op = read_operation(reader, prefix=prefix, appbase=appbase)
+    if not reader.eof():
+        raise DeserializationError("%d unread bytes after the operation" % len(reader))
+    return op
+
+
+def deserialize_transaction(data, prefix=default_prefix, appbase=False):
+    """ Decodes the wire format of a (signed) transaction, e.g. the output
+        of ``get_transaction_hex`` or ``bytes(Signed_Transaction)``, into
+        the json structure returned by the API
+
+        :param data: bytes or hex string
+        :param str prefix: public key prefix (default is ``STM``)
+        :param bool appbase: When True, the appbase format is returned
+            (operation type and asset NAI), otherwise the legacy format
+            (default is False)
+
+        .. code-block:: python
+
+            from beembase.deserializer import deserialize_transaction
+            from beembase.signedtransactions import Signed_Transaction
+            tx = deserialize_transaction(bytes(signed_tx))
+            Signed_Transaction(**tx)  # serializes to the same bytes
+
+    """
+    reader = BinaryReader(data)
+    tx = read_transaction(reader, prefix=prefix, appbase=appbase)
+    if not reader.eof():
+        raise DeserializationError("%d unread bytes after the transaction" % len(reader))
+    return tx
+
+
+def iter_transactions(data, prefix=default_prefix, appbase=False):
+    """ Yields the transactions of a buffer of concatenated signed
+        transactions, e.g. of a transaction archive
+
+        :param data: bytes or hex string
+        :param str prefix: public key prefix (default is ``STM``)
+        :param bool appbase: return the appbase format (default is False)
+    """
+    reader = BinaryReader(data)
+    while not reader.eof():
+        yield read_transaction(reader, prefix=prefix, appbase=appbase)
@@ -8,6 +8,8 @@ from beemgraphenebase.py23 import py23_bytes, bytes_types
 from beemgraphenebase.base58 import base58encode, base58decode
 import sys
 import hashlib
+import threading
+from collections import OrderedDict
 from binascii import hexlify, unhexlify
 try:
     from Cryptodome.Cipher import AES
@@ -21,6 +23,17 @@ from .objects import Memo
 import struct
 default_prefix = "STM"
 
+""" Maximum number of shared secrets which are kept in memory """
+SHARED_SECRET_CACHE_SIZE = 1000
+_shared_secrets = OrderedDict()
+_shared_secrets_lock = threading.Lock()
+
+
+def clear_shared_secret_cache():
+    """ Removes all shared secrets from the cache"""
+    with _shared_secrets_lock:
+        _shared_secrets.clear()
+
 
 def get_shared_secret(priv, pub):
     """ Derive the share secret between ``priv`` and ``pub``
@@ -34,13 +47,31 @@ def get_shared_secret(priv, pub):
 
             Pub(Alice) * Priv(Bob) = Pub(Bob) * Priv(Alice)
 
+        The shared secrets of :class:`beemgraphenebase.account.PrivateKey`
+        objects are cached, the cache key is the public key of ``priv``
+        and ``pub``.
+
     """
+    cache_key = None
+    if isinstance(priv, PrivateKey):
+        cache_key = (repr(priv.pubkey), repr(pub))
+        with _shared_secrets_lock:
+            res_hex = _shared_secrets.pop(cache_key, None)
+            if res_hex is not None:
+                # move to the end, as it is the most recently used secret
+                _shared_secrets[cache_key] = res_hex
+                return res_hex
     pub_point = pub.point()
     priv_point = int(repr(priv), 16)
     res = pub_point * priv_point
     res_hex = '%032x' % res.x()
     # Zero padding
     res_hex = '0' * (64 - len(res_hex)) + res_hex
+    if cache_key is not None:
+        with _shared_secrets_lock:
+            _shared_secrets[cache_key] = res_hex
+            while len(_shared_secrets) > SHARED_SECRET_CACHE_SIZE:
+                _shared_secrets.popitem(last=False)
     return res_hex
 
 
@@ -186,17 +217,13 @@ def encode_memo(priv, pub, nonce, message, **kwargs):
     return "#" + base58encode(hexlify(py23_bytes(tx)).decode("ascii"))
 
 
-def decode_memo(priv, message):
-    """ Decode a message with a shared secret between Alice and Bob
+def extract_memo_data(message):
+    """ Returns the stored information from an encrypted memo
 
-        :param PrivateKey priv: Private Key (of Bob)
         :param base58encoded message: Encrypted Memo message
-        :return: Decrypted message
-        :rtype: str
-        :raise ValueError: if message cannot be decoded as valid UTF-8
-               string
+        :return: from_key, to_key, nonce, check and cipher
+        :rtype: tuple
     """
-    # decode structure
     raw = base58decode(message[1:])
     from_key = PublicKey(raw[:66])
     raw = raw[66:]
@@ -207,6 +234,21 @@ def decode_memo(priv, message):
     check = struct.unpack_from("<I", unhexlify(raw[:8]))[0]
     raw = raw[8:]
     cipher = raw
+    return from_key, to_key, nonce, check, cipher
+
+
+def decode_memo(priv, message):
+    """ Decode a message with a shared secret between Alice and Bob
+
+        :param PrivateKey priv: Private Key (of Bob)
+        :param base58encoded message: Encrypted Memo message
+        :return: Decrypted message
+        :rtype: str
+        :raise ValueError: if message cannot be decoded as valid UTF-8
+               string
+    """
+    # decode structure
+    from_key, to_key, nonce, check, cipher = extract_memo_data(message)
 
     if repr(to_key) == repr(priv.pubkey):
         shared_secret = get_shared_secret(priv, from_key)
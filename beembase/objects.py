@@ -13,12 +13,12 @@ from beemgraphenebase.types import (
     Varint32, Int64, String, Bytes, Void,
     Array, PointInTime, Signature, Bool,
     Set, Fixed_array, Optional, Static_variant,
-    Map, Id
+    Map, serialize, serialize_into, varint_into
 )
 from beemgraphenebase.objects import GrapheneObject, isArgsThisClass
 from .objecttypes import object_type
 from beemgraphenebase.account import PublicKey
-from beemgraphenebase.objects import Operation as GPHOperation
+from beemgraphenebase.objects import Operation as GPHOperation, get_operation_klass
 from beemgraphenebase.chains import known_chains
 from .operationids import operations, operations_wls
 import struct
@@ -90,10 +90,13 @@ class Amount(object):
             # self.str_repr = '{:.{}f} {}'.format((float(self.amount) / 10 ** self.precision), self.precision, self.asset)
 
     def __bytes__(self):
+        return serialize(self)
+
+    def serialize_into(self, buf):
         # padding
         symbol = self.symbol + "\x00" * (7 - len(self.symbol))
-        return (struct.pack("<q", int(self.amount)) + struct.pack("<b", self.precision) +
-                py23_bytes(symbol, "ascii"))
+        buf.extend(struct.pack("<qb", int(self.amount), self.precision))
+        buf.extend(py23_bytes(symbol, "ascii"))
 
     def __str__(self):
         # return json.dumps({"amount": self.amount, "precision": self.precision, "nai": self.asset})
@@ -107,30 +110,39 @@ class Operation(GPHOperation):
         self.prefix = kwargs.pop("prefix", default_prefix)
         super(Operation, self).__init__(*args, **kwargs)
 
+    @classmethod
+    def from_json(cls, op, prefix=default_prefix):
+        """ Creates an operation from the json format of the API. This is
+            faster than ``Operation(op)``, as the type checks of the
+            constructor are skipped and the operation class is taken from
+            the registry of the chain (see :func:`get_registry`).
+
+            :param op: ``[name, {...}]`` or ``{"type": "name_operation", "value": {...}}``
+            :param str prefix: chain prefix (default is ``STM``)
+        """
+        self = cls.__new__(cls)
+        self.prefix = prefix
+        self._load_json(op)
+        return self
+
     def _getklass(self, name):
-        module = __import__("beembase.operations", fromlist=["operations"])
-        class_ = getattr(module, name)
-        return class_
+        return get_operation_klass("beembase.operations", name)
 
     def operations(self):
         if self.prefix == "WLS":
             return operations_wls
         return operations
 
-    def getOperationNameForId(self, i):
-        """ Convert an operation id into the corresponding string
-        """
-        for key in self.operations():
-            if int(self.operations()[key]) is int(i):
-                return key
-        return "Unknown Operation ID %d" % i
-
     def json(self):
         return json.loads(str(self))
         # return json.loads(str(json.dumps([self.name, self.op.toJson()])))
 
     def __bytes__(self):
-        return py23_bytes(Id(self.opId)) + py23_bytes(self.op)
+        return serialize(self)
+
+    def serialize_into(self, buf):
+        varint_into(self.opId, buf)
+        serialize_into(self.op, buf)
 
     def __str__(self):
         if self.appbase:
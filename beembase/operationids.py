@@ -110,10 +110,14 @@ ops_wls = [
 operations_wls = {o: ops_wls.index(o) for o in ops_wls}
 
 
+#: Operation names for each id
+operation_names = {operations[o]: o for o in operations}
+
+
 def getOperationNameForId(i):
     """ Convert an operation id into the corresponding string
     """
-    for key in operations:
-        if int(operations[key]) is int(i):
-            return key
-    return "Unknown Operation ID %d" % i
+    name = operation_names.get(int(i))
+    if name is None:
+        return "Unknown Operation ID %d" % i
+    return name
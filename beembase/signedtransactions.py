@@ -5,6 +5,7 @@ from __future__ import unicode_literals
 from builtins import int, str
 from beemgraphenebase.signedtransactions import Signed_Transaction as GrapheneSigned_Transaction
 from .operations import Operation
+from .deserializer import deserialize_transaction
 from beemgraphenebase.chains import known_chains
 import logging
 log = logging.getLogger(__name__)
@@ -41,6 +42,17 @@ class Signed_Transaction(GrapheneSigned_Transaction):
     def verify(self, pubkeys=[], chain=u"STEEM", recover_parameter=False):
         return super(Signed_Transaction, self).verify(pubkeys, chain, recover_parameter)
 
+    @classmethod
+    def from_bytes(cls, data, prefix=u"STM"):
+        """ Creates a transaction from its wire format (e.g. from the
+            output of ``get_transaction_hex``)
+
+            :param data: bytes or hex string
+            :param str prefix: public key prefix (default is ``STM``)
+        """
+        tx = deserialize_transaction(data, prefix=prefix)
+        return cls(prefix=prefix, **tx)
+
     def getOperationKlass(self):
         return Operation
 
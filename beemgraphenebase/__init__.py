@@ -10,6 +10,7 @@ from .version import version as __version__
 __all__ = ['account',
            'base58',
            'bip38',
+           'deserializer',
            'transactions',
            'types',
            'ecdasig',
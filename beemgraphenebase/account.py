@@ -270,9 +270,21 @@ class PublicKey(Address):
         """
         self.prefix = prefix
         self._pk = Base58(pk, prefix=prefix)
-        self.address = Address(pubkey=pk, prefix=prefix)
         self.pubkey = self._pk
 
+    @property
+    def address(self):
+        """ :class:`Address` of the public key, created on first access"""
+        address = self.__dict__.get("_address_obj")
+        if address is None:
+            address = Address(pubkey=repr(self._pk), prefix=self.prefix)
+            self._address_obj = address
+        return address
+
+    @address.setter
+    def address(self, address):
+        self._address_obj = address
+
     def get_public_key(self):
         """Returns the pubkey"""
         return self.pubkey
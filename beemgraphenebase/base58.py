@@ -7,9 +7,11 @@ from builtins import object
 from builtins import chr
 from future.utils import python_2_unicode_compatible
 from binascii import hexlify, unhexlify
-from .py23 import py23_bytes, py23_chr, bytes_types, integer_types, string_types, text_type
+from .py23 import bytes_types, string_types, text_type
+from collections import OrderedDict
 import hashlib
 import string
+import threading
 import logging
 log = logging.getLogger(__name__)
 
@@ -124,45 +126,85 @@ class Base58(object):
 
 # https://github.com/tochev/python3-cryptocoins/raw/master/cryptocoins/base58.py
 BASE58_ALPHABET = b"123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+BASE58_CHARS = BASE58_ALPHABET.decode("ascii")
+BASE58_DIGITS = dict((c, i) for i, c in enumerate(BASE58_CHARS))
+# Ten base58 digits are converted at once, this reduces the number of
+# big integer operations by a factor of ten
+BASE58_CHUNK_DIGITS = 10
+BASE58_CHUNK = 58 ** BASE58_CHUNK_DIGITS
+
+""" Maximum number of entries in the checksum encode/decode caches """
+BASE58_CACHE_SIZE = 4096
+_encode_cache = OrderedDict()
+_decode_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def clear_base58_cache():
+    """ Removes all entries from the gphBase58CheckEncode/Decode caches"""
+    with _cache_lock:
+        _encode_cache.clear()
+        _decode_cache.clear()
+
+
+def _cache_get(cache, key):
+    with _cache_lock:
+        value = cache.pop(key, None)
+        if value is not None:
+            # move to the end, as it is the most recently used entry
+            cache[key] = value
+        return value
+
+
+def _cache_set(cache, key, value):
+    with _cache_lock:
+        cache[key] = value
+        while len(cache) > BASE58_CACHE_SIZE:
+            cache.popitem(last=False)
 
 
 def base58decode(base58_str):
-    base58_text = py23_bytes(base58_str, "ascii")
+    if isinstance(base58_str, bytes_types):
+        base58_str = base58_str.decode("ascii")
+    leading_zeroes_count = len(base58_str) - len(base58_str.lstrip(BASE58_CHARS[0]))
     n = 0
-    leading_zeroes_count = 0
-    for b in base58_text:
-        if isinstance(b, integer_types):
-            n = n * 58 + BASE58_ALPHABET.find(py23_chr(b))
-        else:
-            n = n * 58 + BASE58_ALPHABET.find(b)
-        if n == 0:
-            leading_zeroes_count += 1
-    res = bytearray()
-    while n >= 256:
-        div, mod = divmod(n, 256)
-        res.insert(0, mod)
-        n = div
-    else:
-        res.insert(0, n)
-    return hexlify(bytearray(1) * leading_zeroes_count + res).decode('ascii')
+    try:
+        for i in range(0, len(base58_str), BASE58_CHUNK_DIGITS):
+            chunk = base58_str[i:i + BASE58_CHUNK_DIGITS]
+            value = 0
+            for c in chunk:
+                value = value * 58 + BASE58_DIGITS[c]
+            n = n * 58 ** len(chunk) + value
+    except KeyError:
+        raise ValueError("Invalid base58 character in %s" % base58_str)
+    if n == 0:
+        # all characters are zeros, the zero itself is returned as extra byte
+        return "00" * (leading_zeroes_count + 1)
+    res = "%x" % n
+    if len(res) % 2:
+        res = "0" + res
+    return "00" * leading_zeroes_count + res
 
 
 def base58encode(hexstring):
-    byteseq = py23_bytes(unhexlify(py23_bytes(hexstring, 'ascii')))
-    n = 0
-    leading_zeroes_count = 0
-    for c in byteseq:
-        n = n * 256 + c
-        if n == 0:
-            leading_zeroes_count += 1
-    res = bytearray()
-    while n >= 58:
-        div, mod = divmod(n, 58)
-        res.insert(0, BASE58_ALPHABET[mod])
-        n = div
-    else:
-        res.insert(0, BASE58_ALPHABET[n])
-    return (BASE58_ALPHABET[0:1] * leading_zeroes_count + res).decode('ascii')
+    if isinstance(hexstring, bytes_types):
+        hexstring = hexstring.decode("ascii")
+    if len(hexstring) % 2:
+        raise ValueError("Odd-length hex string")
+    stripped = hexstring.lstrip("0")
+    leading_zeroes_count = (len(hexstring) - len(stripped)) // 2
+    if not stripped:
+        # all bytes are zeros, the zero itself is encoded as extra character
+        return BASE58_CHARS[0] * (leading_zeroes_count + 1)
+    n = int(stripped, 16)
+    res = []
+    while n > 0:
+        n, value = divmod(n, BASE58_CHUNK)
+        for i in range(BASE58_CHUNK_DIGITS):
+            value, mod = divmod(value, 58)
+            res.append(BASE58_CHARS[mod])
+    res = "".join(reversed(res)).lstrip(BASE58_CHARS[0])
+    return BASE58_CHARS[0] * leading_zeroes_count + res
 
 
 def ripemd160(s):
@@ -199,16 +241,33 @@ def base58CheckDecode(s):
     return dec[2:]
 
 
+def _is_cacheable(hexstring):
+    """ Public keys (33 bytes) and addresses (20 bytes) are cached, 32 byte
+        long data could be a private key and is never kept in the caches
+    """
+    return len(hexstring) != 64
+
+
 def gphBase58CheckEncode(s):
+    result = _cache_get(_encode_cache, s)
+    if result is not None:
+        return result
     checksum = ripemd160(s)[:4]
-    result = s + hexlify(checksum).decode('ascii')
-    return base58encode(result)
+    result = base58encode(s + hexlify(checksum).decode('ascii'))
+    if _is_cacheable(s):
+        _cache_set(_encode_cache, s, result)
+    return result
 
 
 def gphBase58CheckDecode(s):
-    s = unhexlify(base58decode(s))
-    dec = hexlify(s[:-4]).decode('ascii')
+    dec = _cache_get(_decode_cache, s)
+    if dec is not None:
+        return dec
+    raw = unhexlify(base58decode(s))
+    dec = hexlify(raw[:-4]).decode('ascii')
     checksum = ripemd160(dec)[:4]
-    if not (s[-4:] == checksum):
+    if not (raw[-4:] == checksum):
         raise AssertionError()
+    if _is_cacheable(dec):
+        _cache_set(_decode_cache, s, dec)
     return dec
@@ -0,0 +1,161 @@
+# This Python file uses the following encoding: utf-8
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from builtins import bytes
+from builtins import object
+from binascii import hexlify, unhexlify
+from datetime import datetime, timedelta
+import struct
+from .base58 import gphBase58CheckEncode
+from .py23 import string_types
+
+_uint8 = struct.Struct("<B")
+_int16 = struct.Struct("<h")
+_uint16 = struct.Struct("<H")
+_uint32 = struct.Struct("<I")
+_int64 = struct.Struct("<q")
+_uint64 = struct.Struct("<Q")
+
+timeformat = '%Y-%m-%dT%H:%M:%S'
+_epoch = datetime(1970, 1, 1)
+
+
+class DeserializationError(ValueError):
+    """ The data could not be decoded"""
+    pass
+
+
+class BinaryReader(object):
+    """ Reads the graphene wire format (see :mod:`beemgraphenebase.types`)
+        from a buffer. Every ``read_*`` method consumes its value and
+        returns the json representation used by the API.
+
+        :param data: bytes, bytearray or hex string
+        :param int pos: start position (default is 0)
+
+        .. code-block:: python
+
+            from beemgraphenebase.deserializer import BinaryReader
+            reader = BinaryReader("0a0003666f6f")
+            reader.read_uint16()  # 10
+            reader.read_string()  # 'foo'
+
+    """
+    def __init__(self, data, pos=0):
+        if isinstance(data, string_types):
+            data = unhexlify(data)
+        self.data = memoryview(bytes(data))
+        self.pos = pos
+
+    def __len__(self):
+        """ Returns the number of unread bytes"""
+        return len(self.data) - self.pos
+
+    def eof(self):
+        """ Returns True, when all bytes were read"""
+        return self.pos >= len(self.data)
+
+    def read(self, length):
+        """ Returns the next ``length`` bytes"""
+        end = self.pos + length
+        if length < 0 or end > len(self.data):
+            raise DeserializationError("Unexpected end of data at position %d" % self.pos)
+        value = self.data[self.pos:end].tobytes()
+        self.pos = end
+        return value
+
+    def _unpack(self, fmt):
+        end = self.pos + fmt.size
+        if end > len(self.data):
+            raise DeserializationError("Unexpected end of data at position %d" % self.pos)
+        value = fmt.unpack_from(self.data, self.pos)[0]
+        self.pos = end
+        return value
+
+    def read_uint8(self):
+        return self._unpack(_uint8)
+
+    def read_int16(self):
+        return self._unpack(_int16)
+
+    def read_uint16(self):
+        return self._unpack(_uint16)
+
+    def read_uint32(self):
+        return self._unpack(_uint32)
+
+    def read_uint64(self):
+        return self._unpack(_uint64)
+
+    def read_int64(self):
+        return self._unpack(_int64)
+
+    def read_bool(self):
+        return bool(self.read_uint8())
+
+    def read_varint(self):
+        shift = 0
+        result = 0
+        while True:
+            b = self.read_uint8()
+            result |= ((b & 0x7f) << shift)
+            if not (b & 0x80):
+                return result
+            shift += 7
+
+    def read_string(self):
+        """ Reads a :class:`beemgraphenebase.types.String`"""
+        return self.read(self.read_varint()).decode("utf-8")
+
+    def read_hex(self):
+        """ Reads a :class:`beemgraphenebase.types.Bytes` or
+            :class:`beemgraphenebase.types.HexString` as hex string
+        """
+        return hexlify(self.read(self.read_varint())).decode("ascii")
+
+    def read_time(self):
+        """ Reads a :class:`beemgraphenebase.types.PointInTime`"""
+        unixtime = self.read_uint32()
+        return (_epoch + timedelta(seconds=unixtime)).strftime(timeformat)
+
+    def read_public_key(self, prefix="STM"):
+        """ Reads a compressed public key (33 bytes)"""
+        return prefix + gphBase58CheckEncode(hexlify(self.read(33)).decode("ascii"))
+
+    def read_signature(self):
+        """ Reads a compact signature (65 bytes) as hex string"""
+        return hexlify(self.read(65)).decode("ascii")
+
+    def read_array(self, read_element):
+        """ Reads an :class:`beemgraphenebase.types.Array`, each element is
+            read by ``read_element(reader)``
+        """
+        return [read_element(self) for i in range(self.read_varint())]
+
+    def read_map(self, read_key, read_value):
+        """ Reads a :class:`beemgraphenebase.types.Map` as list of pairs"""
+        return [[read_key(self), read_value(self)] for i in range(self.read_varint())]
+
+    def read_optional(self, read_value):
+        """ Reads an :class:`beemgraphenebase.types.Optional`, returns None
+            when it is empty
+        """
+        if self.read_uint8():
+            return read_value(self)
+        return None
+
+    def read_object(self, fields):
+        """ Reads a :class:`beemgraphenebase.objects.GrapheneObject`
+
+            :param list fields: list of ``(name, read_value)`` tuples in
+                wire order. Empty optional fields are not returned.
+        """
+        result = {}
+        for name, read_value in fields:
+            value = read_value(self)
+            if value is not None:
+                result[name] = value
+        return result
+
@@ -12,31 +12,38 @@ import hashlib
 from binascii import hexlify, unhexlify
 import struct
 import logging
+import threading
+from collections import OrderedDict
 from .account import PrivateKey, PublicKey
+from .base58 import Base58
 from .py23 import py23_bytes, bytes_types
 log = logging.getLogger(__name__)
 
 SECP256K1_MODULE = None
-SECP256K1_AVAILABLE = False
-CRYPTOGRAPHY_AVAILABLE = False
-GMPY2_MODULE = False
-if not SECP256K1_MODULE:
+_BACKEND_LOADED = False
+# CRYPTOGRAPHY_AVAILABLE and SECP256K1_AVAILABLE are set by load_backend()
+
+
+def load_backend():
+    """ Imports the secp256k1 backends and selects the fastest available one,
+        when SECP256K1_MODULE was not set before. This is done on first use,
+        so that importing this module does not import the backends.
+    """
+    global _BACKEND_LOADED, SECP256K1_MODULE, SECP256K1_AVAILABLE, CRYPTOGRAPHY_AVAILABLE
+    global secp256k1, default_backend, hashes, ec, decode_dss_signature, encode_dss_signature, InvalidSignature
+    if _BACKEND_LOADED:
+        return
+    SECP256K1_AVAILABLE = False
+    CRYPTOGRAPHY_AVAILABLE = False
     try:
         import secp256k1prp as secp256k1
-        SECP256K1_MODULE = "secp256k1"
         SECP256K1_AVAILABLE = True
     except:
         try:
             import secp256k1
-            SECP256K1_MODULE = "secp256k1"
             SECP256K1_AVAILABLE = True
         except ImportError:
-            try:
-                import cryptography
-                SECP256K1_MODULE = "cryptography"
-                CRYPTOGRAPHY_AVAILABLE = True
-            except ImportError:
-                SECP256K1_MODULE = "ecdsa"
+            pass
 
     try:
         from cryptography.hazmat.backends import default_backend
@@ -50,7 +57,26 @@ if not SECP256K1_MODULE:
         CRYPTOGRAPHY_AVAILABLE = False
         log.debug("Cryptography not available")
 
-log.debug("Using SECP256K1 module: %s" % SECP256K1_MODULE)
+    if not SECP256K1_MODULE:
+        if SECP256K1_AVAILABLE:
+            SECP256K1_MODULE = "secp256k1"
+        elif CRYPTOGRAPHY_AVAILABLE:
+            SECP256K1_MODULE = "cryptography"
+        else:
+            SECP256K1_MODULE = "ecdsa"
+    _BACKEND_LOADED = True
+    log.debug("Using SECP256K1 module: %s" % SECP256K1_MODULE)
+
+
+if sys.version_info < (3, 7):
+    # module level __getattr__ is not supported
+    load_backend()
+else:
+    def __getattr__(name):
+        if name in ["SECP256K1_AVAILABLE", "CRYPTOGRAPHY_AVAILABLE"]:
+            load_backend()
+            return globals()[name]
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
 
 
 def _is_canonical(sig):
@@ -62,6 +88,7 @@ def _is_canonical(sig):
 
 
 def compressedPubkey(pk):
+    load_backend()
     if SECP256K1_MODULE == "cryptography" and not isinstance(pk, ecdsa.keys.VerifyingKey):
         order = ecdsa.SECP256k1.order
         x = pk.public_numbers().x
@@ -78,6 +105,7 @@ def compressedPubkey(pk):
 def recover_public_key(digest, signature, i, message=None):
     """ Recover the public key from the the signature
     """
+    load_backend()
 
     # See http: //www.secg.org/download/aid-780/sec1-v2.pdf section 4.1.6 primarily
     curve = ecdsa.SECP256k1.curve
@@ -93,7 +121,11 @@ def recover_public_key(digest, signature, i, message=None):
     beta = ecdsa.numbertheory.square_root_mod_prime(alpha, curve.p())
     y = beta if (beta - yp) % 2 == 0 else curve.p() - beta
     # 1.4 Constructor of Point is supposed to check if nR is at infinity.
-    R = ecdsa.ellipticcurve.Point(curve, x, y, order)
+    if hasattr(ecdsa.ellipticcurve, "PointJacobi"):
+        # much faster point multiplication (ecdsa >= 0.14)
+        R = ecdsa.ellipticcurve.PointJacobi(curve, x, y, 1, order)
+    else:
+        R = ecdsa.ellipticcurve.Point(curve, x, y, order)
     # 1.5 Compute e
     e = ecdsa.util.string_to_number(digest)
     # 1.6 Compute Q = r^-1(sR - eG)
@@ -103,20 +135,22 @@ def recover_public_key(digest, signature, i, message=None):
         if not isinstance(message, bytes_types):
             message = py23_bytes(message, "utf-8")
         sigder = encode_dss_signature(r, s)
-        public_key = ec.EllipticCurvePublicNumbers(Q._Point__x, Q._Point__y, ec.SECP256K1()).public_key(default_backend())
+        public_key = ec.EllipticCurvePublicNumbers(Q.x(), Q.y(), ec.SECP256K1()).public_key(default_backend())
         public_key.verify(sigder, message, ec.ECDSA(hashes.SHA256()))
         return public_key
     else:
         # Not strictly necessary, but let's verify the message for paranoia's sake.
-        if not ecdsa.VerifyingKey.from_public_point(Q, curve=ecdsa.SECP256k1).verify_digest(signature, digest, sigdecode=ecdsa.util.sigdecode_string):
+        p = ecdsa.VerifyingKey.from_public_point(Q, curve=ecdsa.SECP256k1)
+        if not p.verify_digest(signature, digest, sigdecode=ecdsa.util.sigdecode_string):
             return None
-        return ecdsa.VerifyingKey.from_public_point(Q, curve=ecdsa.SECP256k1)
+        return p
 
 
 def recoverPubkeyParameter(message, digest, signature, pubkey):
     """ Use to derive a number that allows to easily recover the
         public key from the signature
     """
+    load_backend()
     if not isinstance(message, bytes_types):
         message = py23_bytes(message, "utf-8")
     for i in range(0, 4):
@@ -145,120 +179,178 @@ def recoverPubkeyParameter(message, digest, signature, pubkey):
     return None
 
 
+class MessageSigner(object):
+    """ Signs messages with one private key. The key objects of the
+        secp256k1 backend are created once, so that signing many messages
+        with the same key is faster than calling :func:`sign_message`
+        for each message.
+
+        :param wif: Private key (wif, hex or :class:`beemgraphenebase.account.PrivateKey`)
+
+        .. code-block:: python
+
+            signer = MessageSigner("5KQwrPbwdL6PhXujxW37FSSQZ1JiwsST4cqQzDeyXtP79zkvFD3")
+            signatures = [signer.sign(message) for message in messages]
+
+    """
+    def __init__(self, wif):
+        load_backend()
+        self.module = SECP256K1_MODULE
+        if isinstance(wif, PrivateKey):
+            p = py23_bytes(wif)
+        else:
+            p = py23_bytes(Base58(wif))
+        if not len(p) == ecdsa.SECP256k1.baselen:
+            raise ValueError("{} != {}".format(len(p), ecdsa.SECP256k1.baselen))
+        if self.module == "secp256k1":
+            self.privkey = secp256k1.PrivateKey(p, raw=True)
+        elif self.module == "cryptography":
+            self.private_key = ec.derive_private_key(int(hexlify(p).decode("ascii"), 16), ec.SECP256K1(), default_backend())
+            self.public_key = self.private_key.public_key()
+        else:
+            self.sk = ecdsa.SigningKey.from_string(p, curve=ecdsa.SECP256k1)
+            self.vk = self.sk.get_verifying_key()
+
+    def sign(self, message, hashfn=hashlib.sha256):
+        """ Returns the compact signature of message
+
+            :param message: message (bytes or str)
+        """
+        if not isinstance(message, bytes_types):
+            message = py23_bytes(message, "utf-8")
+
+        digest = hashfn(message).digest()
+        if self.module == "secp256k1":
+            privkey = self.privkey
+            ndata = secp256k1.ffi.new("const int *ndata")
+            ndata[0] = 0
+            while True:
+                ndata[0] += 1
+                sig = secp256k1.ffi.new('secp256k1_ecdsa_recoverable_signature *')
+                signed = secp256k1.lib.secp256k1_ecdsa_sign_recoverable(
+                    privkey.ctx,
+                    sig,
+                    digest,
+                    privkey.private_key,
+                    secp256k1.ffi.NULL,
+                    ndata
+                )
+                if not signed == 1:
+                    raise AssertionError()
+                signature, i = privkey.ecdsa_recoverable_serialize(sig)
+                if _is_canonical(signature):
+                    i += 4   # compressed
+                    i += 27  # compact
+                    break
+        elif self.module == "cryptography":
+            cnt = 0
+            while True:
+                cnt += 1
+                if not cnt % 20:
+                    log.info("Still searching for a canonical signature. Tried %d times already!" % cnt)
+                order = ecdsa.SECP256k1.order
+                sigder = self.private_key.sign(message, ec.ECDSA(hashes.SHA256()))
+                r, s = decode_dss_signature(sigder)
+                signature = ecdsa.util.sigencode_string(r, s, order)
+                # Make sure signature is canonical!
+                #
+                sigder = bytearray(sigder)
+                lenR = sigder[3]
+                lenS = sigder[5 + lenR]
+                if lenR == 32 and lenS == 32:
+                    # Derive the recovery parameter
+                    #
+                    i = recoverPubkeyParameter(
+                        message, digest, signature, self.public_key)
+                    i += 4   # compressed
+                    i += 27  # compact
+                    break
+        else:
+            cnt = 0
+            sk = self.sk
+            while 1:
+                cnt += 1
+                if not cnt % 20:
+                    log.info("Still searching for a canonical signature. Tried %d times already!" % cnt)
+
+                # Deterministic k
+                #
+                k = ecdsa.rfc6979.generate_k(
+                    sk.curve.generator.order(),
+                    sk.privkey.secret_multiplier,
+                    hashlib.sha256,
+                    hashlib.sha256(
+                        digest +
+                        struct.pack("d", time.time())  # use the local time to randomize the signature
+                    ).digest())
+
+                # Sign message
+                #
+                sigder = sk.sign_digest(
+                    digest,
+                    sigencode=ecdsa.util.sigencode_der,
+                    k=k)
+
+                # Reformating of signature
+                #
+                r, s = ecdsa.util.sigdecode_der(sigder, sk.curve.generator.order())
+                signature = ecdsa.util.sigencode_string(r, s, sk.curve.generator.order())
+
+                # Make sure signature is canonical!
+                #
+                sigder = bytearray(sigder)
+                lenR = sigder[3]
+                lenS = sigder[5 + lenR]
+                if lenR == 32 and lenS == 32:
+                    # Derive the recovery parameter from R = k * G, which
+                    # is faster than recovering the public key up to four times
+                    #
+                    R = sk.curve.generator * k
+                    i = (R.y() & 1) + (2 if R.x() >= sk.curve.generator.order() else 0)
+                    i += 4   # compressed
+                    i += 27  # compact
+                    break
+
+        # pack signature
+        #
+        sigstr = struct.pack("<B", i)
+        sigstr += signature
+
+        return sigstr
+
+
 def sign_message(message, wif, hashfn=hashlib.sha256):
     """ Sign a digest with a wif key
 
         :param str wif: Private key in
     """
+    return MessageSigner(wif).sign(message, hashfn=hashfn)
 
-    if not isinstance(message, bytes_types):
-        message = py23_bytes(message, "utf-8")
 
-    digest = hashfn(message).digest()
-    priv_key = PrivateKey(wif)
-    if SECP256K1_MODULE == "secp256k1":
-        p = py23_bytes(priv_key)
-        ndata = secp256k1.ffi.new("const int *ndata")
-        ndata[0] = 0
-        while True:
-            ndata[0] += 1
-            privkey = secp256k1.PrivateKey(p, raw=True)
-            sig = secp256k1.ffi.new('secp256k1_ecdsa_recoverable_signature *')
-            signed = secp256k1.lib.secp256k1_ecdsa_sign_recoverable(
-                privkey.ctx,
-                sig,
-                digest,
-                privkey.private_key,
-                secp256k1.ffi.NULL,
-                ndata
-            )
-            if not signed == 1:
-                raise AssertionError()
-            signature, i = privkey.ecdsa_recoverable_serialize(sig)
-            if _is_canonical(signature):
-                i += 4   # compressed
-                i += 27  # compact
-                break
-    elif SECP256K1_MODULE == "cryptography":
-        cnt = 0
-        private_key = ec.derive_private_key(int(repr(priv_key), 16), ec.SECP256K1(), default_backend())
-        public_key = private_key.public_key()
-        while True:
-            cnt += 1
-            if not cnt % 20:
-                log.info("Still searching for a canonical signature. Tried %d times already!" % cnt)
-            order = ecdsa.SECP256k1.order
-            sigder = private_key.sign(message, ec.ECDSA(hashes.SHA256()))
-            r, s = decode_dss_signature(sigder)
-            signature = ecdsa.util.sigencode_string(r, s, order)
-            # Make sure signature is canonical!
-            #
-            sigder = bytearray(sigder)
-            lenR = sigder[3]
-            lenS = sigder[5 + lenR]
-            if lenR is 32 and lenS is 32:
-                # Derive the recovery parameter
-                #
-                i = recoverPubkeyParameter(
-                    message, digest, signature, public_key)
-                i += 4   # compressed
-                i += 27  # compact
-                break
-    else:
-        cnt = 0
-        p = py23_bytes(priv_key)
-        sk = ecdsa.SigningKey.from_string(p, curve=ecdsa.SECP256k1)
-        while 1:
-            cnt += 1
-            if not cnt % 20:
-                log.info("Still searching for a canonical signature. Tried %d times already!" % cnt)
-
-            # Deterministic k
-            #
-            k = ecdsa.rfc6979.generate_k(
-                sk.curve.generator.order(),
-                sk.privkey.secret_multiplier,
-                hashlib.sha256,
-                hashlib.sha256(
-                    digest +
-                    struct.pack("d", time.time())  # use the local time to randomize the signature
-                ).digest())
-
-            # Sign message
-            #
-            sigder = sk.sign_digest(
-                digest,
-                sigencode=ecdsa.util.sigencode_der,
-                k=k)
-
-            # Reformating of signature
-            #
-            r, s = ecdsa.util.sigdecode_der(sigder, sk.curve.generator.order())
-            signature = ecdsa.util.sigencode_string(r, s, sk.curve.generator.order())
-
-            # Make sure signature is canonical!
-            #
-            sigder = bytearray(sigder)
-            lenR = sigder[3]
-            lenS = sigder[5 + lenR]
-            if lenR is 32 and lenS is 32:
-                # Derive the recovery parameter
-                #
-                i = recoverPubkeyParameter(
-                    message, digest, signature, sk.get_verifying_key())
-                i += 4   # compressed
-                i += 27  # compact
-                break
+#: maximum number of public keys in the recovered key cache of :func:`verify_message`
+RECOVERED_KEY_CACHE_SIZE = 10000
+_recovered_keys = OrderedDict()
+_recovered_keys_lock = threading.Lock()
 
-    # pack signature
-    #
-    sigstr = struct.pack("<B", i)
-    sigstr += signature
 
-    return sigstr
+def clear_recovered_key_cache():
+    """ Removes all keys from the recovered key cache"""
+    with _recovered_keys_lock:
+        _recovered_keys.clear()
 
 
 def verify_message(message, signature, hashfn=hashlib.sha256, recover_parameter=None):
+    """ Verifies the signature of message and returns the recovered public
+        key (compressed, bytes). Recovered keys are cached by digest and
+        signature, so verifying the same signature again is cheap.
+
+        :param message: signed message
+        :param bytes signature: compact signature, the first byte contains the
+            recovery parameter
+        :param int recover_parameter: When set, it is used instead of the
+            recovery parameter of the signature
+    """
+    load_backend()
     if not isinstance(message, bytes_types):
         message = py23_bytes(message, "utf-8")
     if not isinstance(signature, bytes_types):
@@ -274,6 +366,13 @@ def verify_message(message, signature, hashfn=hashlib.sha256, recover_parameter=
     if recover_parameter < 0:
         log.info("Could not recover parameter")
         return None
+    cache_key = (digest, py23_bytes(signature), recover_parameter, SECP256K1_MODULE)
+    with _recovered_keys_lock:
+        phex = _recovered_keys.pop(cache_key, None)
+        if phex is not None:
+            # move to the end, as it is the most recently used key
+            _recovered_keys[cache_key] = phex
+            return phex
 
     if SECP256K1_MODULE == "secp256k1":
         ALL_FLAGS = secp256k1.lib.SECP256K1_CONTEXT_VERIFY | secp256k1.lib.SECP256K1_CONTEXT_SIGN
@@ -289,20 +388,18 @@ def verify_message(message, signature, hashfn=hashlib.sha256, recover_parameter=
         verifyPub.ecdsa_verify(message, normalSig)
         phex = verifyPub.serialize(compressed=True)
     elif SECP256K1_MODULE == "cryptography":
+        # The signature is verified by recover_public_key
         p = recover_public_key(digest, sig, recover_parameter, message)
-        order = ecdsa.SECP256k1.order
-        r, s = ecdsa.util.sigdecode_string(sig, order)
-        sigder = encode_dss_signature(r, s)
-        p.verify(sigder, message, ec.ECDSA(hashes.SHA256()))
         phex = compressedPubkey(p)
     else:
+        # The signature is verified by recover_public_key
         p = recover_public_key(digest, sig, recover_parameter)
-        # Will throw an exception of not valid
-        p.verify_digest(
-            sig,
-            digest,
-            sigdecode=ecdsa.util.sigdecode_string
-        )
+        if p is None:
+            raise ecdsa.BadSignatureError("Signature verification failed")
         phex = compressedPubkey(p)
 
+    with _recovered_keys_lock:
+        _recovered_keys[cache_key] = phex
+        while len(_recovered_keys) > RECOVERED_KEY_CACHE_SIZE:
+            _recovered_keys.popitem(last=False)
     return phex
@@ -6,57 +6,98 @@ from builtins import str
 from builtins import object
 from future.utils import python_2_unicode_compatible
 from collections import OrderedDict
+import importlib
 import json
+import sys
 from beemgraphenebase.types import (
     Uint8, Int16, Uint16, Uint32, Uint64,
     Varint32, Int64, String, Bytes, Void,
     Array, PointInTime, Signature, Bool,
     Set, Fixed_array, Optional, Static_variant,
-    Map, Id, JsonObj
+    Map, JsonObj, serialize, serialize_into, varint_into
 )
 from .py23 import py23_bytes, bytes_types, integer_types, string_types
 from .objecttypes import object_type
 from .operationids import operations
 
 
+# Operation registries, keyed by (operation class, id(operations))
+_operation_registries = {}
+
+
+def get_operation_klass(module_name, name):
+    """ Returns the operation class ``name`` of the module ``module_name``"""
+    module = sys.modules.get(module_name)
+    if module is None:
+        module = importlib.import_module(module_name)
+    return getattr(module, name)
+
+
 @python_2_unicode_compatible
 class Operation(object):
     def __init__(self, op):
-        if isinstance(op, list) and len(op) == 2:
-            if isinstance(op[0], integer_types):
-                self.opId = op[0]
-                name = self.getOperationNameForId(self.opId)
-            else:
-                self.opId = self.operations().get(op[0], None)
-                name = op[0]
-                if self.opId is None:
-                    raise ValueError("Unknown operation")
-            self.name = name[0].upper() + name[1:]  # klassname
+        if isinstance(op, (list, dict)):
+            self._load_json(op)
+        else:
+            self.op = op
+            self.name = type(self.op).__name__.lower()  # also store name
+            self.opId = self.operations()[self.name]
+
+    @classmethod
+    def from_json(cls, op):
+        """ Creates an operation from its json representation, either
+            ``[name, {...}]``, ``[id, {...}]`` or
+            ``{"type": "name_operation", "value": {...}}``
+        """
+        self = cls.__new__(cls)
+        self._load_json(op)
+        return self
+
+    def get_registry(self):
+        """ Returns a dict, which maps each operation name and id to a
+            ``(id, name, klassname, klass)`` tuple. The registry is created
+            once for each operations dict, ``klass`` is None for operations
+            without implementation.
+        """
+        operations = self.operations()
+        key = (type(self), id(operations))
+        cached = _operation_registries.get(key)
+        if cached is not None and cached[0] is operations and cached[1] == len(operations):
+            return cached[2]
+        registry = {}
+        for name in operations:
+            klassname = name[0].upper() + name[1:]
             try:
-                klass = self._getklass(self.name)
+                klass = self._getklass(klassname)
             except Exception:
-                raise NotImplementedError("Unimplemented Operation %s" % self.name)
-            self.op = klass(op[1])
+                klass = None
+            entry = (operations[name], name, klassname, klass)
+            registry[name] = entry
+            registry.setdefault(int(operations[name]), entry)
+        _operation_registries[key] = (operations, len(operations), registry)
+        return registry
+
+    def _load_json(self, op):
+        if isinstance(op, list) and len(op) == 2:
+            key, value = op
             self.appbase = False
         elif isinstance(op, dict):
-            if len(op["type"]) > 10 and op["type"][-9:] == "operation":
-                name = op["type"][:-10]
-            else:
-                name = op["type"]
-            self.opId = self.operations().get(name, None)
-            if self.opId is None:
-                raise ValueError("Unknown operation")
-            self.name = name[0].upper() + name[1:]  # klassname
-            try:
-                klass = self._getklass(self.name)
-            except Exception:
-                raise NotImplementedError("Unimplemented Operation %s" % self.name)
-            self.op = klass(op["value"])
+            key = op["type"]
+            if len(key) > 10 and key[-9:] == "operation":
+                key = key[:-10]
+            value = op["value"]
             self.appbase = True
         else:
-            self.op = op
-            self.name = type(self.op).__name__.lower()  # also store name
-            self.opId = self.operations()[self.name]
+            raise ValueError("Unknown operation")
+        entry = self.get_registry().get(key)
+        if entry is None:
+            if isinstance(key, integer_types):
+                raise NotImplementedError("Unimplemented Operation Unknown Operation ID %d" % key)
+            raise ValueError("Unknown operation")
+        self.opId, name, self.name, klass = entry
+        if klass is None:
+            raise NotImplementedError("Unimplemented Operation %s" % self.name)
+        self.op = klass(value)
 
     def operations(self):
         return operations
@@ -64,18 +105,20 @@ class Operation(object):
     def getOperationNameForId(self, i):
         """ Convert an operation id into the corresponding string
         """
-        for key in self.operations():
-            if int(self.operations()[key]) is int(i):
-                return key
-        return "Unknown Operation ID %d" % i
+        entry = self.get_registry().get(int(i))
+        if entry is None:
+            return "Unknown Operation ID %d" % i
+        return entry[1]
 
     def _getklass(self, name):
-        module = __import__("graphenebase.operations", fromlist=["operations"])
-        class_ = getattr(module, name)
-        return class_
+        return get_operation_klass("beemgraphenebase.operations", name)
 
     def __bytes__(self):
-        return py23_bytes(Id(self.opId)) + py23_bytes(self.op)
+        return serialize(self)
+
+    def serialize_into(self, buf):
+        varint_into(self.opId, buf)
+        serialize_into(self.op, buf)
 
     def __str__(self):
         return json.dumps([self.opId, self.op.toJson()])
@@ -89,6 +132,8 @@ class GrapheneObject(object):
 
         * ``instance.__json__()``: encodes data into json format
         * ``bytes(instance)``: encodes data into wire format
+        * ``instance.serialize_into(buf)``: appends the wire format to the
+          bytearray ``buf``
         * ``str(instances)``: dumps json object as string
 
     """
@@ -98,13 +143,17 @@ class GrapheneObject(object):
     def __bytes__(self):
         if self.data is None:
             return py23_bytes()
-        b = b""
-        for name, value in list(self.data.items()):
+        return serialize(self)
+
+    def serialize_into(self, buf):
+        """ Appends the wire format to the bytearray ``buf``"""
+        if self.data is None:
+            return
+        for value in self.data.values():
             if isinstance(value, string_types):
-                b += py23_bytes(value, 'utf-8')
+                buf.extend(py23_bytes(value, 'utf-8'))
             else:
-                b += py23_bytes(value)
-        return b
+                serialize_into(value, buf)
 
     def __json__(self):
         if self.data is None:
@@ -21,7 +21,7 @@ from .types import (
 from .objects import GrapheneObject, isArgsThisClass
 from .operations import Operation
 from .chains import known_chains
-from .ecdsasig import sign_message, verify_message
+from .ecdsasig import sign_message, verify_message, MessageSigner
 import logging
 log = logging.getLogger(__name__)
 
@@ -69,7 +69,9 @@ class Signed_Transaction(GrapheneObject):
             if "operations" in kwargs:
                 opklass = self.getOperationKlass()
                 if all([not isinstance(a, opklass) for a in kwargs["operations"]]):
-                    kwargs['operations'] = Array([opklass(a, prefix=prefix) for a in kwargs["operations"]])
+                    kwargs['operations'] = Array([
+                        opklass.from_json(a, prefix=prefix) if isinstance(a, (list, dict))
+                        else opklass(a, prefix=prefix) for a in kwargs["operations"]])
                 else:
                     kwargs['operations'] = Array(kwargs["operations"])
 
@@ -143,14 +145,22 @@ class Signed_Transaction(GrapheneObject):
         # Get message to sign
         #   bytes(self) will give the wire formated data according to
         #   GrapheneObject and the data given in __init__()
-        self.message = unhexlify(self.chainid) + py23_bytes(self)
+        buf = bytearray(unhexlify(self.chainid))
+        self.serialize_into(buf)
+        self.message = bytes(buf)
         self.digest = hashlib.sha256(self.message).digest()
 
         # restore signatures
         self.data["signatures"] = sigs
 
     def verify(self, pubkeys=[], chain=None, recover_parameter=False):
-        """Returned pubkeys have to be checked if they are existing"""
+        """Returned pubkeys have to be checked if they are existing
+
+            :param list pubkeys: public keys, whose signatures must be present
+            :param chain: identifier for the chain
+            :param bool recover_parameter: deprecated, the recovery parameter
+                is always read from the signature first
+        """
         if not chain:
             raise
         chain_params = self.getChainParams(chain)
@@ -159,28 +169,7 @@ class Signed_Transaction(GrapheneObject):
         pubKeysFound = []
 
         for signature in signatures:
-            if recover_parameter:
-                p = verify_message(
-                    self.message,
-                    py23_bytes(signature)
-                )
-            else:
-                p = None
-            if p is None:
-                for i in range(4):
-                    try:
-                        p = verify_message(
-                            self.message,
-                            py23_bytes(signature),
-                            recover_parameter=i
-                        )
-                        phex = hexlify(p).decode('ascii')
-                        pubKeysFound.append(phex)
-                    except Exception:
-                        p = None
-            else:
-                phex = hexlify(p).decode('ascii')
-                pubKeysFound.append(phex)
+            pubKeysFound.extend(_recover_pubkeys(self.message, py23_bytes(signature)))
 
         for pubkey in pubkeys:
             if not isinstance(pubkey, PublicKey):
@@ -211,8 +200,143 @@ class Signed_Transaction(GrapheneObject):
         # Sign the message with every private key given!
         sigs = []
         for wif in self.privkeys:
-            signature = sign_message(self.message, wif)
+            if isinstance(wif, MessageSigner):
+                signature = wif.sign(self.message)
+            else:
+                signature = sign_message(self.message, wif)
             sigs.append(Signature(signature))
 
         self.data["signatures"] = Array(sigs)
         return self
+
+
+_worker_signers = []
+
+
+def _init_sign_worker(wifkeys):
+    """ Creates the signers once in each worker process"""
+    global _worker_signers
+    _worker_signers = [MessageSigner(wif) for wif in wifkeys]
+
+
+def _sign_in_worker(message):
+    """ Signs message with all signers of the worker process"""
+    return [signer.sign(message) for signer in _worker_signers]
+
+
+def _recover_pubkeys(message, signature):
+    """ Returns the hex public keys which are recovered from a signature.
+        The recovery parameter is read from the signature header, all
+        four parameters are only tried when this fails.
+    """
+    try:
+        p = verify_message(message, signature)
+    except Exception:
+        p = None
+    if p is not None:
+        return [hexlify(p).decode('ascii')]
+    pubkeys = []
+    for i in range(4):
+        try:
+            p = verify_message(message, signature, recover_parameter=i)
+            pubkeys.append(hexlify(p).decode('ascii'))
+        except Exception:
+            pass
+    return pubkeys
+
+
+def _verify_signatures(message_and_signatures):
+    """ Returns the hex public keys of all valid signatures of a message"""
+    message, signatures = message_and_signatures
+    pubkeys = []
+    for signature in signatures:
+        pubkeys.extend(_recover_pubkeys(message, signature))
+    return pubkeys
+
+
+def verify_transactions(transactions, chain=None, processes=None):
+    """ Returns the recovered public keys (hex) of the signatures of each
+        transaction. Every signature is verified with the recovery
+        parameter from its header first, as in :func:`Signed_Transaction.verify`.
+
+        :param list transactions: list of :class:`Signed_Transaction` objects
+        :param chain: identifier for the chain (str or dict with chain params)
+        :param int processes: When set, the signatures are verified in a
+            process pool with this number of processes (default is None)
+
+        .. code-block:: python
+
+            from beem.block import Block
+            from beembase.signedtransactions import Signed_Transaction
+            from beemgraphenebase.signedtransactions import verify_transactions
+            block = Block(25000000)
+            txs = [Signed_Transaction(tx.copy()) for tx in block.json_transactions]
+            pubkeys = verify_transactions(txs, chain="STEEM", processes=4)
+
+    """
+    if not chain:
+        raise Exception("Chain needs to be provided!")
+    tasks = []
+    for tx in transactions:
+        tx.deriveDigest(chain)
+        tasks.append((tx.message, [py23_bytes(sig) for sig in tx.data["signatures"].data]))
+    if processes is not None and processes > 1 and len(tasks) > 1:
+        from multiprocessing import Pool
+        pool = Pool(processes)
+        try:
+            chunksize = max(1, len(tasks) // (processes * 4))
+            return pool.map(_verify_signatures, tasks, chunksize)
+        finally:
+            pool.close()
+            pool.join()
+    return [_verify_signatures(task) for task in tasks]
+
+
+def sign_transactions(transactions, wifkeys, chain=None, processes=None):
+    """ Signs many transactions with the same private keys. The key objects
+        are created only once for each key, instead of once for each signature.
+
+        :param list transactions: list of :class:`Signed_Transaction` objects
+        :param list wifkeys: private keys (wif) which sign every transaction
+        :param chain: identifier for the chain (str or dict with chain params)
+        :param int processes: When set, the transactions are signed in a
+            process pool with this number of processes (default is None)
+
+        Returns the list of the signed transactions.
+
+        .. code-block:: python
+
+            from beembase.signedtransactions import Signed_Transaction
+            from beemgraphenebase.signedtransactions import sign_transactions
+            txs = [Signed_Transaction(ref_block_num=..., ref_block_prefix=..., expiration=..., operations=[op])
+                   for op in ops]
+            sign_transactions(txs, [wif], chain="STEEM")
+
+    """
+    if not chain:
+        raise Exception("Chain needs to be provided!")
+    # Get Unique private keys
+    privkeys = []
+    [privkeys.append(str(item)) for item in wifkeys if str(item) not in privkeys]
+    messages = []
+    for tx in transactions:
+        tx.deriveDigest(chain)
+        tx.privkeys = privkeys
+        messages.append(tx.message)
+
+    if processes is not None and processes > 1 and len(transactions) > 1:
+        from multiprocessing import Pool
+        pool = Pool(processes, initializer=_init_sign_worker, initargs=(privkeys, ))
+        try:
+            chunksize = max(1, len(messages) // (processes * 4))
+            all_signatures = pool.map(_sign_in_worker, messages, chunksize)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        signers = [MessageSigner(wif) for wif in privkeys]
+        all_signatures = [[signer.sign(message) for signer in signers] for message in messages]
+
+    for tx, signatures in zip(transactions, all_signatures):
+        tx.data["signatures"] = Array([Signature(signature) for signature in signatures])
+    return transactions
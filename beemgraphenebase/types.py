@@ -24,15 +24,59 @@ from .py23 import py23_bytes
 
 timeformat = '%Y-%m-%dT%H:%M:%S%Z'
 
+_uint8 = struct.Struct("<B")
+_int16 = struct.Struct("<h")
+_uint16 = struct.Struct("<H")
+_int32 = struct.Struct("<i")
+_uint32 = struct.Struct("<I")
+_int64 = struct.Struct("<q")
+_uint64 = struct.Struct("<Q")
 
-def varint(n):
-    """Varint encoding."""
-    data = b''
+
+def serialize_into(value, buf):
+    """Appends the wire format of value to the bytearray buf.
+
+    Objects which implement ``serialize_into(buf)`` write directly into
+    buf, all other objects are converted with ``py23_bytes``.
+    """
+    method = getattr(value, "serialize_into", None)
+    if method is None:
+        buf.extend(py23_bytes(value))
+    else:
+        method(buf)
+
+
+def serialize(value):
+    """Returns the wire format of value, serialized into a single buffer."""
+    buf = bytearray()
+    serialize_into(value, buf)
+    return bytes(buf)
+
+
+def _unicodify_char(o):
+    """Returns the replacement of the control character with code o."""
+    if (o <= 7) or (o == 11) or (o > 13 and o < 32):
+        return "u%04x" % o
+    return {8: "b", 9: "\t", 10: "\n", 12: "f", 13: "\r"}[o]
+
+
+# Translation table for String.unicodify, only control characters are replaced
+_unicodify_table = dict((o, _unicodify_char(o)) for o in range(32))
+
+
+def varint_into(n, buf):
+    """Appends the varint encoding of n to the bytearray buf."""
     while n >= 0x80:
-        data += bytes([(n & 0x7f) | 0x80])
+        buf.append((n & 0x7f) | 0x80)
         n >>= 7
-    data += bytes([n])
-    return data
+    buf.append(n)
+
+
+def varint(n):
+    """Varint encoding."""
+    data = bytearray()
+    varint_into(n, data)
+    return bytes(data)
 
 
 def varintdecode(data):
@@ -67,7 +111,10 @@ class Uint8(object):
 
     def __bytes__(self):
         """Returns bytes."""
-        return struct.pack("<B", self.data)
+        return _uint8.pack(self.data)
+
+    def serialize_into(self, buf):
+        buf.extend(_uint8.pack(self.data))
 
     def __str__(self):
         """Returns str"""
@@ -84,7 +131,10 @@ class Int16(object):
 
     def __bytes__(self):
         """Returns bytes."""
-        return struct.pack("<h", int(self.data))
+        return _int16.pack(int(self.data))
+
+    def serialize_into(self, buf):
+        buf.extend(_int16.pack(int(self.data)))
 
     def __str__(self):
         return '%d' % self.data
@@ -97,7 +147,10 @@ class Uint16(object):
 
     def __bytes__(self):
         """Returns bytes."""
-        return struct.pack("<H", self.data)
+        return _uint16.pack(self.data)
+
+    def serialize_into(self, buf):
+        buf.extend(_uint16.pack(self.data))
 
     def __str__(self):
         return '%d' % self.data
@@ -110,7 +163,10 @@ class Uint32(object):
 
     def __bytes__(self):
         """Returns bytes."""
-        return struct.pack("<I", self.data)
+        return _uint32.pack(self.data)
+
+    def serialize_into(self, buf):
+        buf.extend(_uint32.pack(self.data))
 
     def __str__(self):
         """Returns data as string."""
@@ -124,7 +180,10 @@ class Uint64(object):
 
     def __bytes__(self):
         """Returns bytes."""
-        return struct.pack("<Q", self.data)
+        return _uint64.pack(self.data)
+
+    def serialize_into(self, buf):
+        buf.extend(_uint64.pack(self.data))
 
     def __str__(self):
         """Returns data as string."""
@@ -140,6 +199,9 @@ class Varint32(object):
         """Returns bytes."""
         return varint(self.data)
 
+    def serialize_into(self, buf):
+        varint_into(self.data, buf)
+
     def __str__(self):
         """Returns data as string."""
         return '%d' % self.data
@@ -152,7 +214,10 @@ class Int64(object):
 
     def __bytes__(self):
         """Returns bytes."""
-        return struct.pack("<q", self.data)
+        return _int64.pack(self.data)
+
+    def serialize_into(self, buf):
+        buf.extend(_int64.pack(self.data))
 
     def __str__(self):
         """Returns data as string."""
@@ -169,6 +234,11 @@ class HexString(object):
         d = bytes(unhexlify(bytes(self.data, 'ascii')))
         return varint(len(d)) + d
 
+    def serialize_into(self, buf):
+        d = unhexlify(bytes(self.data, 'ascii'))
+        varint_into(len(d), buf)
+        buf.extend(d)
+
     def __str__(self):
         """Returns data as string."""
         return '%s' % str(self.data)
@@ -184,29 +254,17 @@ class String(object):
         d = self.unicodify()
         return varint(len(d)) + d
 
+    def serialize_into(self, buf):
+        d = self.unicodify()
+        varint_into(len(d), buf)
+        buf.extend(d)
+
     def __str__(self):
         """Returns data as string."""
         return '%s' % str(self.data)
 
     def unicodify(self):
-        r = []
-        for s in self.data:
-            o = ord(s)
-            if (o <= 7) or (o == 11) or (o > 13 and o < 32):
-                r.append("u%04x" % o)
-            elif o == 8:
-                r.append("b")
-            elif o == 9:
-                r.append("\t")
-            elif o == 10:
-                r.append("\n")
-            elif o == 12:
-                r.append("f")
-            elif o == 13:
-                r.append("\r")
-            else:
-                r.append(s)
-        return bytes("".join(r), "utf-8")
+        return bytes(str(self.data).translate(_unicodify_table), "utf-8")
 
 
 @python_2_unicode_compatible
@@ -219,6 +277,11 @@ class Bytes(object):
         d = unhexlify(bytes(self.data, 'utf-8'))
         return varint(len(d)) + d
 
+    def serialize_into(self, buf):
+        d = unhexlify(bytes(self.data, 'utf-8'))
+        varint_into(len(d), buf)
+        buf.extend(d)
+
     def __str__(self):
         """Returns data as string."""
         return str(self.data)
@@ -233,6 +296,9 @@ class Void(object):
         """Returns bytes representation."""
         return b''
 
+    def serialize_into(self, buf):
+        pass
+
     def __str__(self):
         """Returns data as string."""
         return ""
@@ -246,7 +312,12 @@ class Array(object):
 
     def __bytes__(self):
         """Returns bytes representation."""
-        return py23_bytes(self.length) + b"".join([py23_bytes(a) for a in self.data])
+        return serialize(self)
+
+    def serialize_into(self, buf):
+        varint_into(len(self.data), buf)
+        for a in self.data:
+            serialize_into(a, buf)
 
     def __str__(self):
         """Returns data as string."""
@@ -276,8 +347,11 @@ class PointInTime(object):
         else:
             unixtime = timegm(time.strptime((self.data + "UTC"), timeformat.encode("utf-8")))
         if unixtime < 0:
-            return struct.pack("<i", unixtime)
-        return struct.pack("<I", unixtime)
+            return _int32.pack(unixtime)
+        return _uint32.pack(unixtime)
+
+    def serialize_into(self, buf):
+        buf.extend(self.__bytes__())
 
     def __str__(self):
         """Returns data as string."""
@@ -293,6 +367,9 @@ class Signature(object):
         """Returns bytes representation."""
         return self.data
 
+    def serialize_into(self, buf):
+        buf.extend(self.data)
+
     def __str__(self):
         """Returns data as string."""
         return json.dumps(hexlify(self.data).decode('ascii'))
@@ -313,18 +390,11 @@ class Set(Array):  # Set = Array
         super(Set, self).__init__(d)
 
 
-@python_2_unicode_compatible
-class Fixed_array(object):
-    def __init__(self, d):
-        raise NotImplementedError
-
-    def __bytes__(self):
-        """Returns bytes representation."""
-        raise NotImplementedError
-
-    def __str__(self):
-        """Returns data as string."""
-        raise NotImplementedError
+class Fixed_array(Array):
+    """ Array with a fixed length, the length is not serialized"""
+    def serialize_into(self, buf):
+        for a in self.data:
+            serialize_into(a, buf)
 
 
 @python_2_unicode_compatible
@@ -339,6 +409,17 @@ class Optional(object):
         else:
             return py23_bytes(Bool(1)) + py23_bytes(self.data) if py23_bytes(self.data) else py23_bytes(Bool(0))
 
+    def serialize_into(self, buf):
+        if not self.data:
+            buf.append(0)
+            return
+        pos = len(buf)
+        buf.append(1)
+        serialize_into(self.data, buf)
+        if len(buf) == pos + 1:
+            # the content is empty
+            buf[pos] = 0
+
     def __str__(self):
         """Returns data as string."""
         return str(self.data)
@@ -357,7 +438,11 @@ class Static_variant(object):
 
     def __bytes__(self):
         """Returns bytes representation."""
-        return varint(self.type_id) + py23_bytes(self.data)
+        return serialize(self)
+
+    def serialize_into(self, buf):
+        varint_into(self.type_id, buf)
+        serialize_into(self.data, buf)
 
     def __str__(self):
         """Returns data as string."""
@@ -371,11 +456,13 @@ class Map(object):
 
     def __bytes__(self):
         """Returns bytes representation."""
-        b = b""
-        b += varint(len(self.data))
+        return serialize(self)
+
+    def serialize_into(self, buf):
+        varint_into(len(self.data), buf)
         for e in self.data:
-            b += py23_bytes(e[0]) + py23_bytes(e[1])
-        return b
+            serialize_into(e[0], buf)
+            serialize_into(e[1], buf)
 
     def __str__(self):
         """Returns data as string."""
@@ -394,6 +481,9 @@ class Id(object):
         """Returns bytes representation."""
         return py23_bytes(self.data)
 
+    def serialize_into(self, buf):
+        self.data.serialize_into(buf)
+
     def __str__(self):
         """Returns data as string."""
         return str(self.data)
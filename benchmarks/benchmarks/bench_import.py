@@ -0,0 +1,24 @@
+# This Python file uses the following encoding: utf-8
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+
+class Benchmark(object):
+    goal_time = 1
+
+
+class Import(Benchmark):
+    """ Cold import times, every statement runs in a new interpreter"""
+    def timeraw_import_beem(self):
+        return "import beem"
+
+    def timeraw_import_amount(self):
+        return "from beem.amount import Amount"
+
+    def timeraw_import_steem(self):
+        return "from beem import Steem"
+
+    def timeraw_import_ecdsasig(self):
+        return "import beemgraphenebase.ecdsasig"
@@ -419,3 +419,60 @@ class Transaction(Benchmark):
 
         self.doit()
 
+
+class Serialize(Benchmark):
+    """ Serialization of a transaction with many operations, run with
+        ``asv continuous <old> <new> -b Serialize`` to compare two commits
+    """
+    def setup(self):
+        ops = []
+        for i in range(20):
+            ops.append(Operation(operations.Comment(**{
+                "parent_author": "foobara",
+                "parent_permlink": "foobarb",
+                "author": "foobarc",
+                "permlink": "foobard%d" % i,
+                "title": "foobare",
+                "body": "foobarf" * 300,
+                "json_metadata": {"foo": "bar"},
+                "prefix": u"STM"
+            })))
+        for i in range(50):
+            ops.append(Operation(operations.Vote(**{
+                "voter": "foobara",
+                "author": "foobarc",
+                "permlink": "foobard%d" % i,
+                "weight": 1000,
+                "prefix": u"STM"
+            })))
+        self.tx = Signed_Transaction(ref_block_num=34294,
+                                     ref_block_prefix=3707022213,
+                                     expiration="2016-04-06T08:29:27",
+                                     operations=ops)
+
+    def time_bytes(self):
+        py23_bytes(self.tx)
+
+    def time_deriveDigest(self):
+        self.tx.deriveDigest(u"STEEM")
+
+    def time_transaction_hex(self):
+        hexlify(py23_bytes(self.tx)).decode("ascii")
+
+
+class OperationLookup(Benchmark):
+    """ Creation of operations from their json representation"""
+    def setup(self):
+        self.ops = [["vote", {"voter": "foobara", "author": "foobarc", "permlink": "foobard", "weight": 1000}],
+                    [2, {"from": "foo", "to": "baar", "amount": "111.110 STEEM", "memo": "Fooo"}],
+                    {"type": "delete_comment_operation", "value": {"author": "turbot", "permlink": "testpost"}}]
+
+    def time_operation_init(self):
+        for i in range(100):
+            for op in self.ops:
+                Operation(op)
+
+    def time_operation_from_json(self):
+        for i in range(100):
+            for op in self.ops:
+                Operation.from_json(op)
@@ -0,0 +1,76 @@
+# This Python file uses the following encoding: utf-8
+""" Measures cold import times of beem and fails, when they regress.
+
+    Each statement is run several times in a new interpreter, the fastest
+    run is compared with its budget. Additionally, ``import beem`` must not
+    import any of the modules in ``LAZY_MODULES``.
+
+    Usage::
+
+        python benchmarks/import_time.py [--factor 1.0] [--repeat 5]
+
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+#: statement -> maximum import time in seconds
+BUDGETS = {
+    "import beem": 0.02,
+    "import beemgraphenebase.ecdsasig": 0.15,
+    "from beem.amount import Amount": 0.15,
+    "from beem import Steem": 0.5,
+}
+
+#: modules which must not be imported by ``import beem``
+LAZY_MODULES = ["beem.steem", "beem.wallet", "beem.storage", "beem.nodelist", "beemapi.graphenerpc",
+                "requests", "websocket", "secp256k1", "cryptography", "numpy"]
+
+
+def import_time(statement, repeat=5):
+    """ Returns the fastest cold import time of statement in seconds"""
+    code = ("import time; start = time.time(); %s; print(time.time() - start)" % statement)
+    times = []
+    for i in range(repeat):
+        output = subprocess.check_output([sys.executable, "-c", code], cwd=ROOT_DIR)
+        times.append(float(output.decode("utf8").strip().split("\n")[-1]))
+    return min(times)
+
+
+def imported_modules(statement):
+    """ Returns the modules which are imported by statement"""
+    code = "import sys; %s; print('\\n'.join(sys.modules.keys()))" % statement
+    output = subprocess.check_output([sys.executable, "-c", code], cwd=ROOT_DIR)
+    return output.decode("utf8").split("\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--factor", type=float, default=1.0, help="Multiplies all budgets")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of runs for each statement")
+    args = parser.parse_args()
+    failed = False
+    for statement in sorted(BUDGETS):
+        seconds = import_time(statement, repeat=args.repeat)
+        budget = BUDGETS[statement] * args.factor
+        ok = seconds <= budget
+        failed = failed or not ok
+        print("%-40s %8.1f ms (budget %.1f ms) %s" % (statement, seconds * 1000, budget * 1000, "ok" if ok else "FAILED"))
+    modules = imported_modules("import beem")
+    for module in LAZY_MODULES:
+        if module in modules:
+            failed = True
+            print("import beem imports %s" % module)
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+# This Python file uses the following encoding: utf-8
+import sys
+
+collect_ignore = []
+if sys.version_info < (3, 6):
+    # async generators and comprehensions need python 3.6
+    collect_ignore.append("test_asyncblockchain.py")
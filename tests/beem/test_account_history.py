@@ -0,0 +1,127 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+import random
+import time
+import unittest
+import mock
+from beem import Steem
+from beem.account import Account, AccountOpIndex, clear_account_op_indices, FUTURES_MODULE, Queue
+if FUTURES_MODULE is not None:
+    from concurrent.futures import ThreadPoolExecutor
+
+MAX_INDEX = 2345
+
+
+def fake_account_history(self, account=None, start=-1, limit=0):
+    """ Returns the items start - limit to start of a fake history"""
+    if start == -1:
+        start = MAX_INDEX
+    time.sleep(random.random() * 0.002)
+    if start % 7 == 3 and start not in fake_account_history.failed:
+        fake_account_history.failed.add(start)
+        raise Exception("node error")
+    history = []
+    for index in range(max(0, start - limit), min(start, MAX_INDEX) + 1):
+        op_type = "transfer" if index % 3 == 0 else "vote"
+        history.append([index, {"block": 1000 + index // 2, "trx_id": "%040x" % index,
+                                "timestamp": "2018-01-01T00:00:00", "op": [op_type, {"index": index}]}])
+    return history
+
+
+fake_account_history.failed = set()
+
+
+class Testcases(unittest.TestCase):
+
+    def setUp(self):
+        self.stm = Steem(offline=True)
+        self.account = Account({"name": "test"}, steem_instance=self.stm)
+        fake_account_history.failed = set(range(0, MAX_INDEX + 100))
+
+    def test_history(self):
+        with mock.patch.object(Account, "_get_account_history", fake_account_history):
+            ops = list(self.account.history(use_block_num=False, batch_size=100))
+            self.assertEqual([op["index"] for op in ops], list(range(0, MAX_INDEX + 1)))
+            ops = list(self.account.history(start=100, stop=1234, use_block_num=False,
+                                            batch_size=100, only_ops=["transfer"]))
+            self.assertEqual([op["index"] for op in ops], list(range(102, 1234, 3)))
+            ops = list(self.account.history(use_block_num=False, batch_size=100, exclude_ops=["vote"], raw_output=True))
+            self.assertEqual([op[0] for op in ops], list(range(0, MAX_INDEX + 1, 3)))
+
+    @unittest.skipIf(FUTURES_MODULE is None, "concurrent.futures is not installed")
+    def test_history_prefetch(self):
+        fake_account_history.failed = set()
+        account = self.account
+        steem_queue = Queue()
+        for i in range(4):
+            steem_queue.put(Steem(offline=True))
+        pool = ThreadPoolExecutor(max_workers=4)
+        with mock.patch.object(Account, "_get_account_history", fake_account_history):
+            pages = list(account._history_pages(99, 99, MAX_INDEX))
+            history_pages = account._history_prefetch(pool, steem_queue, pages, 8, only_ops=["transfer"])
+            ops = [op for page in history_pages for op in page]
+        pool.shutdown()
+        self.assertEqual([op["index"] for op in ops], list(range(0, MAX_INDEX + 1, 3)))
+        self.assertTrue(len(fake_account_history.failed) > 0)
+        self.assertEqual(steem_queue.qsize(), 4)
+
+
+class FakeRPC(object):
+    """ Answers get_account_history with the fake history"""
+    def __init__(self):
+        self.calls = 0
+
+    def set_next_node_on_empty_reply(self, value):
+        pass
+
+    def get_use_appbase(self):
+        return False
+
+    def get_account_history(self, account, start, limit, api=None):
+        self.calls += 1
+        fake_account_history.failed = set(range(0, MAX_INDEX + 100))
+        return fake_account_history(None, start=start, limit=limit)
+
+
+class TestOpIndex(unittest.TestCase):
+
+    def setUp(self):
+        clear_account_op_indices()
+        self.stm = Steem(offline=True)
+        self.stm.rpc = FakeRPC()
+        self.account = Account({"name": "test"}, steem_instance=self.stm)
+
+    def tearDown(self):
+        clear_account_op_indices()
+
+    def test_op_index(self):
+        op_index = AccountOpIndex()
+        for i in [10, 2, 6, 6]:
+            op_index.add(i, 100 + i, "2018-01-01T00:00:00")
+        self.assertEqual(len(op_index), 3)
+        self.assertEqual(op_index.get(6), (106, "2018-01-01T00:00:00"))
+        self.assertIsNone(op_index.get(7))
+        self.assertEqual(op_index.get_bounds(106), ((2, 102), (6, 106)))
+        self.assertEqual(op_index.get_bounds(107), ((6, 106), (10, 110)))
+        self.assertEqual(op_index.get_bounds(120), ((10, 110), None))
+
+    def test_estimate_virtual_op_num(self):
+        rpc = self.stm.rpc
+        op_num = self.account.estimate_virtual_op_num(1500, stop_diff=1)
+        self.assertEqual(1000 + op_num // 2, 1500)
+        first_calls = rpc.calls
+        rpc.calls = 0
+        self.assertEqual(self.account.estimate_virtual_op_num(1500, stop_diff=1), op_num)
+        # virtual_op_count and at most one confirming call
+        self.assertTrue(rpc.calls <= 2)
+        self.assertTrue(first_calls > rpc.calls)
+        rpc.calls = 0
+        op_num = self.account.estimate_virtual_op_num(1700, stop_diff=1)
+        self.assertEqual(1000 + op_num // 2, 1700)
+        self.assertTrue(rpc.calls < first_calls)
+
+    def test_history_start_block(self):
+        ops = list(self.account.history(start=1500, stop=1510, batch_size=100))
+        self.assertEqual([op["block"] for op in ops], [1000 + i // 2 for i in range(1000, 1022)])
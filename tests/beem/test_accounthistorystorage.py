@@ -0,0 +1,81 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+import unittest
+import mock
+from beem import Steem
+from beem.account import Account
+from beem.blockchain import Blockchain
+from beem.exceptions import OfflineHasNoRPCException
+from beem.storage import AccountHistoryStorage
+
+
+def history_item(index):
+    return [index, {"trx_id": "%040x" % index, "block": 100 + index, "trx_in_block": 0,
+                    "op_in_trx": 0, "virtual_op": 0, "timestamp": "2018-01-01T00:00:00",
+                    "op": ["vote", {"voter": "test", "author": "a", "permlink": "p%d" % index, "weight": 10000}]}]
+
+
+class Testcases(unittest.TestCase):
+
+    def setUp(self):
+        self.storage = AccountHistoryStorage(":memory:")
+
+    def test_store_and_get(self):
+        ops = [(i, "id%d" % i, history_item(i)[1]) for i in range(10)]
+        self.assertEqual(self.storage.get_synced_index("test", chain_id="abc"), -1)
+        self.storage.store_ops("test", ops, chain_id="abc", last_irreversible_block_num=107)
+        self.assertEqual(len(self.storage), 8)
+        self.assertEqual(self.storage.get_synced_index("test", chain_id="abc"), 7)
+        self.assertEqual(self.storage.get_ops("test", 2, 4, chain_id="abc"), [history_item(i) for i in range(2, 5)])
+        self.assertEqual(self.storage.get_ops("test", 2, 4, chain_id="def"), [])
+        self.assertEqual(self.storage.get_ops("test2", 2, 4, chain_id="abc"), [])
+        self.assertEqual(self.storage.get_op_by_id("id3", chain_id="abc"), ["test", 3, history_item(3)[1]])
+        self.assertIsNone(self.storage.get_op_by_id("id9", chain_id="abc"))
+        self.assertEqual(self.storage.get_op_bounds("test", 105, chain_id="abc"), ((4, 104), (5, 105)))
+        self.assertEqual(self.storage.get_op_bounds("test", 100, chain_id="abc"), (None, (0, 100)))
+        self.assertEqual(self.storage.get_op_bounds("test", 120, chain_id="abc"), ((7, 107), None))
+        self.storage.wipe(account="test2")
+        self.assertEqual(len(self.storage), 8)
+        self.storage.wipe()
+        self.assertEqual(len(self.storage), 0)
+
+    def test_account_history(self):
+        stm = Steem(offline=True, account_history_storage=self.storage)
+        stm.data["dynamic_global_properties"] = {"last_irreversible_block_num": 1000}
+        account = Account({"name": "test"}, steem_instance=stm)
+        account._store_account_history(self.storage, "test", [history_item(i) for i in range(20)])
+        chain_id = stm.chain_params["chain_id"]
+        op = list(account.get_account_history(5, 0))[0]
+        self.assertEqual(self.storage.get_op_by_id(op["_id"], chain_id=chain_id)[1], 5)
+        ops = list(account.get_account_history(19, 9, order=1))
+        self.assertEqual([op["index"] for op in ops], list(range(10, 20)))
+        self.assertEqual(ops[0]["_id"], Blockchain.hash_op(
+            dict(history_item(10)[1]["op"][1], account="test", type="vote", trx_id="%040x" % 10, block=110,
+                 trx_in_block=0, op_in_trx=0, virtual_op=0, timestamp="2018-01-01T00:00:00")))
+        # not stored
+        with self.assertRaises(OfflineHasNoRPCException):
+            list(account.get_account_history(25, 9))
+
+    def test_threaded_account_history(self):
+        stm = Steem(offline=True, account_history_storage=self.storage)
+        stm.data["dynamic_global_properties"] = {"last_irreversible_block_num": 1000}
+        account = Account({"name": "test"}, steem_instance=stm)
+        account._store_account_history(self.storage, "test", [history_item(i) for i in range(250)])
+        stm.rpc = mock.Mock()
+        stm.rpc.nodes.export_working_nodes.return_value = []
+        workers = []
+
+        def create_steem(**kwargs):
+            # offline workers can only answer from the storage
+            workers.append(kwargs)
+            return Steem(offline=True, account_history_storage=kwargs.get("account_history_storage"))
+
+        with mock.patch("beem.Steem", side_effect=create_steem), \
+                mock.patch.object(Account, "virtual_op_count", return_value=249):
+            ops = list(account.history(use_block_num=False, batch_size=20, threading=True, thread_num=4))
+        self.assertEqual([op["index"] for op in ops], list(range(250)))
+        self.assertEqual(len(workers), 3)
+        for kwargs in workers:
+            self.assertIs(kwargs["account_history_storage"], self.storage)
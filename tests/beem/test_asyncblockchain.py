@@ -0,0 +1,66 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+import asyncio
+import random
+import time
+import unittest
+import mock
+from beem import Steem
+from beem.asyncblockchain import AsyncBlockchain
+
+
+class Testcases(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.stm = Steem(offline=True)
+
+    def setUp(self):
+        self.chain = AsyncBlockchain(steem_instance=self.stm, max_in_flight=4)
+        self.in_flight = 0
+        self.max_seen = 0
+
+    def tearDown(self):
+        self.chain.close()
+
+    def fetch_block_data(self, block_num, only_ops=False, only_virtual_ops=False):
+        self.in_flight += 1
+        self.max_seen = max(self.max_seen, self.in_flight)
+        time.sleep(random.random() * 0.02)
+        self.in_flight -= 1
+        return {"block_id": "%08x" % block_num + "0" * 32,
+                "timestamp": "2019-01-01T00:00:00",
+                "transaction_ids": ["aa"],
+                "transactions": [{"operations": [["vote", {"voter": "a", "author": "b",
+                                                           "permlink": "c", "weight": 1}]]}]}
+
+    async def get_current_block_num(self):
+        return 50
+
+    def run_async(self, coro):
+        return asyncio.new_event_loop().run_until_complete(coro)
+
+    def test_blocks_in_order(self):
+        async def collect():
+            return [b.block_num async for b in self.chain.blocks(start=10, stop=40)]
+
+        with mock.patch.object(self.stm, "is_connected", return_value=True), \
+                mock.patch.object(self.chain, "get_current_block_num", new=self.get_current_block_num), \
+                mock.patch.object(self.chain, "_fetch_block_data", side_effect=self.fetch_block_data):
+            block_nums = self.run_async(collect())
+        self.assertEqual(block_nums, list(range(10, 41)))
+        self.assertTrue(self.max_seen <= 4)
+        self.assertTrue(self.max_seen > 1)
+
+    def test_stream(self):
+        async def collect():
+            return [op async for op in self.chain.stream(opNames=["vote"], start=1, stop=5)]
+
+        with mock.patch.object(self.stm, "is_connected", return_value=True), \
+                mock.patch.object(self.chain, "get_current_block_num", new=self.get_current_block_num), \
+                mock.patch.object(self.chain, "_fetch_block_data", side_effect=self.fetch_block_data):
+            ops = self.run_async(collect())
+        self.assertEqual([op["block_num"] for op in ops], [1, 2, 3, 4, 5])
+        self.assertEqual(ops[0]["type"], "vote")
+        self.assertEqual(ops[0]["voter"], "a")
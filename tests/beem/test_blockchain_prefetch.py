@@ -0,0 +1,74 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+import random
+import time
+import unittest
+import mock
+from beem import Steem
+from beem.blockchain import Blockchain, FUTURES_MODULE, Queue
+from beem.exceptions import BlockDoesNotExistsException
+if FUTURES_MODULE is not None:
+    from concurrent.futures import ThreadPoolExecutor
+
+
+class FakeBlock(dict):
+    failed = set()
+    created = []
+
+    def __init__(self, block_num, only_ops=False, only_virtual_ops=False, steem_instance=None):
+        super(FakeBlock, self).__init__()
+        time.sleep(random.random() * 0.01)
+        if block_num % 7 == 0 and block_num not in FakeBlock.failed:
+            FakeBlock.failed.add(block_num)
+            raise Exception("node error")
+        FakeBlock.created.append(block_num)
+        self.block_num = block_num
+        self.identifier = block_num
+
+
+@unittest.skipIf(FUTURES_MODULE is None, "concurrent.futures is not installed")
+class Testcases(unittest.TestCase):
+
+    def test_blocks_prefetch(self):
+        b = Blockchain(steem_instance=Steem(offline=True))
+        steem_queue = Queue()
+        for i in range(4):
+            steem_queue.put(None)
+        pool = ThreadPoolExecutor(max_workers=4)
+        with mock.patch("beem.blockchain.Block", FakeBlock):
+            blocks = list(b._blocks_prefetch(pool, steem_queue, 1, 50, 16))
+        pool.shutdown()
+        self.assertEqual([block.block_num for block in blocks], list(range(1, 51)))
+        self.assertEqual(blocks[6]["id"], 7)
+        self.assertEqual(steem_queue.qsize(), 4)
+
+    def test_blocks_prefetch_retries(self):
+        b = Blockchain(steem_instance=Steem(offline=True))
+        steem_queue = Queue()
+        steem_queue.put(None)
+        pool = ThreadPoolExecutor(max_workers=1)
+        with mock.patch("beem.blockchain.Block", side_effect=Exception("node error")) as block, \
+                mock.patch("beem.blockchain.time.sleep") as sleep:
+            with self.assertRaises(BlockDoesNotExistsException):
+                list(b._blocks_prefetch(pool, steem_queue, 1, 1, 1, num_retries=3))
+        pool.shutdown()
+        # the prefetched request and three retries
+        self.assertEqual(block.call_count, 4)
+        self.assertEqual(sleep.call_count, 3)
+
+    def test_blocks_prefetch_close(self):
+        FakeBlock.created = []
+        b = Blockchain(steem_instance=Steem(offline=True))
+        steem_queue = Queue()
+        steem_queue.put(None)
+        pool = ThreadPoolExecutor(max_workers=1)
+        with mock.patch("beem.blockchain.Block", FakeBlock):
+            blocks = b._blocks_prefetch(pool, steem_queue, 1, 50, 16)
+            self.assertEqual(next(blocks).block_num, 1)
+            blocks.close()
+            pool.shutdown()
+        self.assertEqual(steem_queue.qsize(), 1)
+        # at most the running request was not cancelled
+        self.assertTrue(len(FakeBlock.created) < 16)
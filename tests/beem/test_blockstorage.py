@@ -0,0 +1,72 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+import os
+import shutil
+import tempfile
+import unittest
+from beem import Steem
+from beem.block import Block
+from beem.storage import BlockStorage, AccountHistoryStorage
+
+
+class Testcases(unittest.TestCase):
+
+    def setUp(self):
+        self.block_storage = BlockStorage(":memory:")
+        self.block = {"block_id": "0000000109833ce528d5bbfb3f6225b39ee10086",
+                      "previous": "0000000000000000000000000000000000000000",
+                      "timestamp": "2016-03-24T16:05:00",
+                      "witness": "initminer",
+                      "transactions": [],
+                      "transaction_ids": []}
+
+    def test_store_and_get(self):
+        self.assertEqual(len(self.block_storage), 0)
+        self.block_storage.store_block(1, self.block, chain_id="abc")
+        self.assertEqual(self.block_storage.get_block(1, chain_id="abc"), self.block)
+        self.assertIsNone(self.block_storage.get_block(1, chain_id="def"))
+        self.assertIsNone(self.block_storage.get_block(1, block_type=1, chain_id="abc"))
+        self.assertIsNone(self.block_storage.get_block(2, chain_id="abc"))
+        self.assertEqual(len(self.block_storage), 1)
+        self.block_storage.wipe()
+        self.assertEqual(len(self.block_storage), 0)
+
+    def test_irreversible_only(self):
+        blocks = [(i, self.block) for i in range(1, 11)]
+        self.block_storage.store_blocks(blocks, last_irreversible_block_num=5)
+        stored = self.block_storage.get_blocks(1, 10)
+        self.assertEqual(sorted(stored.keys()), [1, 2, 3, 4, 5])
+        self.assertEqual(BlockStorage.get_block_type(only_ops=True), 1)
+        self.assertEqual(BlockStorage.get_block_type(only_virtual_ops=True), 2)
+
+    def test_block_refresh(self):
+        stm = Steem(offline=True, block_storage=self.block_storage)
+        self.block_storage.store_block(1, self.block, chain_id=stm.chain_params["chain_id"])
+        block = Block(1, steem_instance=stm)
+        self.assertEqual(block.block_num, 1)
+        self.assertEqual(block["witness"], "initminer")
+        self.assertEqual(block.time().year, 2016)
+
+    def test_shared_connection(self):
+        data_dir = tempfile.mkdtemp()
+        try:
+            db_file = os.path.join(data_dir, "storage.sqlite")
+            block_storage = BlockStorage(db_file)
+            history_storage = AccountHistoryStorage(db_file)
+            self.assertIs(block_storage.get_connection(), history_storage.get_connection())
+            self.assertIs(block_storage.get_lock(), history_storage.get_lock())
+            journal_mode = block_storage.get_connection().execute("PRAGMA journal_mode").fetchone()[0]
+            self.assertEqual(journal_mode, "wal")
+            block_storage.store_block(1, self.block, chain_id="abc")
+            self.assertEqual(BlockStorage(db_file).get_block(1, chain_id="abc"), self.block)
+            block_storage.close_connection()
+        finally:
+            shutil.rmtree(data_dir)
+
+    def test_memory_database(self):
+        self.block_storage.store_block(1, self.block, chain_id="abc")
+        block_storage = BlockStorage(":memory:")
+        self.assertIsNot(block_storage.get_connection(), self.block_storage.get_connection())
+        self.assertEqual(len(block_storage), 0)
@@ -0,0 +1,86 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+import unittest
+from beem import Steem
+from beem.amount import Amount, CompactAmount, get_asset_table
+from beem.exceptions import AssetDoesNotExistsException
+
+
+class Testcases(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.stm = Steem(offline=True)
+        cls.table = get_asset_table(steem_instance=cls.stm)
+
+    def test_asset_table(self):
+        self.assertIs(get_asset_table(steem_instance=self.stm), self.table)
+        self.assertIs(self.table["STEEM"], self.table["@@000000021"])
+        self.assertIs(self.table["STEEM"], self.table[1])
+        self.assertEqual(self.table["VESTS"].precision, 6)
+
+    def test_from_json(self):
+        table = self.table
+        for value in ["1.000 STEEM", {"amount": "1000", "nai": "@@000000021", "precision": 3},
+                      ["1000", 3, "@@000000021"], "1 STEEM", "1.0009 STEEM"]:
+            a = CompactAmount.from_json(value, asset_table=table)
+            self.assertEqual(a.amount, 1000)
+            self.assertIs(a.asset, table["STEEM"])
+        a = CompactAmount.from_json("-12.345678 VESTS", asset_table=table)
+        self.assertEqual(int(a), -12345678)
+        self.assertEqual(str(a), "-12.345678 VESTS")
+        self.assertEqual(float(a), -12.345678)
+        self.assertEqual(a.json(), {"amount": "-12345678", "nai": "@@000000037", "precision": 6})
+        self.assertEqual(str(CompactAmount.from_json("0.001 SBD", steem_instance=self.stm)), "0.001 SBD")
+        with self.assertRaises(AssetDoesNotExistsException):
+            CompactAmount.from_json("1.000 FOO", asset_table=table)
+        with self.assertRaises(ValueError):
+            CompactAmount.from_json(1.0, asset_table=table)
+
+    def test_arithmetic(self):
+        table = self.table
+        a = CompactAmount.from_json("1.500 STEEM", asset_table=table)
+        b = CompactAmount.from_json("0.250 STEEM", asset_table=table)
+        self.assertEqual(str(a + b), "1.750 STEEM")
+        self.assertEqual(str(a - b), "1.250 STEEM")
+        self.assertEqual(str(-a), "-1.500 STEEM")
+        self.assertEqual(str(a * 3), "4.500 STEEM")
+        self.assertEqual(str(a * 0.3333), "0.499 STEEM")
+        self.assertEqual(str(a / 4), "0.375 STEEM")
+        self.assertEqual(a / b, 6)
+        self.assertEqual(str(sum([a, b, b])), "2.000 STEEM")
+        self.assertTrue(a > b)
+        self.assertTrue(b <= 0.25)
+        self.assertEqual(b, 0.25)
+        self.assertFalse(CompactAmount(0, table["STEEM"]))
+        with self.assertRaises(AssertionError):
+            a + CompactAmount.from_json("1.000 SBD", asset_table=table)
+
+    def test_arithmetic_other_types(self):
+        a = CompactAmount.from_json("1.000 STEEM", asset_table=self.table)
+        self.assertEqual(str(a + Amount("2.000 STEEM", steem_instance=self.stm)), "3.000 STEEM")
+        self.assertEqual(str(a + "2.5 STEEM"), "3.500 STEEM")
+        self.assertEqual(str(a - "0.5"), "0.500 STEEM")
+        self.assertEqual(str(a + 2), "3.000 STEEM")
+        self.assertTrue(a == "1.000 STEEM")
+        for other in [Amount("2.000 SBD", steem_instance=self.stm), "5.000 SBD", "2.5 SBD"]:
+            with self.assertRaises(AssertionError):
+                a + other
+            with self.assertRaises(AssertionError):
+                a - other
+            with self.assertRaises(AssertionError):
+                a < other
+        with self.assertRaises(ValueError):
+            a + [1]
+
+    def test_amount_conversion(self):
+        a = CompactAmount.from_json("1.234 SBD", asset_table=self.table)
+        amount = a.to_amount(steem_instance=self.stm)
+        self.assertIsInstance(amount, Amount)
+        self.assertEqual(str(amount), "1.234 SBD")
+        self.assertTrue(a == amount)
+        b = CompactAmount.from_amount(Amount("4.321 SBD", steem_instance=self.stm))
+        self.assertEqual(str(b), "4.321 SBD")
+        self.assertEqual(str(amount + Amount("1.000 SBD", steem_instance=self.stm)), "2.234 SBD")
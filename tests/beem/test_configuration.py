@@ -0,0 +1,81 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from beem.storage import Configuration, Key, LazyDefaults
+
+
+class Testcases(unittest.TestCase):
+
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.config = Configuration()
+        self.config.sqlDataBaseFile = os.path.join(self.data_dir, "beem.sqlite")
+        self.config.create_table()
+
+    def tearDown(self):
+        self.config.close_connection()
+        shutil.rmtree(self.data_dir)
+
+    def test_shared_connection(self):
+        key_storage = Key()
+        key_storage.sqlDataBaseFile = self.config.sqlDataBaseFile
+        self.assertIs(key_storage.get_connection(), self.config.get_connection())
+        journal_mode = self.config.get_connection().execute("PRAGMA journal_mode").fetchone()[0]
+        self.assertEqual(journal_mode, "wal")
+        self.assertIs(key_storage.get_lock(), self.config.get_lock())
+
+    def test_threaded_writes(self):
+        def write(i):
+            for j in range(20):
+                self.config["key%d" % i] = "v%d" % j
+
+        threads = [threading.Thread(target=write, args=(i, )) for i in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.config.clear_cache()
+        self.assertEqual(self.config.items(), {"key%d" % i: "v19" for i in range(4)})
+
+    def test_recover_with_latest_backup(self):
+        backup_dir = os.path.join(self.data_dir, "backups")
+        os.mkdir(backup_dir)
+        self.config["test_key"] = "a"
+        self.config.sqlite3_copy(self.config.sqlDataBaseFile, os.path.join(backup_dir, "beem.sqlite-backup"))
+        self.config["test_key"] = "b"
+        self.config.recover_with_latest_backup(backupdir=backup_dir)
+        self.assertEqual(self.config["test_key"], "a")
+
+    def test_cache(self):
+        self.assertNotIn("test_key", self.config)
+        self.assertEqual(self.config["rpcuser"], "")
+        self.config["test_key"] = "a"
+        self.assertEqual(self.config["test_key"], "a")
+        self.config["test_key"] = "b"
+        self.assertEqual(self.config["test_key"], "b")
+        self.assertEqual(self.config.items(), {"test_key": "b"})
+        self.config.clear_cache()
+        self.assertEqual(self.config["test_key"], "b")
+        self.config.delete("test_key")
+        self.assertIsNone(self.config["test_key"])
+        self.assertEqual(len(self.config), 0)
+
+    def test_lazy_defaults(self):
+        calls = []
+
+        def get_nodes():
+            calls.append(1)
+            return ["https://a"]
+
+        defaults = LazyDefaults({"node": get_nodes})
+        self.assertIn("node", defaults)
+        self.assertEqual(len(calls), 0)
+        self.assertEqual(defaults["node"], ["https://a"])
+        self.assertEqual(defaults.get("node"), ["https://a"])
+        self.assertEqual(len(calls), 1)
@@ -0,0 +1,45 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+import unittest
+from beem import Steem
+from beem.memo import Memo
+from beem.wallet import Wallet
+from beembase.memo import encode_memo
+from beemgraphenebase.account import PrivateKey
+wif = "5KQwrPbwdL6PhXujxW37FSSQZ1JiwsST4cqQzDeyXtP79zkvFD3"
+other_wif = "5Jpkeq1jiNE8Pe24GxFWTsyWbcP59Qq4cD7qg3Wgd6JFJqJkoG8"
+unknown_wif = "5JWcdkhL3w4RkVPcZMdJsjos22yB5cSkPExerktvKnRNZR5gx1S"
+
+
+class Testcases(unittest.TestCase):
+
+    def setUp(self):
+        Wallet.keys = {}
+        self.stm = Steem(offline=True, keys=[wif])
+        self.memo = Memo(steem_instance=self.stm)
+
+    def tearDown(self):
+        Wallet.keys = {}
+
+    def test_decrypt_many(self):
+        priv = PrivateKey(wif)
+        other = PrivateKey(other_wif)
+        unknown = PrivateKey(unknown_wif)
+        received = encode_memo(other, priv.pubkey, "1", "#received", prefix="STM")
+        sent = encode_memo(priv, other.pubkey, "2", "#sent", prefix="STM")
+        foreign = encode_memo(other, unknown.pubkey, "3", "#foreign", prefix="STM")
+        ops = [
+            {"from": "a", "to": "b", "amount": "1.000 STEEM", "memo": received},
+            ["transfer", {"from": "b", "to": "a", "amount": "1.000 STEEM", "memo": sent}],
+            {"from": "a", "to": "b", "amount": "1.000 STEEM", "memo": "plain text"},
+            {"from": "a", "to": "b", "amount": "1.000 STEEM", "memo": ""},
+            {"from": "a", "to": "b", "amount": "1.000 STEEM", "memo": foreign},
+            received,
+        ]
+        self.assertEqual(self.memo.decrypt_many(ops),
+                         ["#received", "#sent", "plain text", "", None, "#received"])
+
+    def test_decrypt_many_invalid(self):
+        self.assertEqual(self.memo.decrypt_many(["#hello world", "#"]), [None, None])
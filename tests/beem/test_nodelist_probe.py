@@ -0,0 +1,59 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+import threading
+import time
+import unittest
+import mock
+from beem.nodelist import NodeList
+
+
+def fake_probe_node(url, timeout=10, num_blocks=3):
+    fake_probe_node.calls.append((timeout, threading.current_thread().daemon))
+    delay = {"https://a": 0.2, "https://b": 0.1, "https://c": 0.3, "https://dead": 5}[url]
+    time.sleep(delay)
+    return {"url": url, "ok": True, "error": None, "connect_time": delay, "config_time": delay,
+            "blocks_per_second": 1. / delay, "head_block": 100 if url != "https://c" else 50}
+
+
+fake_probe_node.calls = []
+
+
+class Testcases(unittest.TestCase):
+
+    def test_probe_nodes(self):
+        nodelist = NodeList()
+        urls = ["https://a", "https://b", "https://c", "https://dead"]
+        start = time.time()
+        with mock.patch("beem.nodelist.probe_node", side_effect=fake_probe_node):
+            results = nodelist.probe_nodes(urls, deadline=1)
+        self.assertTrue(time.time() - start < 2)
+        self.assertEqual([r["url"] for r in results], urls)
+        self.assertEqual([r["ok"] for r in results], [True, True, True, False])
+        self.assertEqual([r["head_block_lag"] for r in results], [0, 0, 50, None])
+
+    def test_probe_nodes_deadline(self):
+        nodelist = NodeList()
+        urls = ["https://dead", "https://a", "https://b"]
+        fake_probe_node.calls = []
+        start = time.time()
+        with mock.patch("beem.nodelist.probe_node", side_effect=fake_probe_node):
+            results = nodelist.probe_nodes(urls, timeout=10, deadline=0.5, max_workers=1)
+        self.assertTrue(time.time() - start < 1.5)
+        self.assertEqual([r["ok"] for r in results], [False, False, False])
+        self.assertEqual(len(fake_probe_node.calls), 1)
+        timeout, daemon = fake_probe_node.calls[0]
+        self.assertTrue(timeout <= 0.5)
+        self.assertTrue(daemon)
+
+    def test_apply_probe_results(self):
+        nodelist = NodeList()
+        urls = [node["url"] for node in nodelist][:3]
+        results = [{"url": urls[0], "ok": True, "config_time": 0.4, "head_block_lag": 0},
+                   {"url": urls[1], "ok": True, "config_time": 0.1, "head_block_lag": 0},
+                   {"url": urls[2], "ok": False, "config_time": float("inf"), "head_block_lag": None}]
+        nodelist.apply_probe_results(results)
+        self.assertEqual(nodelist[1]["score"], 100)
+        self.assertEqual(nodelist[0]["score"], 25)
+        self.assertEqual(nodelist[2]["score"], -1)
@@ -8,7 +8,7 @@ import time
 import unittest
 from beem import Steem, exceptions
 from beem.instance import set_shared_steem_instance
-from beem.blockchainobject import ObjectCache
+from beem.blockchainobject import ObjectCache, BlockchainObject
 from beem.account import Account
 from beem.nodelist import NodeList
 
@@ -75,3 +75,60 @@ class Testcases(unittest.TestCase):
         self.assertEqual(len(list(cache)), 1)
         # Get
         self.assertEqual(cache.get("foo", "New"), "New")
+
+    def test_cache_lru(self):
+        cache = ObjectCache(default_expiration=60, max_entries=3)
+        for i in range(5):
+            cache[i] = str(i)
+        self.assertEqual(list(cache), [2, 3, 4])
+        # access moves the item to the end
+        self.assertEqual(cache[2], "2")
+        cache[5] = "5"
+        self.assertNotIn(3, cache)
+        self.assertIn(2, cache)
+        self.assertEqual(cache.get(3, "New"), "New")
+        stats = cache.stats()
+        self.assertEqual(stats["n"], 3)
+        self.assertEqual(stats["evictions"], 3)
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 1)
+
+    def test_cache_overwrite_delete(self):
+        cache = ObjectCache(default_expiration=60, max_entries=3)
+        cache["a"] = 1
+        cache["b"] = 2
+        cache["a"] = 3
+        self.assertEqual(cache["a"], 3)
+        self.assertEqual(list(cache), ["b", "a"])
+        del cache["a"]
+        self.assertNotIn("a", cache)
+        self.assertEqual(len(cache), 1)
+        cache["c"] = 4
+        cache["d"] = 5
+        cache["e"] = 6
+        self.assertEqual(list(cache), ["c", "d", "e"])
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_cache_max_bytes(self):
+        cache = ObjectCache(default_expiration=60, max_bytes=2000)
+        for i in range(100):
+            cache[i] = {"data": "x" * 100}
+        self.assertTrue(cache.stats()["bytes"] <= 2000)
+        self.assertTrue(len(cache) < 100)
+        self.assertIn(99, cache)
+
+    def test_cache_namespaces(self):
+        class ObjectA(BlockchainObject):
+            pass
+
+        class ObjectB(BlockchainObject):
+            pass
+
+        stm = Steem(offline=True)
+        BlockchainObject.clear_cache()
+        a = ObjectA({"id": 1, "name": "a"}, steem_instance=stm)
+        b = ObjectB({"id": 1, "name": "b"}, steem_instance=stm)
+        self.assertTrue(a.iscached(1))
+        self.assertEqual(a.getcache(1)["name"], "a")
+        self.assertEqual(b.getcache(1)["name"], "b")
+        self.assertEqual(a.get_cache_stats()["n"], 2)
@@ -0,0 +1,202 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+import unittest
+import mock
+from datetime import datetime, timedelta
+from decimal import Decimal
+from beem import Steem
+from beem.account import Account
+from beem.amount import Amount
+from beem.snapshot import AccountSnapshot
+from beem.constants import STEEM_100_PERCENT, STEEM_VOTE_REGENERATION_SECONDS
+from beem.utils import addTzInfo, reputation_to_score
+
+
+class Testcases(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.stm = Steem(offline=True)
+        cls.account = Account({"name": "test"}, steem_instance=cls.stm)
+
+    def setUp(self):
+        ops = [
+            {"type": "claim_reward_balance", "account": "test", "reward_vests": "1000.000000 VESTS",
+             "reward_steem": "1.000 STEEM", "reward_sbd": "2.000 SBD", "timestamp": "2018-01-01T00:00:00"},
+            {"type": "delegate_vesting_shares", "delegator": "a", "delegatee": "test",
+             "vesting_shares": "500.000000 VESTS", "timestamp": "2018-01-02T00:00:00"},
+            {"type": "delegate_vesting_shares", "delegator": "test", "delegatee": "b",
+             "vesting_shares": "300.000000 VESTS", "timestamp": "2018-01-03T00:00:00"},
+            {"type": "transfer", "from": "test", "to": "c", "amount": "0.500 STEEM",
+             "timestamp": "2018-01-04T00:00:00"},
+            {"type": "delegate_vesting_shares", "delegator": "a", "delegatee": "test",
+             "vesting_shares": "0.000000 VESTS", "timestamp": "2018-01-05T00:00:00"},
+            {"type": "return_vesting_delegation", "vesting_shares": "300.000000 VESTS",
+             "timestamp": "2018-01-06T00:00:00"},
+        ]
+        self.snapshot = AccountSnapshot(self.account, account_history=ops, steem_instance=self.stm)
+        self.snapshot.build()
+
+    def test_columns(self):
+        snapshot = self.snapshot
+        self.assertEqual(len(snapshot.timestamps), 13)
+        self.assertEqual(snapshot.timestamps[1], addTzInfo(datetime(2017, 12, 31, 23, 59, 59)))
+        self.assertEqual(snapshot.timestamps[2], addTzInfo(datetime(2018, 1, 1)))
+        self.assertEqual(snapshot.own_vests[2], Amount("1000.000000 VESTS", steem_instance=self.stm))
+        self.assertEqual(str(snapshot.own_steem[-1]), "0.500 STEEM")
+        self.assertEqual(str(snapshot.own_sbd[-1]), "2.000 SBD")
+        delegated_in = snapshot.delegated_vests_in
+        self.assertEqual(delegated_in[3], {})
+        self.assertEqual(list(delegated_in[4].keys()), ["a"])
+        self.assertIs(delegated_in[4], delegated_in[8])
+        self.assertEqual(delegated_in[-1], {})
+        delegated_out = snapshot.delegated_vests_out
+        self.assertEqual(str(delegated_out[6]["b"]), "300.000000 VESTS")
+        self.assertEqual(delegated_out[-1], {})
+
+    def test_column_cache(self):
+        snapshot = self.snapshot
+        timestamps = snapshot.timestamps
+        self.assertIs(snapshot.timestamps, timestamps)
+        self.assertIs(snapshot.delegated_vests_in, snapshot.delegated_vests_in)
+        snapshot.update(addTzInfo(datetime(2018, 1, 7)), 0)
+        self.assertEqual(len(snapshot.timestamps), 15)
+        self.assertEqual(len(timestamps), 13)
+
+    def test_column_setter(self):
+        snapshot = self.snapshot
+        delegated_in = snapshot.delegated_vests_in
+        own_vests = snapshot.own_vests
+        snapshot.own_vests = [Amount("2.000000 VESTS", steem_instance=self.stm)] * len(own_vests)
+        self.assertEqual(str(snapshot.own_vests[5]), "2.000000 VESTS")
+        snapshot.delegated_vests_in = [{}] * 4 + delegated_in[4:]
+        snapshot.delegated_vests_out = [{}] * len(delegated_in)
+        data = snapshot.get_data(datetime(2018, 1, 3, 12))
+        self.assertEqual(str(data["vests"]), "2.000000 VESTS")
+        self.assertEqual(str(data["delegated_vests_in"]["a"]), "500.000000 VESTS")
+        self.assertEqual(data["delegated_vests_out"], {})
+        self.assertEqual(snapshot.delegated_vests_in, delegated_in)
+        sp_own = self.stm.vests_to_sp(2, timestamp=data["timestamp"])
+        self.assertAlmostEqual(data["sp_eff"], sp_own + self.stm.vests_to_sp(500, timestamp=data["timestamp"]))
+        snapshot.timestamps = snapshot.timestamps[:-1] + [addTzInfo(datetime(2018, 1, 8))]
+        self.assertEqual(snapshot.get_data(datetime(2018, 1, 10))["timestamp"], addTzInfo(datetime(2018, 1, 8)))
+        snapshot.update(addTzInfo(datetime(2018, 1, 9)), 1)
+        self.assertEqual(str(snapshot.own_vests[-1]), "3.000000 VESTS")
+
+    def test_get_data(self):
+        snapshot = self.snapshot
+        self.assertEqual(snapshot.get_data(datetime(1970, 1, 1)), {})
+        data = snapshot.get_data(datetime(2018, 1, 3, 12))
+        self.assertEqual(data["index"], 6)
+        self.assertEqual(data["timestamp"], addTzInfo(datetime(2018, 1, 3)))
+        self.assertEqual(str(data["vests"]), "1000.000000 VESTS")
+        self.assertEqual(str(data["delegated_vests_in"]["a"]), "500.000000 VESTS")
+        self.assertEqual(str(data["delegated_vests_out"]["b"]), "300.000000 VESTS")
+        sp_own = self.stm.vests_to_sp(1000, timestamp=data["timestamp"])
+        self.assertAlmostEqual(data["sp_own"], sp_own)
+        self.assertAlmostEqual(data["sp_eff"], sp_own * 1.2)
+        # an earlier time stamp restarts the delegation replay
+        data = snapshot.get_data(datetime(2018, 1, 2, 12))
+        self.assertEqual(data["delegated_vests_out"], {})
+        data = snapshot.get_data(datetime(2018, 1, 10))
+        self.assertEqual(data["index"], 12)
+        self.assertEqual(data["delegated_vests_in"], {})
+        self.assertAlmostEqual(data["sp_eff"], data["sp_own"])
+
+    def test_build_sp_arrays(self):
+        snapshot = self.snapshot
+        snapshot.build_sp_arrays()
+        self.assertEqual(len(snapshot.own_sp), len(snapshot.timestamps))
+        for index, ts in enumerate(snapshot.timestamps):
+            data = snapshot.get_data(ts + timedelta(seconds=0.5))
+            self.assertAlmostEqual(snapshot.own_sp[index], data["sp_own"])
+            self.assertAlmostEqual(snapshot.eff_sp[index], data["sp_eff"])
+
+    def test_build_sp_arrays_unrounded(self):
+        ops = [
+            {"type": "account_create", "creator": "x", "new_account_name": "test", "fee": "3.000 STEEM",
+             "timestamp": "2016-06-01T00:00:00"},
+            {"type": "transfer_to_vesting", "from": "y", "to": "test", "amount": "7.123 STEEM",
+             "timestamp": "2016-08-01T00:00:00"},
+            {"type": "fill_vesting_withdraw", "from_account": "test", "to_account": "test",
+             "withdrawn": "1000.000001 VESTS", "deposited": "0.500 STEEM", "timestamp": "2017-03-01T00:00:00"},
+        ]
+        snapshot = AccountSnapshot(self.account, account_history=ops, steem_instance=self.stm)
+        snapshot.build()
+        snapshot.build_sp_arrays()
+        # the SP of each row is converted from the unrounded vests total
+        vests = Decimal(0)
+        expected = [self.stm.vests_to_sp(0., timestamp=snapshot.timestamps[0])]
+        for i, op in enumerate(ops):
+            ts = snapshot.timestamps[2 * i + 2]
+            expected.append(self.stm.vests_to_sp(float(vests), timestamp=snapshot.timestamps[2 * i + 1]))
+            if op["type"] == "fill_vesting_withdraw":
+                vests -= Decimal("1000.000001")
+            else:
+                sp = Amount(op.get("fee", op.get("amount")), steem_instance=self.stm).amount
+                vests += Decimal(self.stm.sp_to_vests(sp, timestamp=ts))
+            expected.append(self.stm.vests_to_sp(float(vests), timestamp=ts))
+        self.assertEqual(snapshot.own_sp, expected)
+        self.assertEqual(snapshot.eff_sp, expected)
+        self.assertEqual(snapshot.own_sp[2], 3.0)
+
+    def test_build_twice(self):
+        snapshot = self.snapshot
+        snapshot.append({"type": "transfer", "from": "c", "to": "test", "amount": "1.000 SBD",
+                         "timestamp": "2018-01-07T00:00:00"})
+        snapshot.build(only_ops=["transfer"])
+        self.assertEqual(len(snapshot.timestamps), 15)
+        self.assertEqual(str(snapshot.own_sbd[-1]), "3.000 SBD")
+
+    def test_build_vp_arrays(self):
+        snapshot = self.snapshot
+        ts = addTzInfo(datetime(2018, 1, 7))
+        for i in range(3):
+            snapshot.update_out_vote(ts + timedelta(hours=i), 10000)
+        with mock.patch.object(self.stm, "_max_vote_denom", return_value=10 * STEEM_VOTE_REGENERATION_SECONDS) as max_vote_denom:
+            snapshot.build_vp_arrays()
+        self.assertEqual(max_vote_denom.call_count, 1)
+        self.assertEqual(len(snapshot.vp), 4)
+        self.assertEqual(snapshot.vp[:2], [STEEM_100_PERCENT, 9800])
+        regenerated = int(3600 * STEEM_100_PERCENT / STEEM_VOTE_REGENERATION_SECONDS)
+        self.assertEqual(regenerated, 83)
+        self.assertEqual(snapshot.vp[2], 9800 + 83 - 198)
+        self.assertEqual(snapshot.vp_timestamp[-1], ts + timedelta(hours=2))
+
+    def test_build_rep_arrays(self):
+        snapshot = self.snapshot
+        ts = addTzInfo(datetime(2018, 1, 7))
+        for (rshares, rep) in [(64 * 10 ** 10, 1), (-64 * 10 ** 10, 0), (-64 * 10 ** 9, 10 ** 12)]:
+            snapshot.in_vote_timestamp.append(ts)
+            snapshot.in_vote_rshares.append(rshares)
+            snapshot.in_vote_rep.append(rep)
+        snapshot.build_rep_arrays()
+        self.assertEqual(snapshot.rep, [25.0, reputation_to_score(10 ** 10), reputation_to_score(10 ** 10),
+                                        reputation_to_score(9 * 10 ** 9)])
+
+    def test_build_curation_arrays(self):
+        snapshot = self.snapshot
+        start = addTzInfo(datetime(2018, 1, 1, 12))
+        for i in range(8):
+            ts = start + timedelta(days=i)
+            snapshot.update_rewards(ts, Amount("10.000000 VESTS", steem_instance=self.stm), 0, 0, 0)
+            snapshot.update_rewards(ts, 0, Amount("1.000000 VESTS", steem_instance=self.stm), 0, 0)
+        snapshot.build_curation_arrays(sum_days=2)
+        expected = []
+        curation_sum = 0
+        end_date = start + timedelta(days=1)
+        for i in range(8):
+            ts = start + timedelta(days=i)
+            data = snapshot.get_data(ts)
+            sp = self.stm.vests_to_sp(10, timestamp=ts)
+            curation_1k_sp = sp / data["sp_eff"] * 1000 / 2 * 7
+            if ts < end_date:
+                curation_sum += curation_1k_sp
+            else:
+                expected.append(curation_sum)
+                end_date += timedelta(days=2)
+                curation_sum = 0
+        self.assertEqual(snapshot.curation_per_1000_SP, expected)
+        self.assertEqual(len(snapshot.curation_per_1000_SP_timestamp), len(expected))
@@ -0,0 +1,72 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+import os
+import subprocess
+import sys
+import unittest
+from datetime import datetime
+from beem import Steem
+from beem.utils import load_numpy
+np = load_numpy()
+
+
+class Testcases(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.stm = Steem(offline=True)
+        cls.stm.data["dynamic_global_properties"] = {
+            "total_vesting_fund_steem": "194069549.621 STEEM",
+            "total_vesting_shares": "393957301458.112302 VESTS",
+            "vote_power_reserve_rate": 10}
+        cls.stm.data["reward_funds"] = {
+            "reward_balance": "792455.396 STEEM",
+            "recent_claims": "397880937284476727"}
+        cls.stm.data["get_feed_history"] = {
+            "current_median_history": {"base": "0.945 SBD", "quote": "1.000 STEEM"}}
+        cls.stm.data["config"] = {"STEEM_VOTE_DUST_THRESHOLD": 50000000}
+
+    def assertListAlmostEqual(self, values, expected):
+        self.assertEqual(len(values), len(expected))
+        for v, e in zip(values, expected):
+            self.assertAlmostEqual(v, e, delta=abs(e) * 1e-12)
+
+    def test_vests_to_sp_array(self):
+        stm = self.stm
+        vests = [0, 1e6, 2.5e9, 123456.789]
+        times = [datetime(2017, 1, 1), datetime(2018, 6, 1), 1500000000, 1600000000]
+        self.assertListAlmostEqual(stm.vests_to_sp_array(vests, timestamps=times),
+                                   [stm.vests_to_sp(v, t) for v, t in zip(vests, times)])
+        self.assertListAlmostEqual(stm.vests_to_sp_array(vests, timestamps=times[1]),
+                                   [stm.vests_to_sp(v, times[1]) for v in vests])
+        self.assertListAlmostEqual(stm.sp_to_vests_array(vests, timestamps=times),
+                                   [stm.sp_to_vests(v, t) for v, t in zip(vests, times)])
+        self.assertListAlmostEqual(stm.get_steem_per_mvest_array(times),
+                                   [stm.get_steem_per_mvest(t) for t in times])
+
+    def test_vests_to_rshares_array(self):
+        stm = self.stm
+        vests = [1e3, 1e6, 2.5e9]
+        self.assertListAlmostEqual(stm.vests_to_rshares_array(vests),
+                                   [stm.vests_to_rshares(v) for v in vests])
+        self.assertListAlmostEqual(stm.vests_to_rshares_array(vests, vote_pct=-5000),
+                                   [stm.vests_to_rshares(v, vote_pct=-5000) for v in vests])
+        rshares = [0, 1e9, -3e12]
+        self.assertListAlmostEqual(stm.rshares_to_sbd_array(rshares),
+                                   [stm.rshares_to_sbd(r) for r in rshares])
+        self.assertListAlmostEqual(stm.rshares_to_sbd_array(rshares, not_broadcasted_vote=True),
+                                   [stm.rshares_to_sbd(r, not_broadcasted_vote=True) for r in rshares])
+
+    def test_numpy_import(self):
+        # numpy is only imported when an array function is used
+        code = "import sys; from beem import Steem; print('numpy' in sys.modules)"
+        root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        output = subprocess.check_output([sys.executable, "-c", code], cwd=root_dir)
+        self.assertEqual(output.decode("utf8").strip(), "False")
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_numpy(self):
+        values = self.stm.vests_to_sp_array(np.array([1e6, 2e6]), timestamps=1500000000)
+        self.assertIsInstance(values, np.ndarray)
@@ -0,0 +1,74 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+import os
+import shutil
+import tempfile
+import unittest
+import mock
+from beem import Steem
+from beem.wallet import Wallet
+from beem.exceptions import WalletLocked
+from beem.storage import Key
+from beemgraphenebase import bip38
+from beemgraphenebase.account import PrivateKey
+wif = "5KQwrPbwdL6PhXujxW37FSSQZ1JiwsST4cqQzDeyXtP79zkvFD3"
+
+
+class Testcases(unittest.TestCase):
+
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.key_storage = Key()
+        self.key_storage.sqlDataBaseFile = os.path.join(self.data_dir, "beem.sqlite")
+        self.key_storage.create_table()
+        self.stm = Steem(offline=True)
+        Wallet.keys = {}
+        self.wallet = Wallet(steem_instance=self.stm, key_cache_timeout=60)
+        self.wallet.keyStorage = self.key_storage
+        self.wallet.masterpassword = "d1e3f53c9a1e2cd1b88e6ec5fcbcc6b1b7b1bb7a8d2b4c8d2c7b41b6a2f04bd0"
+        self.pub = format(PrivateKey(wif).pubkey, "STM")
+        self.key_storage.add(self.wallet.encrypt_wif(wif), self.pub)
+
+    def tearDown(self):
+        self.key_storage.close_connection()
+        shutil.rmtree(self.data_dir)
+
+    def test_key_cache(self):
+        with mock.patch("beem.wallet.bip38.decrypt", side_effect=bip38.decrypt) as decrypt:
+            self.assertEqual(self.wallet.getPrivateKeyForPublicKey(self.pub), wif)
+            self.assertEqual(self.wallet.getPrivateKeyForPublicKey(self.pub), wif)
+            self.assertEqual(str(self.wallet.getPrivateKeyObjectForPublicKey(self.pub)), wif)
+            self.assertEqual(decrypt.call_count, 1)
+            self.wallet.lock()
+            self.assertEqual(len(self.wallet.key_cache), 0)
+            self.wallet.masterpassword = "d1e3f53c9a1e2cd1b88e6ec5fcbcc6b1b7b1bb7a8d2b4c8d2c7b41b6a2f04bd0"
+            self.assertEqual(self.wallet.getPrivateKeyForPublicKey(self.pub), wif)
+            self.assertEqual(decrypt.call_count, 2)
+            # idle timeout
+            self.wallet.key_cache[self.pub][2] -= 61
+            self.assertIsNone(self.wallet._get_cached_key(self.pub))
+            self.assertEqual(len(self.wallet.key_cache), 0)
+
+    def test_key_cache_locked(self):
+        self.assertEqual(self.wallet.getPrivateKeyForPublicKey(self.pub), wif)
+        self.assertEqual(len(self.wallet.key_cache), 1)
+        # locked without lock()
+        self.wallet.masterpassword = None
+        with mock.patch.object(Wallet, "tryUnlockFromEnv"):
+            with self.assertRaises(WalletLocked):
+                self.wallet.getPrivateKeyForPublicKey(self.pub)
+            with self.assertRaises(WalletLocked):
+                self.wallet.getPrivateKeyObjectForPublicKey(self.pub)
+        self.assertEqual(len(self.wallet.key_cache), 0)
+
+    def test_key_cache_expire(self):
+        self.wallet.key_cache["STMother"] = [None, "other", 0]
+        self.wallet.key_cache["STMold"] = [None, "old", 0]
+        with mock.patch("beem.wallet._monotonic", return_value=100):
+            self.assertIsNone(self.wallet._get_cached_key("STMold"))
+            # only the requested entry is removed
+            self.assertIn("STMother", self.wallet.key_cache)
+            self.assertEqual(self.wallet.getPrivateKeyForPublicKey(self.pub), wif)
+        self.assertEqual(list(self.wallet.key_cache.keys()), [self.pub])
@@ -0,0 +1,195 @@
+# This Python file uses the following encoding: utf-8
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+import json
+import threading
+import time
+import unittest
+import mock
+from websocket import WebSocketConnectionClosedException, WebSocketTimeoutException
+from beemapi.graphenerpc import GrapheneRPC, WebsocketMultiplexer, create_session, Queue
+
+
+class FakeResponse(object):
+    status_code = 200
+
+    def __init__(self, data):
+        self.text = json.dumps(data)
+        self.data = data
+
+    def json(self):
+        return self.data
+
+
+class FakeWebsocket(object):
+    """ Answers only when 8 requests are in flight, in reversed order"""
+    def __init__(self):
+        self.requests = []
+        self.replies = Queue()
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def send(self, payload):
+        with self.lock:
+            self.requests.append(json.loads(payload.decode("utf8")))
+            self.max_in_flight = max(self.max_in_flight, len(self.requests))
+            if len(self.requests) == 8:
+                for query in reversed(self.requests):
+                    self.replies.put(json.dumps({"jsonrpc": "2.0", "id": query["id"], "result": query["params"][0]}))
+                self.requests = []
+
+    def recv(self):
+        reply = self.replies.get()
+        if reply is None:
+            raise WebSocketConnectionClosedException("closed")
+        return reply
+
+    def close(self):
+        self.replies.put(None)
+
+
+class Testcases(unittest.TestCase):
+
+    def setUp(self):
+        self.rpc = GrapheneRPC("https://api.example.com", autoconnect=False, max_batch_size=3)
+        self.rpc.url = "https://api.example.com"
+        self.rpc.current_rpc = self.rpc.rpc_methods["appbase"]
+        self.requests = []
+
+    def request_send(self, payload):
+        queries = json.loads(payload.decode("utf8"))
+        self.requests.append(queries)
+        # return the replies in reversed order
+        return FakeResponse([{"jsonrpc": "2.0", "id": q["id"], "result": {"block_num": q["params"]["block_num"]}}
+                             for q in reversed(queries)])
+
+    def test_batch(self):
+        calls = [("get_block", [{"block_num": i}], {"api": "block"}) for i in range(1, 8)]
+        with mock.patch.object(self.rpc, "request_send", side_effect=self.request_send):
+            results = self.rpc.batch(calls)
+        self.assertEqual([r["block_num"] for r in results], list(range(1, 8)))
+        self.assertEqual([len(r) for r in self.requests], [3, 3, 1])
+        self.assertEqual(self.requests[0][0]["method"], "block_api.get_block")
+
+    def test_create_session(self):
+        session = create_session(pool_connections=2, pool_maxsize=32)
+        adapter = session.get_adapter("https://api.example.com")
+        self.assertEqual(adapter._pool_maxsize, 32)
+
+    def test_ws_multiplexer(self):
+        ws = FakeWebsocket()
+        multiplexer = WebsocketMultiplexer(ws, timeout=5)
+        results = {}
+
+        def call(i):
+            payload = json.dumps({"jsonrpc": "2.0", "id": i, "method": "get_block", "params": [i]})
+            results[i] = json.loads(multiplexer.send(payload.encode("utf8")))
+
+        threads = [threading.Thread(target=call, args=(i, )) for i in range(1, 9)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(ws.max_in_flight, 8)
+        self.assertEqual(sorted(results.keys()), list(range(1, 9)))
+        for i in results:
+            self.assertEqual(results[i]["id"], i)
+            self.assertEqual(results[i]["result"], i)
+        ws.close()
+        multiplexer.reader.join(5)
+        self.assertFalse(multiplexer.reader.is_alive())
+        with self.assertRaises(WebSocketConnectionClosedException):
+            multiplexer.send(b'{"id": 9}')
+
+    def test_ws_multiplexer_unknown_reply(self):
+        ws = FakeWebsocket()
+        multiplexer = WebsocketMultiplexer(ws, timeout=5)
+        result = {}
+
+        def call():
+            result["reply"] = multiplexer.send(b'{"id": 2, "params": [2]}')
+
+        thread = threading.Thread(target=call)
+        thread.start()
+        while len(multiplexer.pending) == 0:
+            time.sleep(0.01)
+        with self.assertRaises(ValueError):
+            multiplexer.send(b'{"id": 2, "params": [2]}')
+        # a late reply to another request is dropped
+        ws.replies.put(json.dumps({"id": 1, "result": 1}))
+        ws.replies.put(json.dumps({"id": 2, "result": 2}))
+        thread.join(5)
+        self.assertEqual(json.loads(result["reply"])["result"], 2)
+        multiplexer.close()
+        with self.assertRaises(WebSocketConnectionClosedException):
+            multiplexer.send(b'{"id": 3}')
+
+    def test_ws_multiplexer_close(self):
+        ws = mock.Mock()
+        ws.recv.side_effect = WebSocketTimeoutException("timeout")
+        multiplexer = WebsocketMultiplexer(ws, timeout=5)
+        multiplexer.close()
+        multiplexer.reader.join(5)
+        self.assertFalse(multiplexer.reader.is_alive())
+
+    def test_reconnect_closes_ws(self):
+        def create_ws(use_ssl=True):
+            ws = mock.Mock()
+            ws.recv.side_effect = WebSocketTimeoutException("timeout")
+            return ws
+
+        rpc = GrapheneRPC(["ws://a.example.com", "ws://b.example.com"], autoconnect=False,
+                          ws_multiplex=True, disable_chain_detection=True)
+        with mock.patch("beemapi.graphenerpc.create_ws_instance", side_effect=create_ws):
+            rpc.rpcconnect()
+            ws = rpc.ws
+            multiplexer = rpc.ws_multiplexer
+            rpc.rpcconnect()
+        self.assertIsNot(rpc.ws, ws)
+        ws.close.assert_called_once_with()
+        multiplexer.reader.join(5)
+        self.assertFalse(multiplexer.reader.is_alive())
+        rpc.rpcclose()
+
+    def test_hedged_request_send(self):
+        rpc = GrapheneRPC(["https://a.example.com", "https://b.example.com"], autoconnect=False,
+                          latency_aware=True, hedge_percentile=0.9)
+        rpc.url = next(rpc.nodes)
+        rpc.current_rpc = rpc.rpc_methods["appbase"]
+        rpc.nodes[1].rpc_method = rpc.current_rpc
+        for i in range(10):
+            rpc.nodes.update_latency(0.01)
+
+        def request_send(payload, url=None):
+            if url == "https://a.example.com":
+                time.sleep(0.5)
+            return FakeResponse({"jsonrpc": "2.0", "id": 1, "result": url})
+
+        with mock.patch.object(rpc, "request_send", side_effect=request_send):
+            response = rpc.hedged_request_send(b'{"id": 1}')
+        self.assertEqual(response.json()["result"], "https://b.example.com")
+        # the answer time is added to the node which has answered
+        self.assertEqual(len(rpc.nodes[1].latencies), 1)
+
+    def test_switch_outside_of_rpcconnect(self):
+        rpc = GrapheneRPC(["https://a.example.com", "https://b.example.com"], autoconnect=False,
+                          latency_aware=True)
+        rpc.url = next(rpc.nodes)
+        rpc.current_rpc = rpc.rpc_methods["appbase"]
+        rpc.nodes.update_latency(1.)
+        rpc.nodes.update_latency(0.01, node=rpc.nodes[1])
+        payload = {"jsonrpc": "2.0", "id": 1, "method": "get_config", "params": []}
+
+        def request_send(data, url=None):
+            return FakeResponse({"jsonrpc": "2.0", "id": 1, "result": {}})
+
+        with mock.patch.object(rpc, "request_send", side_effect=request_send), \
+                mock.patch.object(rpc, "next") as switch:
+            rpc._connecting = True
+            rpc.rpcexec(payload)
+            self.assertEqual(switch.call_count, 0)
+            rpc._connecting = False
+            rpc.rpcexec(payload)
+            self.assertEqual(switch.call_count, 1)
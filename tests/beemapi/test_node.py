@@ -54,3 +54,53 @@ class Testcases(unittest.TestCase):
         nodes = Nodes(["a", "b", "c"], 5, 5)
         nodes2 = Nodes(nodes, 5, 5)
         self.assertEqual(nodes.url, nodes2.url)
+
+    def test_latency_aware(self):
+        nodes = Nodes(["a", "b", "c"], 2, 5, latency_aware=True)
+        self.assertEqual(next(nodes), "a")
+        nodes.update_latency(1.)
+        # unmeasured nodes are tried first
+        self.assertEqual(next(nodes), "b")
+        nodes.update_latency(0.1)
+        self.assertEqual(next(nodes), "c")
+        nodes.update_latency(0.5)
+        self.assertEqual(next(nodes), "b")
+        self.assertFalse(nodes.should_switch())
+        nodes.current_node_index = 0
+        self.assertTrue(nodes.should_switch())
+        nodes.current_node_index = 1
+        # head block lag
+        nodes.update_head_block(90, node=nodes[1])
+        nodes.update_head_block(100, node=nodes[2])
+        self.assertEqual(nodes.get_best_node_index(), 2)
+        nodes.update_head_block(100, node=nodes[1])
+        self.assertEqual(nodes.get_best_node_index(), 1)
+        # errors
+        nodes.increase_error_cnt()
+        nodes.increase_error_cnt()
+        self.assertEqual(nodes.get_best_node_index(), 2)
+        nodes.increase_error_cnt()
+        self.assertEqual(nodes.working_nodes_count, 2)
+        self.assertEqual(next(nodes), "c")
+        self.assertEqual(next(nodes), "a")
+
+    def test_should_switch_with_unmeasured_nodes(self):
+        nodes = Nodes(["a", "b", "c", "d"], 2, 5, latency_aware=True)
+        self.assertEqual(next(nodes), "a")
+        nodes.update_latency(1.)
+        nodes.update_latency(0.1, node=nodes[1])
+        # c and d are not measured yet
+        self.assertIn(nodes.get_best_node_index(exclude_current=True), [2, 3])
+        self.assertEqual(nodes.get_best_node_index(exclude_current=True, measured_only=True), 1)
+        self.assertTrue(nodes.should_switch())
+        nodes.update_latency(0.9, node=nodes[1])
+        nodes.update_latency(0.9, node=nodes[1])
+        self.assertFalse(nodes.should_switch())
+
+    def test_hedge_delay(self):
+        nodes = Nodes(["a", "b"], 2, 5)
+        self.assertIsNone(nodes.get_hedge_delay())
+        for i in range(1, 11):
+            nodes.update_latency(i / 10.)
+        self.assertEqual(nodes.get_hedge_delay(0.9), 1.)
+        self.assertEqual(nodes.get_hedge_delay(0.5), 0.6)
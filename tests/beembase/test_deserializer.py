@@ -0,0 +1,109 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+import unittest
+from binascii import hexlify
+from beembase import operations
+from beembase.objects import Operation
+from beembase.signedtransactions import Signed_Transaction
+from beembase.deserializer import (
+    deserialize_operation,
+    deserialize_transaction,
+    iter_transactions,
+    format_amount
+)
+from beemgraphenebase.deserializer import BinaryReader, DeserializationError
+from beemgraphenebase.py23 import py23_bytes
+
+prefix = u"STEEM"
+wif = "5KQwrPbwdL6PhXujxW37FSSQZ1JiwsST4cqQzDeyXtP79zkvFD3"
+ref_block_num = 34294
+ref_block_prefix = 3707022213
+expiration = "2016-04-06T08:29:27"
+
+
+class Testcases(unittest.TestCase):
+
+    def get_transaction(self, op):
+        tx = Signed_Transaction(ref_block_num=ref_block_num,
+                                ref_block_prefix=ref_block_prefix,
+                                expiration=expiration,
+                                operations=[Operation(op)])
+        return tx.sign([wif], chain=prefix)
+
+    def check_round_trip(self, op):
+        tx = self.get_transaction(op)
+        wire = py23_bytes(tx)
+        decoded = deserialize_transaction(wire)
+        self.assertEqual(py23_bytes(Signed_Transaction(**decoded)), wire)
+        self.assertEqual(py23_bytes(Signed_Transaction.from_bytes(hexlify(wire).decode("ascii"))), wire)
+        return decoded
+
+    def test_transfer(self):
+        decoded = self.check_round_trip(operations.Transfer(**{
+            "from": "foo", "to": "baar", "amount": "111.110 STEEM", "memo": "Fooo"}))
+        self.assertEqual(decoded["ref_block_num"], ref_block_num)
+        self.assertEqual(decoded["expiration"], expiration)
+        self.assertEqual(decoded["extensions"], [])
+        self.assertEqual(len(decoded["signatures"]), 1)
+        self.assertEqual(decoded["operations"],
+                         [["transfer", {"from": "foo", "to": "baar", "amount": "111.110 STEEM", "memo": "Fooo"}]])
+
+    def test_account_update(self):
+        key = "STM6zLNtyFVToBsBZDsgMhgjpwysYVbsQD6YhP3kRkQhANUB4w7Qp"
+        decoded = self.check_round_trip(operations.Account_update(**{
+            "account": "streemian",
+            "posting": {"weight_threshold": 1, "account_auths": [["xeroc", 1]], "key_auths": [[key, 1]]},
+            "memo_key": key,
+            "json_metadata": ""}))
+        op = decoded["operations"][0][1]
+        self.assertNotIn("owner", op)
+        self.assertEqual(op["posting"], {"weight_threshold": 1, "account_auths": [["xeroc", 1]], "key_auths": [[key, 1]]})
+        self.assertEqual(op["memo_key"], key)
+
+    def test_comment_options(self):
+        op = operations.Comment_options(**{
+            "author": "xeroc", "permlink": "piston", "max_accepted_payout": "1000000.000 SBD",
+            "percent_steem_dollars": 10000, "allow_votes": True, "allow_curation_rewards": True,
+            "beneficiaries": [{"weight": 2000, "account": "good-karma"}]})
+        decoded = self.check_round_trip(op)
+        self.assertEqual(decoded["operations"][0][1]["extensions"],
+                         [[0, {"beneficiaries": [{"account": "good-karma", "weight": 2000}]}]])
+        appbase = deserialize_operation(py23_bytes(Operation(op)), appbase=True)
+        self.assertEqual(appbase["type"], "comment_options_operation")
+        self.assertEqual(appbase["value"]["max_accepted_payout"],
+                         {"amount": "1000000000", "precision": 3, "nai": "@@000000013"})
+
+    def test_witness_set_properties(self):
+        self.check_round_trip(operations.Witness_set_properties(**{
+            "owner": "init-1",
+            "props": [["account_creation_fee", "2.000 STEEM"],
+                      ["key", "STM6zLNtyFVToBsBZDsgMhgjpwysYVbsQD6YhP3kRkQhANUB4w7Qp"]]}))
+
+    def test_iter_transactions(self):
+        ops = [operations.Vote(**{"voter": "a", "author": "b", "permlink": "c%d" % i, "weight": -100})
+               for i in range(3)]
+        archive = b"".join([py23_bytes(self.get_transaction(op)) for op in ops])
+        txs = list(iter_transactions(archive))
+        self.assertEqual([tx["operations"][0][1]["permlink"] for tx in txs], ["c0", "c1", "c2"])
+        self.assertEqual(txs[0]["operations"][0][1]["weight"], -100)
+
+    def test_errors(self):
+        wire = py23_bytes(self.get_transaction(operations.Delete_comment(**{"author": "a", "permlink": "b"})))
+        with self.assertRaises(DeserializationError):
+            deserialize_transaction(wire[:-10])
+        with self.assertRaises(DeserializationError):
+            deserialize_transaction(wire + b"\x00")
+        with self.assertRaises(NotImplementedError):
+            # pow
+            deserialize_operation(b"\x0e")
+
+    def test_reader(self):
+        reader = BinaryReader("0a0003666f6fac02")
+        self.assertEqual(reader.read_uint16(), 10)
+        self.assertEqual(reader.read_string(), "foo")
+        self.assertEqual(reader.read_varint(), 300)
+        self.assertTrue(reader.eof())
+        self.assertEqual(format_amount(-1500, 3, "SBD"), "-1.500 SBD")
+        self.assertEqual(format_amount(12, 0, "FOO"), "12 FOO")
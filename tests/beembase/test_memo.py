@@ -8,6 +8,7 @@ from builtins import chr
 from builtins import range
 import unittest
 import hashlib
+import mock
 from binascii import hexlify, unhexlify
 import os
 from pprint import pprint
@@ -15,6 +16,7 @@ from itertools import cycle
 from beemgraphenebase.account import BrainKey, Address, PublicKey, PrivateKey, PasswordKey
 from beembase.memo import (
     get_shared_secret,
+    clear_shared_secret_cache,
     _pad,
     _unpad,
     encode_memo,
@@ -149,3 +151,16 @@ class Testcases(unittest.TestCase):
                 get_shared_secret(sender_private_key, receiver_public_key),
                 get_shared_secret(receiver_private_key, sender_public_key)
             )
+
+    def test_shared_secret_cache(self):
+        clear_shared_secret_cache()
+        priv = PrivateKey(test_shared_secrets[0][0])
+        pub = PublicKey(test_shared_secrets[0][1], prefix="GPH")
+        self.assertEqual(get_shared_secret(priv, pub), test_shared_secrets[0][2])
+        with mock.patch.object(PublicKey, "point") as point:
+            self.assertEqual(get_shared_secret(priv, pub), test_shared_secrets[0][2])
+            self.assertFalse(point.called)
+        clear_shared_secret_cache()
+        with mock.patch.object(PublicKey, "point", side_effect=pub.point) as point:
+            self.assertEqual(get_shared_secret(priv, pub), test_shared_secrets[0][2])
+            self.assertTrue(point.called)
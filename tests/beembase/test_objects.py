@@ -35,3 +35,23 @@ class Testcases(unittest.TestCase):
         j = ["transfer", {'from': 'a', 'to': 'b', 'amount': a, 'memo': 'c'}]
         o = Operation(j)
         self.assertEqual(o.json()[1], j[1])
+
+    def test_Operation_from_json(self):
+        j = ["vote", {'voter': 'a', 'author': 'b', 'permlink': 'c', 'weight': 100}]
+        o = Operation.from_json(j)
+        self.assertEqual(o.opId, 0)
+        self.assertEqual(o.name, "Vote")
+        self.assertEqual(o.json(), j)
+        self.assertEqual(bytes(o), bytes(Operation(j)))
+        o = Operation.from_json({"type": "vote_operation", "value": j[1]})
+        self.assertTrue(o.appbase)
+        self.assertEqual(bytes(Operation([0, j[1]])), bytes(o))
+        self.assertEqual(o.getOperationNameForId(2), "transfer")
+        self.assertEqual(o.getOperationNameForId(500), "Unknown Operation ID 500")
+        with self.assertRaises(ValueError):
+            Operation.from_json(["foo", {}])
+        with self.assertRaises(NotImplementedError):
+            Operation.from_json(["pow", {}])
+        o = Operation.from_json(["social_action", {"account": "a", "action": [2, {"permlink": "b"}]}], prefix="WLS")
+        self.assertEqual(o.opId, 8)
+        self.assertIs(o.get_registry(), Operation.from_json(j, prefix="WLS").get_registry())
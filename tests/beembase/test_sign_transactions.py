@@ -0,0 +1,52 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+import unittest
+from beembase import operations
+from beembase.objects import Operation
+from beembase.signedtransactions import Signed_Transaction
+from beemgraphenebase.account import PrivateKey
+from beemgraphenebase.ecdsasig import MessageSigner
+from beemgraphenebase.signedtransactions import sign_transactions
+
+prefix = u"STEEM"
+wif = "5KQwrPbwdL6PhXujxW37FSSQZ1JiwsST4cqQzDeyXtP79zkvFD3"
+wif2 = "5J4KCbg1G3my9b9hCaQXnHSm6vrwW9xQTJS6ZciW2Kek7cCkCEk"
+ref_block_num = 34294
+ref_block_prefix = 3707022213
+expiration = "2016-04-06T08:29:27"
+
+
+class Testcases(unittest.TestCase):
+
+    def get_transactions(self, n):
+        txs = []
+        for i in range(n):
+            op = operations.Vote(**{"voter": "foobara", "author": "foobarc",
+                                    "permlink": "foobard%d" % i, "weight": 1000})
+            txs.append(Signed_Transaction(ref_block_num=ref_block_num,
+                                          ref_block_prefix=ref_block_prefix,
+                                          expiration=expiration,
+                                          operations=[Operation(op)]))
+        return txs
+
+    def verify(self, txs):
+        pubkeys = [PrivateKey(wif, prefix="STM").pubkey, PrivateKey(wif2, prefix="STM").pubkey]
+        for tx in txs:
+            self.assertEqual(len(tx.data["signatures"].data), 2)
+            tx.verify(pubkeys, prefix)
+
+    def test_sign_transactions(self):
+        txs = sign_transactions(self.get_transactions(3), [wif, wif2, wif], chain=prefix)
+        self.verify(txs)
+
+    def test_sign_transactions_processes(self):
+        txs = sign_transactions(self.get_transactions(4), [wif, PrivateKey(wif2)], chain=prefix, processes=2)
+        self.verify(txs)
+
+    def test_message_signer(self):
+        signer = MessageSigner(wif)
+        tx = self.get_transactions(1)[0]
+        tx.sign([signer, wif2], chain=prefix)
+        self.verify([tx])
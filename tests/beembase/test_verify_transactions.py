@@ -0,0 +1,75 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+import unittest
+import mock
+from binascii import hexlify
+from beembase import operations
+from beembase.objects import Operation
+from beembase.signedtransactions import Signed_Transaction
+from beemgraphenebase.account import PrivateKey
+from beemgraphenebase import ecdsasig
+from beemgraphenebase.signedtransactions import sign_transactions, verify_transactions
+
+prefix = u"STEEM"
+wif = "5KQwrPbwdL6PhXujxW37FSSQZ1JiwsST4cqQzDeyXtP79zkvFD3"
+wif2 = "5J4KCbg1G3my9b9hCaQXnHSm6vrwW9xQTJS6ZciW2Kek7cCkCEk"
+ref_block_num = 34294
+ref_block_prefix = 3707022213
+expiration = "2016-04-06T08:29:27"
+
+
+class Testcases(unittest.TestCase):
+
+    def setUp(self):
+        ecdsasig.clear_recovered_key_cache()
+        self.pubkeys = [hexlify(PrivateKey(w, prefix="STM").pubkey.__bytes__()).decode("ascii")
+                        for w in [wif, wif2]]
+
+    def get_transactions(self, n):
+        txs = []
+        for i in range(n):
+            op = operations.Vote(**{"voter": "foobara", "author": "foobarc",
+                                    "permlink": "foobard%d" % i, "weight": 1000})
+            txs.append(Signed_Transaction(ref_block_num=ref_block_num,
+                                          ref_block_prefix=ref_block_prefix,
+                                          expiration=expiration,
+                                          operations=[Operation(op)]))
+        return sign_transactions(txs, [wif, wif2], chain=prefix)
+
+    def test_verify_transactions(self):
+        txs = self.get_transactions(3)
+        self.assertEqual(verify_transactions(txs, chain=prefix), [self.pubkeys] * 3)
+        self.assertEqual(len(ecdsasig._recovered_keys), 6)
+        # Cached results are identical
+        self.assertEqual(verify_transactions(txs, chain=prefix), [self.pubkeys] * 3)
+        self.assertEqual(len(ecdsasig._recovered_keys), 6)
+
+    def test_verify_transactions_processes(self):
+        txs = self.get_transactions(4)
+        self.assertEqual(verify_transactions(txs, chain=prefix, processes=2), [self.pubkeys] * 4)
+
+    def test_verify_transactions_fallback(self):
+        txs = self.get_transactions(2)
+        verify_message = ecdsasig.verify_message
+
+        def verify_without_header(message, signature, recover_parameter=None):
+            # the recovery parameter of the header is not usable
+            if recover_parameter is None:
+                raise ValueError("invalid recovery parameter")
+            return verify_message(message, signature, recover_parameter=recover_parameter)
+
+        with mock.patch("beemgraphenebase.signedtransactions.verify_message", side_effect=verify_without_header):
+            pubkeys = verify_transactions(txs, chain=prefix)
+            self.assertEqual(pubkeys, [tx.verify(chain=prefix) for tx in txs])
+        for tx_pubkeys in pubkeys:
+            for pubkey in self.pubkeys:
+                self.assertIn(pubkey, tx_pubkeys)
+
+    def test_verify(self):
+        tx = self.get_transactions(1)[0]
+        pubkeys = [PrivateKey(wif, prefix="STM").pubkey, PrivateKey(wif2, prefix="STM").pubkey]
+        self.assertEqual(tx.verify(pubkeys, prefix), self.pubkeys)
+        with self.assertRaises(Exception):
+            tx.verify([PrivateKey(prefix="STM").pubkey], prefix)
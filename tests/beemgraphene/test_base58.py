@@ -12,7 +12,9 @@ from beemgraphenebase.base58 import (
     base58CheckEncode,
     base58CheckDecode,
     gphBase58CheckEncode,
-    gphBase58CheckDecode)
+    gphBase58CheckDecode,
+    clear_base58_cache)
+from beemgraphenebase import base58
 
 
 class Testcases(unittest.TestCase):
@@ -108,6 +110,35 @@ class Testcases(unittest.TestCase):
                           "5Jete5oFNjjk3aUMkKuxgAXsp7ZyhgJbYNiNjHLvq5xzXkiqw7R",
                           "5KDT58ksNsVKjYShG4Ls5ZtredybSxzmKec8juj7CojZj6LPRF7"])
 
+    def test_leading_zeros(self):
+        self.assertEqual(base58encode("00"), "11")
+        self.assertEqual(base58encode("0000ff"), "115Q")
+        self.assertEqual(base58encode("000fff"), "12Dc")
+        self.assertEqual(base58decode("115Q"), "0000ff")
+        self.assertEqual(base58decode(base58encode("000fff")), "000fff")
+        with self.assertRaises(ValueError):
+            base58decode("STM0OIl")
+
+    def test_checksum_cache(self):
+        clear_base58_cache()
+        pub = "02e649f63f8e8121345fd7f47d0d185a3ccaa843115cd2e9392dcd9b82263bc680"
+        encoded = "6dumtt9swxCqwdPZBGXh9YmHoEjFFnNfwHaTqRbQTghGAY2gRz"
+        self.assertEqual(gphBase58CheckEncode(pub), encoded)
+        self.assertEqual(gphBase58CheckDecode(encoded), pub)
+        self.assertEqual(base58._encode_cache[pub], encoded)
+        self.assertEqual(base58._decode_cache[encoded], pub)
+        self.assertEqual(gphBase58CheckEncode(pub), encoded)
+        self.assertEqual(gphBase58CheckDecode(encoded), pub)
+        # 32 byte data (e.g. private keys) is not cached
+        secret = "5b921f7051be5e13e177a0253229903c40493df410ae04f4a450c85568f19131"
+        self.assertEqual(gphBase58CheckDecode(gphBase58CheckEncode(secret)), secret)
+        self.assertNotIn(secret, base58._encode_cache)
+        self.assertEqual(len(base58._decode_cache), 1)
+        with self.assertRaises(AssertionError):
+            gphBase58CheckDecode(encoded[:-1] + "1")
+        clear_base58_cache()
+        self.assertEqual(len(base58._encode_cache), 0)
+
 
 if __name__ == '__main__':
     unittest.main()
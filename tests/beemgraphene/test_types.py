@@ -133,6 +133,14 @@ class Testcases(unittest.TestCase):
         # self.assertEqual(py23_bytes(u), b'')
         self.assertEqual(str(u), '["Foobar"]')
 
+    def test_Fixed_array(self):
+        u = types.Fixed_array([types.Uint16(10), types.Uint16(11)])
+        self.assertEqual(py23_bytes(u), b"\n\x00\x0b\x00")
+        self.assertEqual(str(u), "[10, 11]")
+        buf = bytearray(b"\xff")
+        u.serialize_into(buf)
+        self.assertEqual(bytes(buf), b"\xff\n\x00\x0b\x00")
+
     def test_PointInTime(self):
         u = types.PointInTime("2018-07-06T22:10:00")
         self.assertEqual(py23_bytes(u), b"\xb8\xe8?[")
@@ -179,3 +187,16 @@ class Testcases(unittest.TestCase):
         u = types.Map([[types.Uint16(10), types.Uint16(11)]])
         self.assertEqual(py23_bytes(u), b"\x01\n\x00\x0b\x00")
         self.assertEqual(str(u), '[["10", "11"]]')
+
+    def test_serialize_into(self):
+        buf = bytearray(b"\xff")
+        types.Array([types.Uint16(10), types.String("a\x08\x01"),
+                     types.Optional(types.Void()), types.Optional(types.Uint8(1))]).serialize_into(buf)
+        self.assertEqual(bytes(buf), b"\xff\x04\n\x00\x07ab" + b"u0001" + b"\x00\x01\x01")
+        self.assertEqual(types.serialize(types.Map([[types.Uint16(10), types.Uint16(11)]])),
+                         b"\x01\n\x00\x0b\x00")
+        # objects with __bytes__ only are supported as well
+        buf = bytearray()
+        types.Array([types.Uint8(1), py23_bytes("x", "ascii")]).serialize_into(buf)
+        self.assertEqual(bytes(buf), b"\x02\x01x")
+        self.assertEqual(types.varint(300), b"\xac\x02")